@@ -0,0 +1,131 @@
+"""
+AssetCache
+
+Content-addressed cache of downloaded assets shared across jobs.
+Entries are keyed by URL and ETag, so a changed asset is simply a new key,
+and are handed to jobs as hardlinks so deleting a job's temp files never
+evicts the cache. Size is bounded with least-recently-used eviction.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+# Default bound on the total size of cached assets
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+
+_TEMP_SUFFIX = '.tmp'
+
+
+class AssetCache:
+    """Local LRU cache of downloaded assets keyed by URL and ETag."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached assets
+            max_bytes: Total size above which least recently used entries
+                are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+
+    def entry_path(self, url: str, etag: str) -> str:
+        """Path of the cache entry for one version of an asset."""
+        key = hashlib.sha256(f"{url}\n{etag}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, key + Path(url.split('?', 1)[0]).suffix)
+
+    def fetch(self, url: str, etag: str, local_path: str) -> bool:
+        """
+        Place a cached copy of the asset at local_path.
+
+        Returns:
+            True on a cache hit, False if the asset has to be downloaded
+        """
+        entry = self.entry_path(url, etag)
+        try:
+            _link_or_copy(entry, local_path)
+        except OSError:
+            return False
+
+        # Mark the entry as recently used for eviction
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return True
+
+    def store(self, url: str, etag: str, local_path: str) -> None:
+        """Add a freshly downloaded asset to the cache (best effort)."""
+        entry = self.entry_path(url, etag)
+        temp_path = f"{entry}.{os.getpid()}.{threading.get_ident()}{_TEMP_SUFFIX}"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _link_or_copy(local_path, temp_path)
+            # Atomic rename so concurrent jobs never see a partial entry
+            os.replace(temp_path, entry)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits max_bytes."""
+        with self._evict_lock:
+            try:
+                entries = [
+                    entry for entry in os.scandir(self.cache_dir)
+                    if entry.is_file() and not entry.name.endswith(_TEMP_SUFFIX)
+                ]
+            except OSError:
+                return
+
+            stats = [(entry.stat(), entry.path) for entry in entries]
+            total = sum(stat.st_size for stat, _ in stats)
+
+            for stat, path in sorted(stats, key=lambda item: item[0].st_mtime):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= stat.st_size
+                except OSError:
+                    pass
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    """Hardlink source to destination, copying when they are on different filesystems."""
+    if os.path.lexists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+@lru_cache(maxsize=None)
+def _cache_for_directory(cache_dir: str) -> AssetCache:
+    """One AssetCache per directory, so eviction is serialised per process."""
+    return AssetCache(cache_dir)
+
+
+def shared_asset_cache() -> Optional[AssetCache]:
+    """
+    The process-wide asset cache in $AIDOBE_ASSET_CACHE_DIR.
+
+    Returns:
+        The cache, or None when the variable is unset (caching disabled)
+    """
+    cache_dir = os.environ.get('AIDOBE_ASSET_CACHE_DIR')
+    return _cache_for_directory(cache_dir) if cache_dir else None
@@ -5,18 +5,103 @@ Extracts precise audio duration using librosa with MoviePy fallback.
 Based on wanx patterns for handling audio timing in video processing.
 """
 
+import asyncio
+import hashlib
+import io
+import json
+import subprocess
 import tempfile
+import threading
 import os
-from typing import List, Optional
+import sys
+from typing import Any, List, Optional
+from urllib.parse import urlsplit
 import requests
 
 
+# Audio formats librosa decodes directly; anything else goes to MoviePy
+_LIBROSA_EXTENSIONS = frozenset({'.wav', '.flac', '.ogg', '.mp3', '.m4a', '.aac'})
+
+# Payloads at least this large are decoded from a memfd instead of a temp file
+_MEMFD_MIN_BYTES = 1024 * 1024
+_MEMFD_AVAILABLE = sys.platform == 'linux' and hasattr(os, 'memfd_create')
+
+# Leading bytes requested when probing a URL for its duration
+_PROBE_BYTES = 128 * 1024
+
+# Object metadata headers storage backends use to publish audio duration
+_DURATION_HEADERS = ('X-Duration-Seconds', 'X-Amz-Meta-Duration')
+
+# Requests written to the duration worker before reading its replies, so
+# neither side blocks on a full pipe
+_WORKER_BATCH_SIZE = 256
+
+# Bytes hashed from each end of a file to build its persistent cache key
+_DIGEST_CHUNK = 64 * 1024
+
+
+def _duration_from_headers(headers: Any) -> Optional[float]:
+    """Read a duration published in response metadata headers, if any."""
+    for header in _DURATION_HEADERS:
+        try:
+            duration = float(headers.get(header))
+        except (TypeError, ValueError):
+            continue
+        if duration > 0:
+            return duration
+    return None
+
+
+def _is_probably_mp3(url: str, content_type: Any, head: bytes) -> bool:
+    """
+    Whether a probed file is worth handing to the MP3 header parser.
+    
+    The Content-Type decides when the server sent one; otherwise the URL's
+    extension, then an ID3 tag or MPEG frame sync at the start of the bytes.
+    """
+    if isinstance(content_type, str) and content_type.startswith('audio/'):
+        return content_type.split(';')[0].strip() in ('audio/mpeg', 'audio/mp3')
+    if os.path.splitext(urlsplit(url).path)[1].lower() == '.mp3':
+        return True
+    return head[:3] == b'ID3' or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0)
+
+
+def _duration_from_mp3_head(head: bytes) -> Optional[float]:
+    """
+    Read an MP3 duration from the first bytes of the file.
+    
+    Only trusted when the stream carries a Xing/Info/VBRI header with a
+    frame count; without one mutagen would estimate from the truncated size.
+    """
+    try:
+        from mutagen.mp3 import MP3, BitrateMode
+        info = MP3(io.BytesIO(head)).info
+    except Exception:
+        return None
+    
+    if info.bitrate_mode == BitrateMode.UNKNOWN or info.length <= 0:
+        return None
+    return info.length
+
+
 class AudioDurationExtractor:
     """Extract precise audio duration from various audio sources."""
     
-    def __init__(self):
-        """Initialize the audio duration extractor."""
+    def __init__(self, persistent_cache_dir: Optional[str] = None):
+        """
+        Initialize the audio duration extractor.
+        
+        Args:
+            persistent_cache_dir: Directory for a cross-process duration cache
+                keyed by file content. Defaults to $AIDOBE_DURATION_CACHE_DIR;
+                disabled when neither is set.
+        """
         self._duration_cache = {}
+        self._persistent_cache_dir = (
+            persistent_cache_dir or os.environ.get('AIDOBE_DURATION_CACHE_DIR')
+        )
+        self._worker: Optional[subprocess.Popen] = None
+        self._worker_lock = threading.Lock()
     
     def extract_duration(self, file_path: str, use_cache: bool = False) -> float:
         """
@@ -35,31 +120,114 @@ class AudioDurationExtractor:
         if use_cache and file_path in self._duration_cache:
             return self._duration_cache[file_path]
         
-        try:
-            # Primary: Use librosa for precise duration
-            import librosa
-            duration = librosa.get_duration(path=file_path)
-            
-        except Exception as e:
-            # Fallback: Use MoviePy if librosa fails
-            try:
-                from moviepy.editor import AudioFileClip
-                clip = AudioFileClip(file_path)
-                duration = clip.duration
-                clip.close()
-                
-            except Exception as fallback_error:
-                raise Exception(f"Both librosa and MoviePy failed: {e}, {fallback_error}")
+        content_key = None
+        if use_cache and self._persistent_cache_dir:
+            content_key = self._content_key(file_path)
+            if content_key:
+                duration = self._read_persistent_cache(content_key)
+                if duration is not None:
+                    self._duration_cache[file_path] = duration
+                    return duration
+        
+        extension = os.path.splitext(file_path)[1].lower()
+        duration = self._extract_by_extension(file_path, extension)
         
         if use_cache:
             self._duration_cache[file_path] = duration
+            if content_key:
+                self._write_persistent_cache(content_key, duration)
             
         return duration
     
+    def _content_key(self, file_path: str) -> Optional[str]:
+        """
+        Build a persistent cache key from the file's size and its first and
+        last 64 KB, so large files are never read in full.
+        
+        Returns:
+            Hex digest, or None if the file can't be read
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                head = f.read(_DIGEST_CHUNK)
+                tail = b''
+                if size > 2 * _DIGEST_CHUNK:
+                    f.seek(size - _DIGEST_CHUNK)
+                    tail = f.read(_DIGEST_CHUNK)
+                elif size > _DIGEST_CHUNK:
+                    tail = f.read()
+        except OSError:
+            return None
+        
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(head)
+        digest.update(tail)
+        digest.update(size.to_bytes(8, 'little'))
+        return digest.hexdigest()
+    
+    def _read_persistent_cache(self, content_key: str) -> Optional[float]:
+        """Look up a duration in the persistent cache."""
+        try:
+            with open(os.path.join(self._persistent_cache_dir, content_key)) as f:
+                return float(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    def _write_persistent_cache(self, content_key: str, duration: float) -> None:
+        """Store a duration in the persistent cache (best effort)."""
+        cache_path = os.path.join(self._persistent_cache_dir, content_key)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self._persistent_cache_dir, exist_ok=True)
+            with open(temp_path, 'w') as f:
+                f.write(repr(duration))
+            # Atomic rename so concurrent workers never see a partial entry
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+    
+    def _extract_by_extension(self, file_path: str, extension: str) -> float:
+        """Pick the extraction backend for a file based on its extension."""
+        if extension in _LIBROSA_EXTENSIONS:
+            try:
+                # Primary: Use librosa for precise duration
+                return self._extract_with_librosa(file_path)
+            except Exception as e:
+                # Fallback: Use MoviePy if librosa fails (e.g. corrupted header)
+                try:
+                    return self._extract_with_moviepy(file_path)
+                except Exception as fallback_error:
+                    raise Exception(f"Both librosa and MoviePy failed: {e}, {fallback_error}")
+        else:
+            # Containers librosa can't read natively go straight to MoviePy
+            try:
+                return self._extract_with_moviepy(file_path)
+            except Exception as e:
+                raise Exception(f"MoviePy failed: {e}")
+    
+    def _extract_with_librosa(self, file_path: str) -> float:
+        """Extract duration with librosa."""
+        import librosa
+        return librosa.get_duration(path=file_path)
+    
+    def _extract_with_moviepy(self, file_path: str) -> float:
+        """Extract duration with MoviePy's AudioFileClip."""
+        from moviepy.editor import AudioFileClip
+        clip = AudioFileClip(file_path)
+        duration = clip.duration
+        clip.close()
+        return duration
+    
     def extract_duration_from_url(self, audio_url: str) -> float:
         """
         Extract duration from audio URL by downloading and processing.
         
+        Only the first 128 KB is requested at first. The duration is taken
+        from storage metadata headers, or from an MP3 VBR/Info header when
+        the file is an MP3; otherwise the rest of the file is requested and
+        decoded together with the probed bytes.
+        
         Args:
             audio_url: URL to audio file
             
@@ -69,13 +237,88 @@ class AudioDurationExtractor:
         Raises:
             Exception: If download or processing fails
         """
-        # Download audio file
-        response = requests.get(audio_url)
+        response = requests.get(
+            audio_url, headers={'Range': f'bytes=0-{_PROBE_BYTES - 1}'}
+        )
+        response.raise_for_status()
+        
+        duration = _duration_from_headers(response.headers)
+        if duration is not None:
+            return duration
+        
+        if response.status_code != 206:
+            # Server ignored the range request and sent the whole file
+            return self.extract_duration_from_bytes(response.content)
+        
+        head = response.content
+        if _is_probably_mp3(audio_url, response.headers.get('Content-Type'), head):
+            duration = _duration_from_mp3_head(head)
+            if duration is not None:
+                return duration
+        
+        # A probe that already holds the whole file needs no second request
+        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+        if total.isdigit() and len(head) >= int(total):
+            return self.extract_duration_from_bytes(head)
+        
+        # Probe was inconclusive - download only what the probe didn't cover
+        response = requests.get(audio_url, headers={'Range': f'bytes={len(head)}-'})
         response.raise_for_status()
         
-        # Extract duration from downloaded bytes
+        if response.status_code == 206:
+            return self.extract_duration_from_bytes(head + response.content)
         return self.extract_duration_from_bytes(response.content)
     
+    def extract_durations_from_urls(
+        self, audio_urls: List[str], max_concurrency: int = 16
+    ) -> List[float]:
+        """
+        Extract durations from multiple audio URLs with concurrent downloads.
+        
+        Args:
+            audio_urls: List of audio file URLs
+            max_concurrency: Maximum number of downloads in flight at once
+            
+        Returns:
+            List of durations in seconds, in the same order as audio_urls
+        """
+        return asyncio.run(
+            self.extract_durations_from_urls_async(audio_urls, max_concurrency)
+        )
+    
+    async def extract_durations_from_urls_async(
+        self, audio_urls: List[str], max_concurrency: int = 16
+    ) -> List[float]:
+        """
+        Async variant of extract_durations_from_urls for use inside an event loop.
+        
+        Args:
+            audio_urls: List of audio file URLs
+            max_concurrency: Maximum number of downloads in flight at once
+            
+        Returns:
+            List of durations in seconds, in the same order as audio_urls
+        """
+        import httpx
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async with httpx.AsyncClient() as client:
+            audio_blobs = await asyncio.gather(*(
+                self._fetch_audio_bytes(client, semaphore, audio_url)
+                for audio_url in audio_urls
+            ))
+        
+        return [self.extract_duration_from_bytes(blob) for blob in audio_blobs]
+    
+    async def _fetch_audio_bytes(
+        self, client: Any, semaphore: asyncio.Semaphore, audio_url: str
+    ) -> bytes:
+        """Download a single audio URL, bounded by the shared semaphore."""
+        async with semaphore:
+            response = await client.get(audio_url)
+            response.raise_for_status()
+            return response.content
+    
     def extract_duration_from_bytes(self, audio_bytes: bytes) -> float:
         """
         Extract duration from audio bytes data.
@@ -86,6 +329,9 @@ class AudioDurationExtractor:
         Returns:
             Duration in seconds (float)
         """
+        if _MEMFD_AVAILABLE and len(audio_bytes) >= _MEMFD_MIN_BYTES:
+            return self._extract_duration_from_memfd(audio_bytes)
+        
         # Write bytes to temporary file and extract duration
         with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as temp_file:
             temp_file.write(audio_bytes)
@@ -99,22 +345,140 @@ class AudioDurationExtractor:
                 
         return duration
     
-    def extract_multiple_durations(self, file_paths: List[str]) -> List[float]:
+    def _extract_duration_from_memfd(self, audio_bytes: bytes) -> float:
+        """
+        Extract duration from bytes held in an anonymous in-memory file.
+        
+        Large payloads skip the round trip through a temporary file on disk.
+        The memfd is addressed through /proc/<pid>/fd so FFmpeg subprocesses
+        spawned by the fallback path can open it as well.
+        """
+        fd = os.memfd_create("aidobe_audio")
+        try:
+            view = memoryview(audio_bytes)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            
+            memfd_path = f"/proc/{os.getpid()}/fd/{fd}"
+            return self._extract_by_extension(memfd_path, ".mp3")
+        finally:
+            os.close(fd)
+    
+    def extract_multiple_durations(
+        self, file_paths: List[str], use_worker: bool = False, skip_errors: bool = False
+    ) -> List[Optional[float]]:
         """
         Extract durations from multiple audio files.
         
         Args:
             file_paths: List of audio file paths
+            use_worker: Probe through a persistent worker process that keeps
+                librosa loaded between calls
+            skip_errors: Return None for files that can't be probed instead
+                of raising
             
         Returns:
             List of durations in seconds
         """
+        if use_worker:
+            return self._extract_with_worker(file_paths, skip_errors)
+        
         durations = []
         for file_path in file_paths:
-            duration = self.extract_duration(file_path)
+            try:
+                duration = self.extract_duration(file_path)
+            except Exception:
+                if not skip_errors:
+                    raise
+                duration = None
             durations.append(duration)
         return durations
     
+    def _extract_with_worker(
+        self, file_paths: List[str], skip_errors: bool = False
+    ) -> List[Optional[float]]:
+        """Send paths to the duration worker in batches and collect replies."""
+        durations = []
+        
+        with self._worker_lock:
+            worker = self._get_worker()
+            
+            for start in range(0, len(file_paths), _WORKER_BATCH_SIZE):
+                batch = file_paths[start:start + _WORKER_BATCH_SIZE]
+                try:
+                    worker.stdin.write(
+                        ''.join(json.dumps({'path': path}) + '\n' for path in batch)
+                    )
+                    worker.stdin.flush()
+                except BrokenPipeError:
+                    self._discard_worker()
+                    raise Exception("Audio duration worker exited unexpectedly")
+                
+                # Read every reply before raising so the stream stays in step
+                replies = []
+                for _ in batch:
+                    line = worker.stdout.readline()
+                    if not line:
+                        self._discard_worker()
+                        raise Exception("Audio duration worker exited unexpectedly")
+                    replies.append(json.loads(line))
+                
+                for path, reply in zip(batch, replies):
+                    if 'error' in reply:
+                        if not skip_errors:
+                            raise Exception(f"Failed to extract duration for {path}: {reply['error']}")
+                        durations.append(None)
+                    else:
+                        durations.append(reply['duration'])
+        
+        return durations
+    
+    def _get_worker(self) -> subprocess.Popen:
+        """Return the running duration worker, spawning it if needed."""
+        if self._worker is not None and self._worker.poll() is not None:
+            self._discard_worker()
+        if self._worker is None:
+            package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            env = dict(os.environ)
+            env['PYTHONPATH'] = os.pathsep.join(
+                filter(None, [package_root, env.get('PYTHONPATH')])
+            )
+            self._worker = subprocess.Popen(
+                [sys.executable, '-m', 'aidobe_video_processor.audio_duration_worker'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                env=env
+            )
+        return self._worker
+    
+    def close_worker(self):
+        """Shut down the duration worker process, if running."""
+        with self._worker_lock:
+            if self._worker is None:
+                return
+            self._discard_worker()
+    
+    def _discard_worker(self) -> None:
+        """Drop the current worker, reaping it so no zombie or open pipe remains."""
+        worker, self._worker = self._worker, None
+        self._reap_worker(worker)
+    
+    @staticmethod
+    def _reap_worker(worker: subprocess.Popen) -> None:
+        """Close a worker's pipes and wait for it to exit, killing it if it hangs."""
+        try:
+            worker.stdin.close()
+        except OSError:
+            pass  # Unflushed requests to a worker that has already exited
+        try:
+            worker.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.wait()
+        worker.stdout.close()
+    
     def clear_cache(self):
         """Clear the duration cache."""
         self._duration_cache.clear()
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+AudioDurationWorker
+
+Long-lived duration probe process used by AudioDurationExtractor.
+Keeps librosa imported and warm so batches of files don't pay the import
+and JIT warm-up cost in every short-lived task.
+
+Protocol: one JSON object per line on stdin ({"path": ...}) and one reply
+per line on stdout ({"duration": ...} or {"error": ...}), in request order.
+"""
+
+import json
+import sys
+
+from .audio_duration import AudioDurationExtractor
+
+
+def main() -> int:
+    """Serve duration requests until stdin is closed."""
+    replies = sys.stdout
+    # Anything the decoders print must not corrupt the reply stream
+    sys.stdout = sys.stderr
+
+    try:
+        import librosa  # noqa: F401 - import once so every request is warm
+    except ImportError:
+        pass
+
+    extractor = AudioDurationExtractor()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+            reply = {'duration': extractor.extract_duration(request['path'])}
+        except Exception as e:
+            reply = {'error': str(e)}
+
+        replies.write(json.dumps(reply) + '\n')
+        replies.flush()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,8 +5,126 @@ Forces visual duration to match audio duration - audio-first video generation.
 Based on wanx patterns where audio timing rules all visual elements.
 """
 
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Callable
+from dataclasses import dataclass, fields
+from functools import lru_cache
 import copy
+import math
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AudioSegment:
+    """Timing of one audio segment (or audio timeline entry)."""
+    
+    duration: float
+    start_time: float = 0.0
+    end_time: Optional[float] = None
+    crossfade_in: float = 0.0
+    crossfade_out: float = 0.0
+    clip_id: Optional[str] = None
+
+
+_AUDIO_SEGMENT_FIELDS = tuple(field.name for field in fields(AudioSegment))
+
+
+def _coerce_segments(
+    segments: List[Union[Dict[str, Any], AudioSegment]]
+) -> List[AudioSegment]:
+    """Convert segment dictionaries to AudioSegment records, once at the boundary."""
+    return [
+        segment if isinstance(segment, AudioSegment) else AudioSegment(
+            **{name: segment[name] for name in _AUDIO_SEGMENT_FIELDS if name in segment}
+        )
+        for segment in segments
+    ]
+
+
+def _trim_from_start(video_clip: Any, current_duration: float, total_duration: float) -> Any:
+    """Keep the opening of the clip."""
+    return video_clip.subclip(0, total_duration)
+
+
+def _trim_center(video_clip: Any, current_duration: float, total_duration: float) -> Any:
+    """Keep the middle of the clip."""
+    start_time = (current_duration - total_duration) / 2
+    return video_clip.subclip(start_time, start_time + total_duration)
+
+
+def _extend_loop(video_clip: Any, current_duration: float, total_duration: float) -> Any:
+    """Loop the clip until it fills the target duration."""
+    return video_clip.loop(duration=total_duration)
+
+
+def _extend_freeze_last(video_clip: Any, current_duration: float, total_duration: float) -> Any:
+    """Hold the last frame until the target duration is reached."""
+    last_frame = video_clip.to_ImageClip(t=current_duration - 0.01)
+    extension_duration = total_duration - current_duration
+    extension = last_frame.set_duration(extension_duration)
+    from moviepy.editor import concatenate_videoclips
+    return concatenate_videoclips([video_clip, extension])
+
+
+def _extend_black(video_clip: Any, current_duration: float, total_duration: float) -> Any:
+    """Pad the clip with a black screen."""
+    from moviepy.editor import ColorClip, concatenate_videoclips
+    extension_duration = total_duration - current_duration
+    black_extension = ColorClip(
+        size=video_clip.size, 
+        color=(0, 0, 0), 
+        duration=extension_duration
+    )
+    return concatenate_videoclips([video_clip, black_extension])
+
+
+_TRIM_STRATEGIES = {
+    'from_start': _trim_from_start,
+    'center': _trim_center,
+}
+
+_EXTEND_STRATEGIES = {
+    'loop': _extend_loop,
+    'freeze_last': _extend_freeze_last,
+    'black': _extend_black,
+}
+
+
+@lru_cache(maxsize=32)
+def _get_sync_strategy(
+    extend_strategy: str, 
+    trim_strategy: str, 
+    adjust_speed: bool, 
+    tolerance: float
+) -> Callable[[Any, float], Any]:
+    """
+    Build a sync function specialized for one combination of strategy options.
+    
+    Only the branches that can fire for the given options are kept, so
+    repeated syncs with the same options skip the strategy dispatch.
+    
+    Returns:
+        Function taking (video_clip, total_duration) and returning the synced clip
+    """
+    trim = _TRIM_STRATEGIES.get(trim_strategy)
+    extend = _EXTEND_STRATEGIES.get(extend_strategy)
+    
+    def sync(video_clip: Any, total_duration: float) -> Any:
+        current_duration = video_clip.duration
+        
+        if adjust_speed and abs(current_duration - total_duration) > tolerance:
+            # Adjust video speed to match duration
+            speed_factor = current_duration / total_duration
+            return video_clip.fx(lambda clip: clip.speedx(speed_factor))
+        
+        if trim is not None and current_duration > total_duration + tolerance:
+            return trim(video_clip, current_duration, total_duration)
+        
+        if extend is not None and current_duration < total_duration - tolerance:
+            return extend(video_clip, current_duration, total_duration)
+        
+        # Default case: use set_duration for all scenarios
+        return video_clip.set_duration(total_duration)
+    
+    return sync
 
 
 class AudioMasterSync:
@@ -66,53 +184,52 @@ class AudioMasterSync:
         # Include fade margins in total duration
         total_duration = target_duration + fade_in_margin + fade_out_margin
         
+        sync_strategy = _get_sync_strategy(
+            extend_strategy, trim_strategy, adjust_speed, self.default_tolerance
+        )
+        
         try:
-            current_duration = video_clip.duration
-            
-            if adjust_speed and abs(current_duration - total_duration) > self.default_tolerance:
-                # Adjust video speed to match duration
-                speed_factor = current_duration / total_duration
-                return video_clip.fx(lambda clip: clip.speedx(speed_factor))
+            # Skip MoviePy's clip rewrap when nothing would change; only for
+            # plain syncs, since speed, margin and minimum-length options
+            # each ask for more than a duration match
+            plain_sync = (
+                not adjust_speed and not fade_in_margin and not fade_out_margin
+                and min_video_duration is None
+            )
+            if plain_sync and self._is_already_synced(video_clip, total_duration, precision):
+                return video_clip
             
-            else:
-                # For all cases, use set_duration as the primary method
-                # This ensures consistent behavior with mock testing
-                if trim_strategy == 'from_start' and current_duration > total_duration + self.default_tolerance:
-                    return video_clip.subclip(0, total_duration)
-                elif trim_strategy == 'center' and current_duration > total_duration + self.default_tolerance:
-                    start_time = (current_duration - total_duration) / 2
-                    return video_clip.subclip(start_time, start_time + total_duration)
-                elif extend_strategy == 'loop' and current_duration < total_duration - self.default_tolerance:
-                    return video_clip.loop(duration=total_duration)
-                elif extend_strategy == 'freeze_last' and current_duration < total_duration - self.default_tolerance:
-                    # Get last frame and extend with it
-                    last_frame = video_clip.to_ImageClip(t=current_duration - 0.01)
-                    extension_duration = total_duration - current_duration
-                    extension = last_frame.set_duration(extension_duration)
-                    from moviepy.editor import concatenate_videoclips
-                    return concatenate_videoclips([video_clip, extension])
-                elif extend_strategy == 'black' and current_duration < total_duration - self.default_tolerance:
-                    # Extend with black screen
-                    from moviepy.editor import ColorClip, concatenate_videoclips
-                    extension_duration = total_duration - current_duration
-                    black_extension = ColorClip(
-                        size=video_clip.size, 
-                        color=(0, 0, 0), 
-                        duration=extension_duration
-                    )
-                    return concatenate_videoclips([video_clip, black_extension])
-                else:
-                    # Default case: use set_duration for all scenarios
-                    return video_clip.set_duration(total_duration)
-                
+            return sync_strategy(video_clip, total_duration)
         except Exception as e:
             # Re-raise with context
             raise Exception(f"Failed to sync video to audio duration: {e}")
 
+    def _is_already_synced(self, video_clip: Any, target_duration: float, precision: str) -> bool:
+        """
+        Check whether a clip already matches the target within the requested precision.
+        
+        'frame' precision accepts anything under one frame; 'millisecond'
+        precision uses the default tolerance. Each clip accepted here may be
+        off by up to that tolerance, so the slack adds up across a timeline
+        of many clips.
+        """
+        current_duration = getattr(video_clip, 'duration', None)
+        if not isinstance(current_duration, (int, float)):
+            return False
+        
+        epsilon = self.default_tolerance
+        if precision == 'frame':
+            fps = getattr(video_clip, 'fps', None)
+            if not isinstance(fps, (int, float)) or fps <= 0:
+                fps = 30
+            epsilon = 1.0 / fps
+        
+        return abs(current_duration - target_duration) < epsilon
+
     def sync_video_scenes_to_audio_segments(
         self, 
         video_clips: List[Any], 
-        audio_segments: List[Dict[str, float]],
+        audio_segments: List[Union[Dict[str, float], AudioSegment]],
         handle_crossfades: bool = False
     ) -> List[Any]:
         """
@@ -120,7 +237,7 @@ class AudioMasterSync:
         
         Args:
             video_clips: List of video clip objects
-            audio_segments: List of audio segment dictionaries with timing
+            audio_segments: List of audio segments (dictionaries or AudioSegment)
             handle_crossfades: Whether to handle crossfade regions
             
         Returns:
@@ -129,22 +246,15 @@ class AudioMasterSync:
         if len(video_clips) != len(audio_segments):
             raise ValueError("Number of video clips must match number of audio segments")
         
-        synced_clips = []
+        segments = _coerce_segments(audio_segments)
         
-        for i, (clip, segment) in enumerate(zip(video_clips, audio_segments)):
-            target_duration = segment['duration']
-            
-            # Handle crossfade adjustments if enabled
-            if handle_crossfades:
-                crossfade_in = segment.get('crossfade_in', 0.0)
-                crossfade_out = segment.get('crossfade_out', 0.0)
-                # Crossfades don't change the clip duration, just the composition
-                # The actual crossfade handling is done during video assembly
-            
-            synced_clip = self.sync_video_to_audio_duration(clip, target_duration)
-            synced_clips.append(synced_clip)
-        
-        return synced_clips
+        # Crossfades don't change the clip duration, just the composition.
+        # The actual crossfade handling is done during video assembly, so
+        # handle_crossfades has no effect on the synced durations.
+        return [
+            self.sync_video_to_audio_duration(clip, segment.duration)
+            for clip, segment in zip(video_clips, segments)
+        ]
 
     def enforce_audio_priority(
         self, 
@@ -169,7 +279,7 @@ class AudioMasterSync:
     def batch_sync_to_audio_timeline(
         self, 
         video_clips: Dict[str, Any], 
-        audio_timeline: List[Dict[str, Any]]
+        audio_timeline: List[Union[Dict[str, Any], AudioSegment]]
     ) -> Dict[str, Any]:
         """
         Batch synchronize video clips to an audio timeline.
@@ -177,24 +287,29 @@ class AudioMasterSync:
         Args:
             video_clips: Dictionary of clip_id -> video clip
             audio_timeline: List of timeline entries with clip_id, start_time, duration
+                (dictionaries or AudioSegment)
             
         Returns:
             Dictionary of synchronized video clips
         """
-        synced_clips = {}
-        
-        for timeline_entry in audio_timeline:
-            clip_id = timeline_entry['clip_id']
-            target_duration = timeline_entry['duration']
-            
-            if clip_id not in video_clips:
-                raise ValueError(f"Video clip '{clip_id}' not found in provided clips")
-            
-            original_clip = video_clips[clip_id]
-            synced_clip = self.sync_video_to_audio_duration(original_clip, target_duration)
-            synced_clips[clip_id] = synced_clip
+        timeline = _coerce_segments(audio_timeline)
         
-        return synced_clips
+        # Resolve the timeline into parallel columns once, so the sync loop
+        # below runs over plain lists
+        clip_ids = [timeline_entry.clip_id for timeline_entry in timeline]
+        durations = [timeline_entry.duration for timeline_entry in timeline]
+
+        missing = [clip_id for clip_id in clip_ids if clip_id not in video_clips]
+        if missing:
+            raise ValueError(f"Video clip '{missing[0]}' not found in provided clips")
+
+        clip_objs = [video_clips[clip_id] for clip_id in clip_ids]
+        sync = self.sync_video_to_audio_duration
+
+        return {
+            clip_id: sync(clip, duration)
+            for clip_id, clip, duration in zip(clip_ids, clip_objs, durations)
+        }
 
     def sync_complete_video_to_master_audio(
         self, 
@@ -222,12 +337,15 @@ class AudioMasterSync:
             base_duration = master_audio_duration / scene_count
             scene_durations = [base_duration] * scene_count
         
-        # Validate scene durations sum to master audio duration
-        total_scene_duration = sum(scene_durations)
-        if abs(total_scene_duration - master_audio_duration) > self.default_tolerance:
-            # Adjust last scene to match exactly
-            adjustment = master_audio_duration - total_scene_duration
-            scene_durations[-1] += adjustment
+        # Validate scene durations sum to master audio duration. fsum is exact,
+        # so millisecond-precision durations don't accumulate rounding drift.
+        total_scene_duration = math.fsum(scene_durations)
+        drift = master_audio_duration - total_scene_duration
+        if abs(drift) > self.default_tolerance:
+            # Adjust last scene to match exactly (on a copy - the caller's
+            # list is left untouched)
+            scene_durations = list(scene_durations)
+            scene_durations[-1] += drift
         
         # Sync each scene to its calculated duration
         synced_scenes = []
@@ -0,0 +1,693 @@
+"""
+FFmpeg filter graphs
+
+Builds one fused -filter_complex graph for Ken Burns motion, caption
+overlays and background music, so all three are applied in a single
+FFmpeg decode/encode pass instead of one pass per effect, joins
+file-backed clips with the concat demuxer, and chains FFmpeg stages over
+pipes.
+"""
+
+import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Frame sizes for the named output resolutions
+_RESOLUTION_SIZES = {
+    '1080p': '1920x1080',
+    '720p': '1280x720',
+    '480p': '854x480'
+}
+
+# Throwaway intermediates are stored losslessly with FFV1 (intra-only, so
+# cheap to encode and to seek); only the final export pays for H.264
+INTERMEDIATE_CODEC = 'ffv1'
+INTERMEDIATE_CONTAINER = '.mkv'
+INTERMEDIATE_VIDEO_ARGS = ('-c:v', INTERMEDIATE_CODEC, '-level', '3', '-g', '1')
+
+# Codec, pixel format, frame size and frame rate of a stream in FFmpeg's
+# input summary; files agreeing on all four can be joined by stream copy
+_VIDEO_STREAM = re.compile(
+    r"Stream #\d+:\d+.*?: Video: (\w+)[^,]*, (\w+).*?[ ,](\d{2,5}x\d{2,5})\b.*?, ([\d.]+k?) (?:fps|tbr)"
+)
+
+# Stream codec names (as probed) written by each export encoder
+_ENCODER_CODECS = {
+    'libx264': 'h264',
+    'libx265': 'hevc',
+    'libvpx': 'vp8',
+    'libvpx-vp9': 'vp9'
+}
+
+# Hardware H.264 encoders in order of preference, each with its fastest
+# preset (None: the encoder takes no preset)
+_HARDWARE_H264_ENCODERS = (
+    ('h264_nvenc', 'p1'),
+    ('h264_qsv', 'veryfast'),
+    ('h264_videotoolbox', None)
+)
+
+# drawtext y expressions for each caption position
+_CAPTION_Y = {
+    'top': 'h/12',
+    'center': '(h-text_h)/2',
+    'bottom': 'h-text_h-h/12'
+}
+
+# drawtext colours: a name or hex value, optionally with an @alpha suffix.
+# Anything else could smuggle extra options or filters into the graph
+_CAPTION_COLOR = re.compile(r'^[#A-Za-z0-9@.]+$')
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ClipSource:
+    """A file-backed scene clip: play `duration` seconds of `path` from `inpoint`."""
+
+    path: str
+    duration: float
+    inpoint: float = 0.0
+
+
+def _escape_option(value: str) -> str:
+    """Escape a value for the filter option parser."""
+    for char in "\\':":
+        value = value.replace(char, '\\' + char)
+    return value
+
+
+def _escape_graph(value: str) -> str:
+    """Escape a value for the filtergraph parser."""
+    for char in "\\'[],;":
+        value = value.replace(char, '\\' + char)
+    return value
+
+
+def _escape_text(value: str) -> str:
+    """Escape free text so it survives both levels of filtergraph parsing."""
+    return _escape_graph(_escape_option(value))
+
+
+def build_ken_burns_filter(ken_burns_cfg: Dict[str, Any]) -> str:
+    """Build a slow centred zoompan filter."""
+    zoom_rate = ken_burns_cfg.get('zoom_rate', 0.0015)
+    max_zoom = ken_burns_cfg.get('max_zoom', 1.2)
+    size = ken_burns_cfg.get('size') or _RESOLUTION_SIZES.get(
+        ken_burns_cfg.get('resolution'), _RESOLUTION_SIZES['1080p']
+    )
+    fps = ken_burns_cfg.get('fps', 30)
+
+    return (
+        f"zoompan=z='min(zoom+{zoom_rate},{max_zoom})'"
+        f":x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+        f":d=1:s={size}:fps={fps}"
+    )
+
+
+def _caption_filters(captions_cfg: Dict[str, Any]) -> List[str]:
+    """Build one time-gated drawtext filter per caption."""
+    style = captions_cfg.get('style') or {}
+    y = _CAPTION_Y.get(captions_cfg.get('position', 'bottom'), _CAPTION_Y['bottom'])
+
+    fontsize = float(style.get('fontsize', 24))
+    color = str(style.get('color', 'white'))
+    if not _CAPTION_COLOR.match(color):
+        raise ValueError(f"Invalid caption color: {color!r}")
+
+    common = (
+        f":expansion=none:fontsize={fontsize:g}"
+        f":fontcolor={color}"
+        f":x=(w-text_w)/2:y={y}"
+    )
+    if style.get('fontfile'):
+        common += f":fontfile={_escape_text(style['fontfile'])}"
+
+    return [
+        f"drawtext=text={_escape_text(caption['text'])}{common}"
+        f":enable='between(t,{caption['start_time']},{caption['end_time']})'"
+        for caption in captions_cfg.get('captions', [])
+    ]
+
+
+def build_fused_filtergraph(
+    ken_burns_cfg: Optional[Dict[str, Any]] = None,
+    music_cfg: Optional[Dict[str, Any]] = None,
+    captions_cfg: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Build a single filter_complex graph applying all configured effects.
+
+    Input 0 is the assembled video with its narration track; when music_cfg
+    is given, input 1 is the background music. The graph always produces
+    [vout] and [aout].
+
+    Args:
+        ken_burns_cfg: Zoompan settings (zoom_rate, max_zoom, size or
+            resolution, fps)
+        music_cfg: Background music settings (duration of the narration,
+            for the fade-out; volume, fade_duration), mixed as in
+            build_music_mix_filtergraph
+        captions_cfg: Captions ('captions' list with text/start_time/end_time,
+            optional 'style' and 'position')
+
+    Returns:
+        FFmpeg filtergraph string
+    """
+    video_filters = []
+    if ken_burns_cfg is not None:
+        video_filters.append(build_ken_burns_filter(ken_burns_cfg))
+    if captions_cfg:
+        video_filters.extend(_caption_filters(captions_cfg))
+
+    chains = [f"[0:v]{','.join(video_filters) or 'null'}[vout]"]
+
+    if music_cfg is not None:
+        chains.append(build_music_mix_filtergraph(
+            music_cfg['duration'],
+            music_cfg.get('volume', 0.08),
+            music_cfg.get('fade_duration', 2.0)
+        ))
+    else:
+        chains.append("[0:a]anull[aout]")
+
+    return ';'.join(chains)
+
+
+def build_music_mix_filtergraph(
+    duration: float,
+    volume: float = 0.08,
+    fade_duration: float = 2.0
+) -> str:
+    """
+    Build a graph mixing background music (input 1) under narration
+    (input 0), faded in and out over a duration-second mix, into [aout].
+    """
+    music_filters = [f"volume={volume}"]
+    if fade_duration > 0:
+        music_filters.append(f"afade=t=in:st=0:d={fade_duration}")
+        music_filters.append(
+            f"afade=t=out:st={max(duration - fade_duration, 0.0)}:d={fade_duration}"
+        )
+
+    return (
+        f"[1:a]{','.join(music_filters)}[bg];"
+        f"[0:a][bg]amix=inputs=2:duration=first:normalize=0[aout]"
+    )
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg_binary() -> str:
+    """Locate the FFmpeg binary MoviePy uses, falling back to PATH (resolved once)."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return 'ffmpeg'
+
+
+@lru_cache(maxsize=1)
+def hardware_h264_encoder() -> Optional[Tuple[str, Optional[str]]]:
+    """
+    First hardware H.264 encoder usable on this machine, with its preset.
+    
+    FFmpeg builds list every encoder they were compiled with, device or
+    not, so each listed candidate is confirmed with a tiny test encode.
+    Detected once per process.
+    
+    Returns:
+        (encoder, preset) tuple, or None to encode in software
+    """
+    try:
+        listing = subprocess.run(
+            [_ffmpeg_binary(), '-hide_banner', '-encoders'],
+            capture_output=True, text=True
+        ).stdout
+    except OSError:
+        return None
+    
+    for encoder, preset in _HARDWARE_H264_ENCODERS:
+        if encoder not in listing:
+            continue
+        probe = subprocess.run([
+            _ffmpeg_binary(), '-hide_banner', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=s=256x256:d=0.1', '-c:v', encoder, '-f', 'null', '-'
+        ], capture_output=True)
+        if probe.returncode == 0:
+            return encoder, preset
+    return None
+
+
+def run_ffmpeg(arguments: Sequence[str]) -> None:
+    """
+    Run FFmpeg with the given arguments, overwriting outputs quietly.
+
+    Raises:
+        Exception: If FFmpeg fails
+    """
+    command = [_ffmpeg_binary(), '-y', '-loglevel', 'error', *arguments]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(f"FFmpeg failed: {result.stderr.strip()}")
+
+
+def _filtergraph_arguments(
+    input_path: str,
+    output_path: str,
+    filtergraph: str,
+    extra_inputs: Sequence[str] = (),
+    output_args: Sequence[str] = ()
+) -> List[str]:
+    """FFmpeg arguments running a fused graph from input_path into output_path."""
+    arguments = ['-i', input_path]
+    for extra_input in extra_inputs:
+        arguments.extend(['-i', extra_input])
+    arguments.extend([
+        '-filter_complex', filtergraph,
+        '-map', '[vout]',
+        '-map', '[aout]',
+        *output_args,
+        output_path
+    ])
+    return arguments
+
+
+def apply_filtergraph(
+    input_path: str,
+    output_path: str,
+    filtergraph: str,
+    extra_inputs: Sequence[str] = (),
+    output_args: Sequence[str] = ()
+) -> str:
+    """
+    Run a fused filtergraph over a video in one FFmpeg invocation.
+    
+    Args:
+        input_path: Video with narration audio (graph input 0)
+        output_path: Destination file
+        filtergraph: Graph from build_fused_filtergraph
+        extra_inputs: Further inputs (paths or URLs), e.g. background music
+        output_args: Encoder arguments placed before the output path
+        
+    Returns:
+        Path to the output file
+        
+    Raises:
+        Exception: If FFmpeg fails
+    """
+    run_ffmpeg(_filtergraph_arguments(
+        input_path, output_path, filtergraph, extra_inputs, output_args
+    ))
+    return output_path
+
+
+def mix_background_music(
+    narration_path: str,
+    music_path: str,
+    output_path: str,
+    duration: float,
+    volume: float = 0.08,
+    fade_duration: float = 2.0
+) -> str:
+    """
+    Mix background music under narration in one FFmpeg pass.
+
+    The mix lasts as long as the narration; music is scaled by volume and
+    faded in and out. Output is PCM, so a WAV output_path stays lossless.
+
+    Args:
+        narration_path: Main audio track
+        music_path: Background music track
+        output_path: Destination audio file
+        duration: Narration duration in seconds (places the fade out)
+        volume: Volume level for background music
+        fade_duration: Fade in/out duration for music
+
+    Returns:
+        Path to the mixed audio
+
+    Raises:
+        Exception: If FFmpeg fails
+    """
+    run_ffmpeg([
+        '-i', narration_path,
+        '-i', music_path,
+        '-filter_complex', build_music_mix_filtergraph(duration, volume, fade_duration),
+        '-map', '[aout]',
+        '-c:a', 'pcm_s16le',
+        output_path
+    ])
+    return output_path
+
+
+def run_ffmpeg_pipeline(
+    stages: Sequence[Sequence[str]],
+    stdin_chunks: Optional[Iterable[Any]] = None
+) -> None:
+    """
+    Run FFmpeg commands chained stdout to stdin, so data between stages
+    stays in kernel pipe buffers instead of round-tripping through disk.
+    
+    Each stage but the last should write to pipe:1 (NUT carries any codec
+    and both streams); each stage but the first should read pipe:0.
+    
+    Args:
+        stages: FFmpeg arguments for each stage, in order
+        stdin_chunks: Optional bytes-like chunks (bytes, or C-contiguous
+            arrays written without a copy) for the first stage's stdin
+        
+    Raises:
+        Exception: If any stage fails
+    """
+    processes = []
+    error_logs = []
+    upstream = subprocess.PIPE if stdin_chunks is not None else subprocess.DEVNULL
+    
+    try:
+        try:
+            for index, arguments in enumerate(stages):
+                is_last = index == len(stages) - 1
+                error_logs.append(tempfile.TemporaryFile())
+                process = subprocess.Popen(
+                    [_ffmpeg_binary(), '-y', '-loglevel', 'error', *arguments],
+                    stdin=upstream,
+                    stdout=None if is_last else subprocess.PIPE,
+                    stderr=error_logs[-1]
+                )
+                if processes:
+                    # Only the next stage holds the read end now, so an
+                    # upstream stage gets SIGPIPE if it exits early
+                    processes[-1].stdout.close()
+                processes.append(process)
+                upstream = process.stdout
+            
+            if stdin_chunks is not None:
+                _feed_stdin(processes[0], stdin_chunks)
+            
+            for process in processes:
+                process.wait()
+        finally:
+            for process in processes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+        
+        for process, error_log in zip(processes, error_logs):
+            if process.returncode != 0:
+                error_log.seek(0)
+                stderr = error_log.read().decode(errors='replace').strip()
+                raise Exception(f"FFmpeg failed: {stderr}")
+    finally:
+        for error_log in error_logs:
+            error_log.close()
+
+
+def _feed_stdin(process: subprocess.Popen, chunks: Iterable[Any]) -> None:
+    """Write chunks to a process's stdin, then close it to signal EOF."""
+    try:
+        for chunk in chunks:
+            process.stdin.write(chunk)
+    except BrokenPipeError:
+        pass  # The process exited early; its own error is reported instead
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+def _escape_concat_path(path: str) -> str:
+    """Quote a path for an ffconcat `file` directive."""
+    return "'" + path.replace("'", "'\\''") + "'"
+
+
+def write_concat_manifest(
+    sources: Sequence[Union[ClipSource, str]],
+    manifest_path: str
+) -> str:
+    """
+    Write an ffconcat manifest listing each clip with its trim points.
+
+    Args:
+        sources: Clips in playback order; plain paths play the whole file
+        manifest_path: Destination for the manifest
+
+    Returns:
+        Path to the manifest
+    """
+    lines = ['ffconcat version 1.0']
+    for source in sources:
+        if isinstance(source, str):
+            lines.append(f"file {_escape_concat_path(os.path.abspath(source))}")
+            continue
+        lines.append(f"file {_escape_concat_path(os.path.abspath(source.path))}")
+        if source.inpoint:
+            lines.append(f"inpoint {source.inpoint}")
+        lines.append(f"outpoint {source.inpoint + source.duration}")
+        lines.append(f"duration {source.duration}")
+
+    with open(manifest_path, 'w') as manifest:
+        manifest.write('\n'.join(lines) + '\n')
+    return manifest_path
+
+
+def concat_clip_files(
+    sources: Sequence[Union[ClipSource, str]],
+    output_path: str,
+    stream_copy: bool = True,
+    manifest_path: Optional[str] = None
+) -> str:
+    """
+    Join file-backed clips with the FFmpeg concat demuxer.
+
+    Frames never pass through Python. Stream copy is frame-accurate for
+    intra-only intermediates (see INTERMEDIATE_VIDEO_ARGS); anything else
+    is re-encoded into a lossless intermediate. Audio is dropped, as the
+    master narration track is laid over the result.
+
+    Args:
+        sources: Clips in playback order
+        output_path: Destination video file
+        stream_copy: Copy packets instead of re-encoding
+        manifest_path: Where to write the manifest (defaults next to output)
+
+    Returns:
+        Path to the concatenated video
+
+    Raises:
+        Exception: If FFmpeg fails
+    """
+    manifest_path = manifest_path or os.path.splitext(output_path)[0] + '.ffconcat'
+    write_concat_manifest(sources, manifest_path)
+
+    video_args = ['-c:v', 'copy'] if stream_copy else list(INTERMEDIATE_VIDEO_ARGS)
+    run_ffmpeg([
+        '-f', 'concat', '-safe', '0', '-i', manifest_path,
+        *video_args, '-an', output_path
+    ])
+    return output_path
+
+
+def concat_clip_files_parallel(
+    sources: Sequence[ClipSource],
+    output_path: str,
+    chunk_size: int,
+    max_workers: Optional[int] = None,
+    manifest_path: Optional[str] = None
+) -> str:
+    """
+    Re-encode chunks of clips concurrently, then join the parts by stream copy.
+
+    Each chunk is encoded by its own FFmpeg process into a lossless
+    intra-only part, so the parts can be joined frame-accurately without
+    another encode. Parts are removed once joined.
+
+    Args:
+        sources: Clips in playback order
+        output_path: Destination video file
+        chunk_size: Number of clips encoded per FFmpeg process
+        max_workers: Concurrent FFmpeg processes (defaults to the CPU count)
+        manifest_path: Where to write the final manifest (defaults next to output)
+
+    Returns:
+        Path to the concatenated video
+
+    Raises:
+        Exception: If any FFmpeg process fails
+    """
+    chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+    if len(chunks) <= 1:
+        return concat_clip_files(sources, output_path, False, manifest_path)
+
+    base = os.path.splitext(output_path)[0]
+    part_paths = [f"{base}.part{index}{INTERMEDIATE_CONTAINER}" for index in range(len(chunks))]
+    workers = max_workers or min(len(chunks), os.cpu_count() or 1)
+
+    try:
+        # FFmpeg does the work in subprocesses, so threads are enough to
+        # keep one encoder running per core
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(
+                lambda chunk, part_path: concat_clip_files(chunk, part_path, False),
+                chunks, part_paths
+            ))
+        # Cut each intra-only part to its scenes' total so the joined
+        # timeline matches the sources exactly
+        parts = [
+            ClipSource(path=part_path, duration=sum(source.duration for source in chunk))
+            for chunk, part_path in zip(chunks, part_paths)
+        ]
+        return concat_clip_files(parts, output_path, True, manifest_path)
+    finally:
+        for part_path in part_paths:
+            for path in (part_path, os.path.splitext(part_path)[0] + '.ffconcat'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def retime_clip_files(
+    sources: Sequence[ClipSource],
+    speed_factor: float,
+    output_paths: Sequence[str],
+    max_workers: Optional[int] = None
+) -> List[ClipSource]:
+    """
+    Play clips faster or slower with FFmpeg's setpts filter.
+
+    Each clip's trimmed span is re-timed into a lossless intermediate by
+    its own FFmpeg process, with up to one process per core.
+
+    Args:
+        sources: Clips to re-time
+        speed_factor: Playback speed (2.0 plays twice as fast)
+        output_paths: Destination file for each clip
+        max_workers: Concurrent FFmpeg processes (defaults to the CPU count)
+
+    Returns:
+        The re-timed clips, in the order given
+
+    Raises:
+        Exception: If any FFmpeg process fails
+    """
+    def retime(source: ClipSource, output_path: str) -> ClipSource:
+        run_ffmpeg([
+            '-ss', str(source.inpoint), '-t', str(source.duration), '-i', source.path,
+            '-vf', f"setpts=PTS/{speed_factor}", '-an',
+            *INTERMEDIATE_VIDEO_ARGS, output_path
+        ])
+        return ClipSource(path=output_path, duration=source.duration / speed_factor)
+
+    workers = max_workers or min(len(sources), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(retime, sources, output_paths))
+
+
+def probe_video_format(path: str) -> Optional[Tuple[str, str, str, str]]:
+    """
+    Read the first video stream's format from FFmpeg's input summary.
+
+    Results are remembered per file identity (inode, size, mtime), so each
+    unchanged file is probed once.
+
+    Returns:
+        (codec, pixel format, size, fps), or None if the file has no
+        readable video stream
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return _probe_video_format(path, stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _probe_video_format(
+    path: str, device: int, inode: int, size: int, mtime_ns: int
+) -> Optional[Tuple[str, str, str, str]]:
+    """probe_video_format keyed by file identity."""
+    result = subprocess.run(
+        [_ffmpeg_binary(), '-hide_banner', '-i', path],
+        capture_output=True, text=True
+    )
+    match = _VIDEO_STREAM.search(result.stderr)
+    return match.groups() if match else None
+
+
+def stream_copy_concat(
+    sources: Sequence[Union[ClipSource, str]],
+    audio_path: str,
+    output_path: str,
+    manifest_path: Optional[str] = None
+) -> str:
+    """
+    Join clips and mux the master audio without re-encoding anything.
+
+    Only valid when every clip shares codec, pixel format, size and frame
+    rate (see probe_video_format). Output is cut to the shorter of video
+    and audio; use a Matroska output so any audio codec can be copied.
+
+    Args:
+        sources: Clips in playback order
+        audio_path: Master audio track
+        output_path: Destination video file
+        manifest_path: Where to write the manifest (defaults next to output)
+
+    Returns:
+        Path to the assembled video
+
+    Raises:
+        Exception: If FFmpeg fails
+    """
+    manifest_path = manifest_path or os.path.splitext(output_path)[0] + '.ffconcat'
+    write_concat_manifest(sources, manifest_path)
+
+    try:
+        run_ffmpeg([
+            '-f', 'concat', '-safe', '0', '-i', manifest_path,
+            '-i', audio_path,
+            '-map', '0:v', '-map', '1:a',
+            '-c', 'copy', '-shortest', output_path
+        ])
+    finally:
+        os.remove(manifest_path)
+    return output_path
+
+
+def encoder_stream_codec(encoder: str) -> str:
+    """Codec name probe_video_format reports for streams from an encoder."""
+    return _ENCODER_CODECS.get(encoder, encoder)
+
+
+def stream_copy_remux(
+    source_path: str,
+    output_path: str,
+    audio_codec: str,
+    output_args: Sequence[str] = ()
+) -> str:
+    """
+    Rewrap an already encoded video into a new container.
+
+    The video stream is copied as-is; only the audio is re-encoded, so it
+    suits the output container (e.g. PCM narration into MP4 as AAC).
+
+    Args:
+        source_path: Encoded video with audio
+        output_path: Destination file
+        audio_codec: Audio encoder for the output
+        output_args: Extra output options, e.g. -movflags
+
+    Returns:
+        Path to the remuxed video
+
+    Raises:
+        Exception: If FFmpeg fails
+    """
+    run_ffmpeg([
+        '-i', source_path, '-map', '0',
+        '-c:v', 'copy', '-c:a', audio_codec,
+        *output_args, output_path
+    ])
+    return output_path
@@ -6,36 +6,163 @@ Receives requests from Cloudflare Workers and orchestrates the complete
 video assembly pipeline using all integrated components.
 """
 
+import atexit
 import os
+import random
 import tempfile
 import asyncio
+import contextlib
+import contextvars
+import hashlib
 import httpx
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, Iterable, List, Mapping, Optional, Tuple
 from pathlib import Path
-import json
+from types import MappingProxyType
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 from .audio_duration import AudioDurationExtractor
 from .scene_timing import SceneTimingCalculator
 from .scene_gap_validator import SceneGapValidator
 from .audio_master_sync import AudioMasterSync
 from .video_assembler import VideoAssembler
+from .asset_cache import AssetCache, shared_asset_cache
+from .ffmpeg_filters import (
+    INTERMEDIATE_CONTAINER,
+    INTERMEDIATE_VIDEO_ARGS,
+    _ffmpeg_binary,
+    build_fused_filtergraph,
+    build_ken_burns_filter,
+    run_ffmpeg
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+def dumps_json(data: Any) -> bytes:
+    """Encode a JSON body with orjson, including NumPy scalars and arrays."""
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class ScriptSegment(BaseModel):
+    """Timed script text for one scene."""
+    
+    model_config = ConfigDict(extra='allow', frozen=True)
+    
+    text: str
+    start_time: float
+    end_time: float
+    duration: Optional[float] = None
+
+
+class VideoAsset(BaseModel):
+    """Source video for one scene."""
+    
+    model_config = ConfigDict(extra='allow', frozen=True)
+    
+    asset_url: str
+    start_time: Optional[float] = None
+    duration: Optional[float] = None
+
+
+class VideoRequestModel(BaseModel):
+    """Video assembly parameters sent by Cloudflare Workers."""
+    
+    model_config = ConfigDict(frozen=True)
+    
+    audio_file_url: str
+    video_assets: List[VideoAsset]
+    script_segments: List[ScriptSegment] = Field(default_factory=list)
+    effects_config: Dict[str, Any] = Field(default_factory=dict)
+    captions_config: Dict[str, Any] = Field(default_factory=dict)
+    output_config: Dict[str, Any] = Field(default_factory=dict)
+
+
+class WebhookRequest(BaseModel):
+    """Complete webhook payload for one video processing job."""
+    
+    model_config = ConfigDict(frozen=True)
+    
+    job_id: str
+    video_request: VideoRequestModel
+    callback_url: Optional[str] = None
+    storage_config: Dict[str, Any] = Field(default_factory=dict)
+
+
+# Top-level fields a payload must carry, checked before full validation
+_REQUIRED_FIELDS = frozenset(
+    name for name, field in WebhookRequest.model_fields.items() if field.is_required()
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SceneSpec:
+    """
+    Self-contained render work for one scene.
+    
+    When scenes are fanned out to other workers, video_path must be on
+    storage those workers can read (e.g. a shared volume).
+    """
+    
+    video_path: str
+    ken_burns: Dict[str, Any]
+
+
+def render_scene(spec: SceneSpec) -> str:
+    """
+    Render one scene and return the path of the result.
+    
+    Module-level and stateless so it can run in a local pool or be
+    registered as a remote function whose .map() fans scenes out.
+    """
+    return KenBurnsFFmpeg().apply_ken_burns_effect(spec.video_path, spec.ken_burns)
+
+
+# Maps render_scene over scene specs, returning results in order (the shape
+# of a remote function's .map())
+SceneMapper = Callable[[Iterable[SceneSpec]], Iterable[str]]
+
+
+@lru_cache(maxsize=1)
+def _get_audio_extractor() -> AudioDurationExtractor:
+    """
+    Process-wide AudioDurationExtractor.
+    
+    Its duration worker (with librosa imported) stays warm across jobs and
+    is shut down when the process exits.
+    """
+    extractor = AudioDurationExtractor()
+    atexit.register(extractor.close_worker)
+    return extractor
+
 
 class VideoProcessor:
     """Complete video processing pipeline orchestrator."""
     
-    def __init__(self):
-        """Initialize all video processing components."""
-        self.audio_extractor = AudioDurationExtractor()
+    def __init__(self, scene_mapper: Optional[SceneMapper] = None):
+        """
+        Initialize all video processing components.
+        
+        Args:
+            scene_mapper: Runs render_scene for every scene, e.g. a remote
+                function's .map() to spread scenes across workers. Scenes
+                are rendered in a local thread pool when omitted.
+        """
+        self.audio_extractor = _get_audio_extractor()
         self.scene_timing = SceneTimingCalculator()
         self.gap_validator = SceneGapValidator()
         self.audio_sync = AudioMasterSync()
         self.video_assembler = VideoAssembler()
+        self.scene_mapper = scene_mapper
     
     async def process_complete_video(
         self,
@@ -44,7 +171,8 @@ class VideoProcessor:
         script_segments: List[Dict[str, Any]],
         effects_config: Dict[str, Any],
         captions_config: Dict[str, Any],
-        output_config: Dict[str, Any]
+        output_config: Dict[str, Any],
+        upload_target: Optional[Tuple[str, str]] = None
     ) -> Dict[str, Any]:
         """
         Process complete video with all components integrated.
@@ -56,30 +184,44 @@ class VideoProcessor:
             effects_config: Effects configuration
             captions_config: Captions configuration
             output_config: Output configuration
+            upload_target: Optional (bucket, key) to stream the export to
+                while it is being encoded
             
         Returns:
-            Processing result with metadata
+            Processing result with metadata, including output_url when
+            upload_target was given
         """
+        effect_files = []
+        
         try:
-            # Step 1: Extract audio duration
-            audio_duration = self.audio_extractor.extract_duration(audio_file_path)
+            # Step 1: Probe audio and video durations in one batch
+            durations = await self._probe_durations([audio_file_path] + video_files)
+            audio_duration = durations[0]
+            if audio_duration is None:
+                raise Exception(f"Could not determine audio duration for {audio_file_path}")
             logger.info(f"Extracted audio duration: {audio_duration}s")
             
-            # Step 2: Load video clips (mocked for now - would use MoviePy)
-            video_clips = await self._load_video_clips(video_files)
+            # Step 2: Apply Ken Burns to each scene in parallel
+            ken_burns_cfg = self._ken_burns_config(effects_config, output_config)
+            if ken_burns_cfg is not None:
+                video_files = await self._apply_ken_burns_effects(video_files, ken_burns_cfg)
+                effect_files.extend(dict.fromkeys(video_files))
             
-            # Step 3: Calculate scene timing
+            # Step 3: Load video clips (mocked for now - would use MoviePy)
+            video_clips = await self._load_video_clips(video_files, durations[1:])
+            
+            # Step 4: Calculate scene timing
             scene_durations = self.scene_timing.distribute_scene_durations(
                 audio_duration, len(video_clips)
             )
             logger.info(f"Calculated scene durations: {scene_durations}")
             
-            # Step 4: Sync video to audio
+            # Step 5: Sync video to audio
             synced_clips = self.audio_sync.sync_complete_video_to_master_audio(
                 video_clips, audio_duration, scene_durations
             )
             
-            # Step 5: Validate and fix gaps
+            # Step 6: Validate and fix gaps
             scenes = self._create_scene_metadata(synced_clips, scene_durations)
             validation = self.gap_validator.validate_scene_continuity(scenes)
             
@@ -87,33 +229,56 @@ class VideoProcessor:
                 fixed_scenes = self.gap_validator.fix_all_timing_issues(scenes)
                 logger.info("Fixed timing gaps in video")
             
-            # Step 6: Apply effects if configured
-            if effects_config.get('ken_burns'):
-                synced_clips = await self._apply_ken_burns_effects(synced_clips, effects_config)
-            
-            # Step 7: Mix background music if configured
-            audio_clip = await self._load_audio_clip(audio_file_path)
-            if effects_config.get('background_music'):
-                audio_clip = await self._mix_background_music(audio_clip, effects_config)
-            
-            # Step 8: Assemble complete video
+            # Step 7: Build one FFmpeg graph for captions and music
             captions_data = self._prepare_captions_data(script_segments, captions_config)
+            filtergraph, filter_inputs = self._build_effects_filtergraph(
+                effects_config, captions_data, captions_config, audio_duration
+            )
             
+            # Step 8: Assemble complete video (captions are drawn by the graph)
+            audio_clip = await self._load_audio_clip(audio_file_path, audio_duration)
             assembled_video = self.video_assembler.assemble_complete_video(
                 video_clips=synced_clips,
                 audio_clip=audio_clip,
-                captions_data=captions_data,
+                captions_data=None if filtergraph else captions_data,
                 effects_config=effects_config,
                 output_config=output_config
             )
             
-            # Step 9: Export final video
+            # Step 9: Export final video, applying the effects graph in one pass
             output_path = f"/tmp/final_video_{os.urandom(8).hex()}.mp4"
-            final_path = self.video_assembler.export_video(
-                composite_video=assembled_video,
-                output_path=output_path,
-                export_config=output_config
-            )
+            # Removed with the intermediates unless the export succeeds
+            effect_files.append(output_path)
+            output_url = None
+            if upload_target:
+                # Upload parts as the encoder appends them instead of after it exits
+                export_task = asyncio.ensure_future(asyncio.to_thread(
+                    self.video_assembler.export_video,
+                    composite_video=assembled_video,
+                    output_path=output_path,
+                    export_config=output_config,
+                    streamable=True,
+                    filtergraph=filtergraph,
+                    filter_inputs=filter_inputs
+                ))
+                try:
+                    output_url = await stream_upload_to_storage(
+                        output_path, upload_target[0], upload_target[1], export_task
+                    )
+                except BaseException:
+                    # The encoder thread can't be interrupted; let it finish
+                    # before its output is removed
+                    await asyncio.wait({export_task})
+                    raise
+                final_path = await export_task
+            else:
+                final_path = self.video_assembler.export_video(
+                    composite_video=assembled_video,
+                    output_path=output_path,
+                    export_config=output_config,
+                    filtergraph=filtergraph,
+                    filter_inputs=filter_inputs
+                )
             
             # Step 10: Generate metadata
             metadata = self.video_assembler.get_assembly_metadata(synced_clips, audio_clip)
@@ -125,11 +290,15 @@ class VideoProcessor:
                 'audio_sample_rate': 44100
             })
             
-            return {
+            effect_files.remove(output_path)
+            result = {
                 'status': 'success',
                 'output_path': final_path,
                 'metadata': metadata
             }
+            if output_url:
+                result['output_url'] = output_url
+            return result
             
         except Exception as e:
             logger.error(f"Video processing failed: {e}")
@@ -137,24 +306,53 @@ class VideoProcessor:
                 'status': 'failed',
                 'error': str(e)
             }
+        
+        finally:
+            await release_temp_files(effect_files)
     
-    async def _load_video_clips(self, video_files: List[str]) -> List[Any]:
+    async def _probe_durations(self, file_paths: List[str]) -> List[Optional[float]]:
+        """
+        Probe durations through the process-wide worker, which stays warm
+        between jobs, so its startup is paid once per process.
+        
+        Files referenced more than once are probed once.
+        
+        Returns:
+            Durations in file_paths order, None where a file can't be probed
+        """
+        unique_paths = list(dict.fromkeys(file_paths))
+        durations = await asyncio.to_thread(
+            self.audio_extractor.extract_multiple_durations,
+            unique_paths,
+            use_worker=True,
+            skip_errors=True
+        )
+        
+        by_path = dict(zip(unique_paths, durations))
+        return [by_path[file_path] for file_path in file_paths]
+    
+    async def _load_video_clips(
+        self, 
+        video_files: List[str], 
+        durations: Optional[List[Optional[float]]] = None
+    ) -> List[Any]:
         """Load video clips from file paths."""
         # Mock implementation - would use MoviePy VideoFileClip
         from unittest.mock import Mock
+        durations = durations or [None] * len(video_files)
         clips = []
-        for file_path in video_files:
+        for file_path, duration in zip(video_files, durations):
             clip = Mock()
-            clip.duration = 10.0  # Default duration
+            clip.duration = duration if duration is not None else 10.0  # Default duration
             clips.append(clip)
         return clips
     
-    async def _load_audio_clip(self, audio_file_path: str) -> Any:
+    async def _load_audio_clip(self, audio_file_path: str, duration: Optional[float] = None) -> Any:
         """Load audio clip from file path."""
         # Mock implementation - would use MoviePy AudioFileClip
         from unittest.mock import Mock
         clip = Mock()
-        clip.duration = self.audio_extractor.extract_duration(audio_file_path)
+        clip.duration = duration if duration is not None else self.audio_extractor.extract_duration(audio_file_path)
         return clip
     
     def _create_scene_metadata(self, clips: List[Any], durations: List[float]) -> List[Dict[str, Any]]:
@@ -170,17 +368,89 @@ class VideoProcessor:
             current_time += duration
         return scenes
     
-    async def _apply_ken_burns_effects(self, clips: List[Any], config: Dict[str, Any]) -> List[Any]:
-        """Apply Ken Burns effects to video clips."""
-        # Mock implementation - would use KenBurnsFFmpeg
-        logger.info("Applied Ken Burns effects")
-        return clips
+    def _ken_burns_config(
+        self, 
+        effects_config: Dict[str, Any], 
+        output_config: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Resolve Ken Burns settings, or None when the effect is disabled."""
+        ken_burns = effects_config.get('ken_burns')
+        if not ken_burns:
+            return None
+        
+        ken_burns_cfg = dict(ken_burns) if isinstance(ken_burns, dict) else {}
+        ken_burns_cfg.setdefault('resolution', output_config.get('resolution'))
+        ken_burns_cfg.setdefault('fps', output_config.get('fps', 30))
+        return ken_burns_cfg
     
-    async def _mix_background_music(self, audio_clip: Any, config: Dict[str, Any]) -> Any:
-        """Mix background music with main audio."""
-        # Mock implementation - would use BackgroundMusicMixer
-        logger.info("Mixed background music")
-        return audio_clip
+    async def _apply_ken_burns_effects(self, video_files: List[str], config: Dict[str, Any]) -> List[str]:
+        """
+        Apply Ken Burns to every scene concurrently.
+        
+        Scenes go to the scene mapper when one is configured. Otherwise each
+        scene is an independent FFmpeg process, so a thread per scene
+        (bounded by CPU count) keeps every core busy; the GIL is released
+        while waiting on FFmpeg. A source used by several scenes is decoded
+        and rendered once, and every scene shares the result.
+        """
+        unique_files = list(dict.fromkeys(video_files))
+        specs = [SceneSpec(video_path=video_path, ken_burns=config) for video_path in unique_files]
+        
+        if self.scene_mapper is not None:
+            results = await asyncio.to_thread(lambda: list(self.scene_mapper(specs)))
+        else:
+            loop = asyncio.get_running_loop()
+            max_workers = max(1, min(len(specs), os.cpu_count() or 1))
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, render_scene, spec) for spec in specs
+                ))
+        
+        rendered = dict(zip(unique_files, results))
+        logger.info(f"Applied Ken Burns effects to {len(video_files)} scenes "
+                    f"from {len(rendered)} sources")
+        return [rendered[video_path] for video_path in video_files]
+    
+    def _build_effects_filtergraph(
+        self, 
+        effects_config: Dict[str, Any], 
+        captions_data: List[Dict[str, Any]],
+        captions_config: Dict[str, Any],
+        audio_duration: float
+    ) -> Tuple[Optional[str], List[str]]:
+        """
+        Build the fused captions + music graph for export.
+        
+        Ken Burns is applied per scene beforehand (see
+        _apply_ken_burns_effects) so the zoom restarts with every scene.
+        The music fades out over the end of the audio_duration narration.
+        
+        Returns:
+            (filtergraph, extra inputs), or (None, []) when no effect is enabled
+        """
+        background_music = effects_config.get('background_music')
+        if not (background_music or captions_data):
+            return None, []
+        
+        music_cfg = None
+        if background_music:
+            music_cfg = {
+                'duration': audio_duration,
+                'volume': effects_config.get('music_volume', 0.08),
+                'fade_duration': effects_config.get('fade_duration', 2.0)
+            }
+        
+        captions_cfg = None
+        if captions_data:
+            captions_cfg = {
+                'captions': captions_data,
+                'style': captions_config.get('style'),
+                'position': captions_config.get('position', 'bottom')
+            }
+        
+        filtergraph = build_fused_filtergraph(None, music_cfg, captions_cfg)
+        return filtergraph, [background_music] if background_music else []
     
     def _prepare_captions_data(self, script_segments: List[Dict[str, Any]], config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Prepare captions data from script segments."""
@@ -197,18 +467,77 @@ class VideoProcessor:
         return captions
 
 
-async def download_file(url: str, local_path: str) -> str:
-    """Download file from URL to local path."""
+async def download_file(
+    url: str, 
+    local_path: str, 
+    chunk_size: int = 8 * 1024 * 1024, 
+    parallelism: int = 4,
+    client: Optional[httpx.AsyncClient] = None,
+    known_meta: Optional[Dict[str, Any]] = None,
+    cache: Optional[AssetCache] = None
+) -> str:
+    """
+    Download file from URL to local path.
+    
+    Files larger than chunk_size on servers that accept byte ranges are
+    fetched as parallel Range requests written at their offsets into a
+    pre-sized file; everything else is fetched as a single stream.
+    Assets with an ETag are served from, and added to, the asset cache.
+    
+    Args:
+        url: URL to download
+        local_path: Destination file path
+        chunk_size: Size of each ranged request in bytes
+        parallelism: Maximum number of ranged requests in flight
+        client: Optional HTTP client to reuse
+        known_meta: HEAD metadata from validate_asset_accessibility; when
+            given, the download skips its own HEAD request
+        cache: Asset cache to use; defaults to the one configured by
+            $AIDOBE_ASSET_CACHE_DIR, if any
+        
+    Returns:
+        Local path of the downloaded file
+    """
+    cache = cache or shared_asset_cache()
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        # Create directory if it doesn't exist
+        Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        async with _client_scope(client) as http:
+            if known_meta is None and (parallelism > 1 or cache is not None):
+                known_meta = await _head_asset(http, url)
+            
+            etag = None
+            if known_meta and known_meta['status'] == 200:
+                etag = known_meta.get('etag')
+            
+            if cache is not None and etag and await asyncio.to_thread(
+                cache.fetch, url, etag, local_path
+            ):
+                logger.info(f"Reused cached {url} for {local_path}")
+                return local_path
+            
+            # Never truncate a file that may be a hardlink into the cache
+            if cache is not None and os.path.lexists(local_path):
+                os.remove(local_path)
+            
+            content_length = 0
+            if known_meta and known_meta['status'] == 200 and known_meta['accept_ranges']:
+                content_length = known_meta['content_length']
             
-            # Create directory if it doesn't exist
-            Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+            if parallelism <= 1 or content_length <= chunk_size or not await _download_ranges(
+                http, url, local_path, content_length, chunk_size, parallelism, etag
+            ):
+                response = await http.get(url)
+                response.raise_for_status()
+                etag = response.headers.get('ETag', etag)
+                
+                with open(local_path, 'wb') as f:
+                    f.write(response.content)
             
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
+            if cache is not None and etag:
+                await asyncio.to_thread(cache.store, url, etag, local_path)
             
             logger.info(f"Downloaded {url} to {local_path}")
             return local_path
@@ -218,6 +547,133 @@ async def download_file(url: str, local_path: str) -> str:
         raise
 
 
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=75.0)
+
+_http_client: contextvars.ContextVar[Optional[httpx.AsyncClient]] = contextvars.ContextVar(
+    '_http_client', default=None
+)
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Create an HTTP client with pooled keep-alive connections."""
+    return httpx.AsyncClient(limits=_HTTP_LIMITS)
+
+
+def _client_scope(client: Optional[httpx.AsyncClient] = None):
+    """Use the given or job-wide client as-is, or open a short-lived one."""
+    client = client or _http_client.get()
+    if client is not None:
+        return contextlib.nullcontext(client)
+    return _create_http_client()
+
+
+async def _download_ranges(
+    client: httpx.AsyncClient,
+    url: str,
+    local_path: str,
+    content_length: int,
+    chunk_size: int,
+    parallelism: int,
+    etag: Optional[str] = None
+) -> bool:
+    """
+    Fetch url as parallel byte ranges into a pre-sized local file.
+    
+    When etag is given each range is conditional on it (If-Range), so a
+    file that changed since it was probed comes back whole instead of as
+    mismatched pieces. The first range is fetched on its own and the rest
+    only follow once it came back as a 206 of the probed length; any
+    response that isn't is closed without reading its body.
+    
+    Returns:
+        False if the server ignored the Range header, True otherwise
+    """
+    semaphore = asyncio.Semaphore(parallelism)
+    conditional = {'If-Range': etag} if etag else {}
+    
+    with open(local_path, 'wb') as f:
+        f.truncate(content_length)
+        fd = f.fileno()
+        
+        async def _fetch_range(start: int) -> bool:
+            end = min(start + chunk_size, content_length) - 1
+            headers = {'Range': f'bytes={start}-{end}', **conditional}
+            async with semaphore, client.stream('GET', url, headers=headers) as response:
+                if response.status_code != 206:
+                    response.raise_for_status()
+                    return False
+                if _content_range_total(response) != content_length:
+                    return False
+                data = await response.aread()
+            os.pwrite(fd, data, start)
+            return True
+        
+        starts = range(0, content_length, chunk_size)
+        if not await _fetch_range(starts[0]):
+            return False
+        results = await asyncio.gather(*(_fetch_range(start) for start in starts[1:]))
+    
+    return all(results)
+
+
+def _content_range_total(response: httpx.Response) -> Optional[int]:
+    """Complete length from a Content-Range header, or None if absent or unknown."""
+    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+    return int(total) if total.isdigit() else None
+
+
+async def _head_asset(client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
+    """HEAD url and return the metadata a later download can reuse."""
+    response = await client.head(url)
+    return {
+        'status': response.status_code,
+        'etag': response.headers.get('ETag'),
+        'content_length': int(response.headers.get('Content-Length') or 0),
+        'accept_ranges': response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+    }
+
+
+async def download_files(
+    downloads: List[Tuple[str, str]], 
+    max_concurrency: int = 8,
+    known_meta: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[str]:
+    """
+    Download several files concurrently.
+    
+    Args:
+        downloads: List of (url, local_path) pairs
+        max_concurrency: Maximum number of downloads in flight at once
+        known_meta: Optional HEAD metadata per URL, as returned in
+            validate_asset_accessibility's asset_meta
+        
+    Returns:
+        List of local paths, in the same order as downloads
+        
+    Raises:
+        Exception: The first download failure, after all downloads have settled
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    known_meta = known_meta or {}
+    
+    async def _download(url: str, local_path: str) -> str:
+        kwargs = {'known_meta': known_meta[url]} if url in known_meta else {}
+        async with semaphore:
+            return await download_file(url, local_path, **kwargs)
+    
+    results = await asyncio.gather(
+        *(_download(url, local_path) for url, local_path in downloads),
+        return_exceptions=True
+    )
+    
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    
+    return results
+
+
 async def upload_to_storage(local_path: str, bucket: str, key: str) -> str:
     """Upload file to storage and return public URL."""
     # Mock implementation - would upload to S3/R2/GCS
@@ -226,172 +682,623 @@ async def upload_to_storage(local_path: str, bucket: str, key: str) -> str:
     return public_url
 
 
-async def send_completion_callback(callback_url: str, callback_data: Dict[str, Any]) -> None:
-    """Send completion callback to Cloudflare Workers."""
+async def upload_part(bucket: str, key: str, part_number: int, data: bytes) -> str:
+    """Upload one part of a multipart upload and return its ETag."""
+    # Mock implementation - would call S3/R2 UploadPart
+    etag = hashlib.md5(data).hexdigest()
+    logger.info(f"Uploaded part {part_number} ({len(data)} bytes) of {bucket}/{key}")
+    return etag
+
+
+async def complete_multipart_upload(bucket: str, key: str, etags: List[str]) -> str:
+    """Complete a multipart upload and return the public URL."""
+    # Mock implementation - would call S3/R2 CompleteMultipartUpload
+    public_url = f"https://storage.example.com/{bucket}/{key}"
+    logger.info(f"Completed {len(etags)}-part upload to {public_url}")
+    return public_url
+
+
+async def abort_multipart_upload(bucket: str, key: str) -> None:
+    """Abort a multipart upload, discarding the parts already uploaded."""
+    # Mock implementation - would call S3/R2 AbortMultipartUpload
+    logger.info(f"Aborted multipart upload to {bucket}/{key}")
+
+
+async def stream_upload_to_storage(
+    local_path: str, 
+    bucket: str, 
+    key: str, 
+    export_task: asyncio.Future,
+    part_size: int = 8 * 1024 * 1024,
+    max_concurrency: int = 4,
+    poll_interval: float = 0.25
+) -> str:
+    """
+    Upload a file as a multipart upload while it is still being written.
+    
+    Full parts are uploaded as soon as the writer has appended them; the
+    remainder is uploaded once export_task finishes. If a part fails the
+    upload is aborted straight away; export_task is left to the caller.
+    
+    Args:
+        local_path: File being written by export_task
+        bucket: Destination bucket
+        key: Destination key
+        export_task: Future that completes when the file is fully written
+        part_size: Size of each uploaded part in bytes
+        max_concurrency: Maximum number of parts in flight (and in memory)
+        poll_interval: Seconds between checks of the growing file
+        
+    Returns:
+        Public URL of the uploaded file
+        
+    Raises:
+        Exception: If the export or any part upload fails
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    part_tasks = []
+    
+    async def _upload(part_number: int, data: bytes) -> str:
+        try:
+            return await upload_part(bucket, key, part_number, data)
+        finally:
+            semaphore.release()
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(callback_url, json=callback_data)
+        offset = 0
+        with contextlib.ExitStack() as stack:
+            source = None
+            while True:
+                finished = export_task.done()
+                size = os.path.getsize(local_path) if os.path.exists(local_path) else 0
+                
+                while size - offset >= part_size or (finished and size > offset):
+                    if source is None:
+                        source = stack.enter_context(open(local_path, 'rb'))
+                    length = min(part_size, size - offset)
+                    await semaphore.acquire()
+                    source.seek(offset)
+                    data = source.read(length)
+                    part_tasks.append(asyncio.create_task(_upload(len(part_tasks) + 1, data)))
+                    offset += length
+                
+                if finished:
+                    break
+                await asyncio.wait({export_task}, timeout=poll_interval)
+                
+                # Stop reading the file as soon as a part has failed
+                for task in part_tasks:
+                    if task.done():
+                        task.result()
+        
+        # Surface export failures before completing the upload
+        export_task.result()
+        etags = await asyncio.gather(*part_tasks)
+        return await complete_multipart_upload(bucket, key, etags)
+        
+    except BaseException:
+        for task in part_tasks:
+            task.cancel()
+        await asyncio.gather(*part_tasks, return_exceptions=True)
+        await abort_multipart_upload(bucket, key)
+        raise
+
+
+_CALLBACK_WAIT_SECONDS = 5.0
+_CALLBACK_DEADLINE_SECONDS = 20.0
+
+# Strong references to detached tasks so they are not garbage collected mid-flight
+_background_tasks: set = set()
+
+
+def _detach(coro) -> asyncio.Task:
+    """Run a coroutine in the background without awaiting it."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _post_with_retry(
+    client: httpx.AsyncClient, 
+    url: str, 
+    data: Any, 
+    tries: int = 3, 
+    base: float = 0.5
+) -> httpx.Response:
+    """
+    POST JSON, retrying server errors and timeouts with jittered backoff.
+    
+    Args:
+        client: HTTP client to send with
+        url: Destination URL
+        data: JSON-serializable payload
+        tries: Total number of attempts
+        base: Backoff before the second attempt, doubled for each retry
+        
+    Returns:
+        The successful response
+        
+    Raises:
+        httpx.HTTPError: If the last attempt fails or the error is not retryable
+    """
+    for attempt in range(1, tries + 1):
+        try:
+            response = await client.post(url, content=dumps_json(data), headers=_JSON_HEADERS)
             response.raise_for_status()
+            return response
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code < 500 or attempt == tries:
+                raise
+        except httpx.TransportError:
+            if attempt == tries:
+                raise
+        
+        await asyncio.sleep(base * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+
+async def send_completion_callback(
+    callback_url: str, 
+    callback_data: Dict[str, Any], 
+    client: Optional[httpx.AsyncClient] = None
+) -> None:
+    """Send completion callback to Cloudflare Workers."""
+    try:
+        async with _client_scope(client) as client:
+            await asyncio.wait_for(
+                _post_with_retry(client, callback_url, callback_data),
+                timeout=_CALLBACK_DEADLINE_SECONDS
+            )
             logger.info(f"Sent completion callback to {callback_url}")
     except Exception as e:
         logger.error(f"Failed to send callback: {e}")
 
 
-async def send_progress_update(callback_url: str, progress_data: Dict[str, Any]) -> None:
-    """Send progress update to Cloudflare Workers."""
+async def _dispatch_completion_callback(
+    callback_url: str, 
+    callback_data: Dict[str, Any],
+    wait_seconds: float = _CALLBACK_WAIT_SECONDS
+) -> Optional[asyncio.Task]:
+    """
+    Send the completion callback without letting a slow receiver hold the job.
+    
+    Returns:
+        None if the callback finished within wait_seconds, otherwise the
+        still-running task, which keeps going in the background
+    """
+    task = _detach(send_completion_callback(callback_url, callback_data))
+    done, _ = await asyncio.wait({task}, timeout=wait_seconds)
+    if done:
+        return None
+    
+    logger.warning(f"Completion callback to {callback_url} still pending after {wait_seconds}s; detaching")
+    return task
+
+
+async def _close_when_done(task: asyncio.Task, client: httpx.AsyncClient) -> None:
+    """Close client once task has finished with it."""
+    await asyncio.wait({task})
+    await client.aclose()
+
+
+_progress_batcher: contextvars.ContextVar[Optional['ProgressBatcher']] = contextvars.ContextVar(
+    '_progress_batcher', default=None
+)
+
+_STOP_FLUSHING = object()
+
+
+class ProgressBatcher:
+    """Coalesces progress updates into batched POSTs to the progress endpoint."""
+    
+    def __init__(self, callback_url: str, flush_ms: int = 500, max_batch: int = 32):
+        """
+        Initialize the batcher.
+        
+        Args:
+            callback_url: Completion callback URL the progress URL is derived from
+            flush_ms: Longest time an update waits before being sent
+            max_batch: Most updates sent in a single POST
+        """
+        self.callback_url = callback_url
+        self.flush_interval = flush_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+    
+    def emit(self, progress_data: Dict[str, Any]) -> None:
+        """Queue a progress update for the next batch."""
+        self._queue.put_nowait(progress_data)
+    
+    async def drain(self) -> None:
+        """Flush all queued updates and stop the flush task."""
+        if self._task is None or self._task.done():
+            return
+        self._queue.put_nowait(_STOP_FLUSHING)
+        await self._task
+    
+    async def _flush_loop(self) -> None:
+        """Send queued updates every flush interval or every max_batch updates."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP_FLUSHING:
+                break
+            
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP_FLUSHING:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            await send_progress_batch(self.callback_url, batch)
+
+
+# Pipeline stages in order, with the overall progress reported on entering each
+PROGRESS_STAGES = (
+    ('validating', 0.1),
+    ('downloading', 0.2),
+    ('processing', 0.5),
+    ('uploading', 0.8)
+)
+
+
+def _stage_updates(job_id: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Build a job's stage progress payloads once, up front.
+    
+    The payloads are shared with the ProgressBatcher by reference and
+    must not be mutated.
+    """
+    return {
+        stage: {'job_id': job_id, 'stage': stage, 'progress': progress}
+        for stage, progress in PROGRESS_STAGES
+    }
+
+
+def _progress_url(callback_url: str) -> str:
+    """Derive the progress endpoint from the completion callback URL."""
+    return callback_url.replace('/video-complete', '/video-progress')
+
+
+def _progress_batch_url(callback_url: str) -> str:
+    """Derive the batched progress endpoint from the completion callback URL."""
+    return _progress_url(callback_url) + '/batch'
+
+
+async def send_progress_update(
+    callback_url: str, 
+    progress_data: Dict[str, Any], 
+    client: Optional[httpx.AsyncClient] = None
+) -> None:
+    """
+    Send progress update to Cloudflare Workers.
+    
+    Inside process_video_request the update is queued on the job's
+    ProgressBatcher; otherwise it is posted immediately.
+    """
+    batcher = _progress_batcher.get()
+    if batcher is not None and batcher.callback_url == callback_url:
+        batcher.emit(progress_data)
+        return
+    
     try:
-        async with httpx.AsyncClient() as client:
-            progress_url = callback_url.replace('/video-complete', '/video-progress')
-            response = await client.post(progress_url, json=progress_data)
+        async with _client_scope(client) as client:
+            response = await client.post(
+                _progress_url(callback_url), content=dumps_json(progress_data), headers=_JSON_HEADERS
+            )
             response.raise_for_status()
             logger.info(f"Sent progress update: {progress_data['stage']}")
     except Exception as e:
         logger.error(f"Failed to send progress update: {e}")
 
 
-async def validate_asset_accessibility(video_request: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate that all assets are accessible before processing."""
+async def send_progress_batch(
+    callback_url: str, 
+    batch: List[Dict[str, Any]], 
+    client: Optional[httpx.AsyncClient] = None
+) -> None:
+    """
+    Send several progress updates for one job to Cloudflare Workers in one POST.
+    
+    The updates go to the batch endpoint wrapped as {"job_id", "updates"};
+    the single-update endpoint keeps receiving one object per request.
+    """
+    envelope = {'job_id': batch[0]['job_id'], 'updates': batch}
+    try:
+        async with _client_scope(client) as client:
+            response = await client.post(
+                _progress_batch_url(callback_url), content=dumps_json(envelope), headers=_JSON_HEADERS
+            )
+            response.raise_for_status()
+            logger.info(f"Sent {len(batch)} progress updates: {[p['stage'] for p in batch]}")
+    except Exception as e:
+        logger.error(f"Failed to send progress updates: {e}")
+
+
+async def validate_asset_accessibility(
+    video_request: Dict[str, Any], 
+    client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, Any]:
+    """
+    Validate that all assets are accessible before processing.
+    
+    All assets are probed with concurrent HEAD requests. The metadata of
+    accessible assets is returned as asset_meta so downloads can skip
+    probing them again.
+    """
     missing_assets = []
     inaccessible_assets = []
+    asset_meta = {}
     
-    # Check audio file
-    audio_url = video_request.get('audio_file_url')
-    if audio_url:
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.head(audio_url)
-                if response.status_code != 200:
-                    inaccessible_assets.append(audio_url)
-        except Exception:
-            inaccessible_assets.append(audio_url)
-    
-    # Check video assets
-    for asset in video_request.get('video_assets', []):
-        asset_url = asset.get('asset_url')
-        if asset_url:
-            try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.head(asset_url)
-                    if response.status_code != 200:
-                        inaccessible_assets.append(asset_url)
-            except Exception:
-                inaccessible_assets.append(asset_url)
+    asset_urls = [video_request.get('audio_file_url')]
+    asset_urls.extend(asset.get('asset_url') for asset in video_request.get('video_assets', []))
+    asset_urls = list(dict.fromkeys(url for url in asset_urls if url))
+    
+    async with _client_scope(client) as client:
+        results = await asyncio.gather(
+            *(_head_asset(client, asset_url) for asset_url in asset_urls),
+            return_exceptions=True
+        )
+    
+    for asset_url, result in zip(asset_urls, results):
+        if isinstance(result, BaseException) or result['status'] != 200:
+            inaccessible_assets.append(asset_url)
+        else:
+            asset_meta[asset_url] = result
     
     return {
         'is_valid': len(missing_assets) == 0 and len(inaccessible_assets) == 0,
         'missing_assets': missing_assets,
-        'inaccessible_assets': inaccessible_assets
+        'inaccessible_assets': inaccessible_assets,
+        'asset_meta': asset_meta
     }
 
 
-def cleanup_temp_files(file_paths: List[str]) -> None:
-    """Clean up temporary files."""
-    for file_path in file_paths:
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"Cleaned up {file_path}")
-        except Exception as e:
-            logger.error(f"Failed to cleanup {file_path}: {e}")
+_temp_reaper: contextvars.ContextVar[Optional['TempFileReaper']] = contextvars.ContextVar(
+    '_temp_reaper', default=None
+)
+
+_STOP_REAPING = object()
+
+
+class TempFileReaper:
+    """Deletes temporary files in the background as pipeline stages release them."""
+    
+    def __init__(self):
+        """Initialize the reaper."""
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start the background deletion task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._reap_loop())
+    
+    def release(self, file_paths: List[str]) -> None:
+        """Queue files that no later stage needs for deletion."""
+        for file_path in file_paths:
+            self._queue.put_nowait(file_path)
+    
+    async def drain(self) -> None:
+        """Delete all queued files and stop the deletion task."""
+        if self._task is None or self._task.done():
+            return
+        self._queue.put_nowait(_STOP_REAPING)
+        await self._task
+    
+    async def _reap_loop(self) -> None:
+        """Delete whatever has been released, a batch at a time."""
+        stopping = False
+        
+        while not stopping:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            if _STOP_REAPING in batch:
+                stopping = True
+                batch = [path for path in batch if path is not _STOP_REAPING]
+            
+            await asyncio.gather(*(asyncio.to_thread(_remove_temp_file, path) for path in batch))
+
+
+async def release_temp_files(file_paths: List[str]) -> None:
+    """
+    Hand files back once a stage is done with them.
+    
+    Inside process_video_request they are deleted by the job's reaper while
+    later stages keep running; elsewhere they are deleted before returning.
+    """
+    reaper = _temp_reaper.get()
+    if reaper is not None:
+        reaper.release(file_paths)
+    else:
+        await cleanup_temp_files(file_paths)
 
 
-async def process_video_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
+def _remove_temp_file(file_path: str) -> None:
+    """Remove one temporary file, logging rather than raising on failure."""
+    try:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            logger.info(f"Cleaned up {file_path}")
+    except Exception as e:
+        logger.error(f"Failed to cleanup {file_path}: {e}")
+
+
+async def cleanup_temp_files(file_paths: List[str]) -> None:
+    """Clean up temporary files concurrently, off the event loop."""
+    await asyncio.gather(*(asyncio.to_thread(_remove_temp_file, path) for path in file_paths))
+
+
+def prewarm() -> None:
+    """
+    Pay cold-start costs before the first request arrives.
+    
+    Meant to run once per container (e.g. from a Modal @modal.enter() hook):
+    imports MoviePy and librosa, builds the pipeline components and resolves
+    the FFmpeg binary. The Numba scene-timing kernels are loaded from their
+    on-disk cache when scene_timing is imported (see compile_kernels).
+    """
+    import moviepy.editor  # noqa: F401 - pulls in imageio and its FFmpeg reader
+    
+    try:
+        import librosa  # noqa: F401
+    except ImportError:
+        pass
+    
+    VideoProcessor()
+    _ffmpeg_binary()
+    logger.info("Prewarmed video processing components")
+
+
+async def process_video_request(
+    request_data: Dict[str, Any], 
+    scene_mapper: Optional[SceneMapper] = None
+) -> Dict[str, Any]:
     """
     Main webhook endpoint for processing video requests.
     
     Args:
         request_data: Complete video processing request from Cloudflare Workers
+        scene_mapper: Optional fan-out for per-scene rendering (see VideoProcessor)
         
     Returns:
         Processing result with status, output URL, and metadata
     """
     temp_files = []
     
+    pending_callback = None
+    http_client = None
+    progress_batcher = None
+    temp_reaper = None
+    # (context variable, token) pairs to reset once the job is done
+    context_tokens = []
+    
     try:
-        # Validate required fields
-        if 'job_id' not in request_data:
-            raise ValueError("job_id is required")
+        # One pooled client serves every HTTP call made for this job
+        http_client = _create_http_client()
+        context_tokens.append((_http_client, _http_client.set(http_client)))
         
-        if 'video_request' not in request_data:
-            raise ValueError("video_request is required")
+        # Files released by finished stages are deleted while later stages run
+        temp_reaper = TempFileReaper()
+        temp_reaper.start()
+        context_tokens.append((_temp_reaper, _temp_reaper.set(temp_reaper)))
         
-        job_id = request_data['job_id']
-        video_request = request_data['video_request']
-        callback_url = request_data.get('callback_url')
-        storage_config = request_data.get('storage_config', {})
+        # Read-only view so no stage can mutate the caller's payload
+        request_data = MappingProxyType(request_data)
+        
+        # Reject payloads missing top-level fields with one set difference
+        if missing := _REQUIRED_FIELDS - request_data.keys():
+            raise ValueError(f"{', '.join(sorted(missing))}: Field required")
+        
+        # Validate the request shape in one pass; pydantic's ValidationError
+        # is a ValueError and names every missing or malformed field
+        request = WebhookRequest.model_validate(request_data)
+        
+        job_id = request.job_id
+        video_request = request.video_request
+        callback_url = request.callback_url
+        storage_config = request.storage_config
+        
+        # Progress updates for this job are coalesced into batched POSTs
+        if callback_url:
+            progress_batcher = ProgressBatcher(callback_url)
+            progress_batcher.start()
+            context_tokens.append((_progress_batcher, _progress_batcher.set(progress_batcher)))
         
         logger.info(f"Processing video request for job {job_id}")
+        stage_updates = _stage_updates(job_id)
         
         # Validate asset accessibility
         if callback_url:
-            await send_progress_update(callback_url, {
-                'job_id': job_id,
-                'stage': 'validating',
-                'progress': 0.1
-            })
+            await send_progress_update(callback_url, stage_updates['validating'])
         
-        asset_validation = await validate_asset_accessibility(video_request)
+        asset_validation = await validate_asset_accessibility(video_request.model_dump())
         if not asset_validation['is_valid']:
             raise ValueError(f"Assets not accessible: {asset_validation}")
         
         # Download assets
         if callback_url:
-            await send_progress_update(callback_url, {
-                'job_id': job_id,
-                'stage': 'downloading',
-                'progress': 0.2
-            })
+            await send_progress_update(callback_url, stage_updates['downloading'])
         
-        # Download audio file
-        audio_url = video_request['audio_file_url']
+        # Plan audio file and video asset downloads
+        audio_url = video_request.audio_file_url
         audio_path = f"/tmp/audio_{job_id.replace('-', '_')}.mp3"
-        await download_file(audio_url, audio_path)
-        temp_files.append(audio_path)
+        downloads = [(audio_url, audio_path)]
         
-        # Download video assets
+        # Scenes that reuse a source share one download
         video_paths = []
-        for i, asset in enumerate(video_request['video_assets']):
-            asset_url = asset['asset_url']
-            file_ext = Path(asset_url).suffix or '.mp4'
-            video_path = f"/tmp/video_{i}_{job_id.replace('-', '_')}{file_ext}"
-            await download_file(asset_url, video_path)
-            video_paths.append(video_path)
-            temp_files.append(video_path)
+        path_by_url = {}
+        for i, asset in enumerate(video_request.video_assets):
+            asset_url = asset.asset_url
+            if asset_url not in path_by_url:
+                file_ext = Path(asset_url).suffix or '.mp4'
+                path_by_url[asset_url] = f"/tmp/video_{i}_{job_id.replace('-', '_')}{file_ext}"
+                downloads.append((asset_url, path_by_url[asset_url]))
+            video_paths.append(path_by_url[asset_url])
+        
+        # Background music is downloaded like the scenes (ranged, cached and
+        # reaped) rather than fetched by FFmpeg in the middle of the encode
+        effects_config = dict(video_request.effects_config)
+        music_url = effects_config.get('background_music')
+        if music_url:
+            music_ext = Path(music_url).suffix or '.mp3'
+            effects_config['background_music'] = f"/tmp/music_{job_id.replace('-', '_')}{music_ext}"
+            downloads.append((music_url, effects_config['background_music']))
+        
+        # Track paths before downloading so partial downloads are cleaned up too
+        temp_files.extend(local_path for _, local_path in downloads)
+        await download_files(downloads, known_meta=asset_validation.get('asset_meta'))
         
         # Process video
         if callback_url:
-            await send_progress_update(callback_url, {
-                'job_id': job_id,
-                'stage': 'processing',
-                'progress': 0.5
-            })
+            await send_progress_update(callback_url, stage_updates['processing'])
+        
+        output_bucket = storage_config.get('output_bucket', 'aidobe-videos')
+        output_key = storage_config.get('output_key', f'generated/{job_id}.mp4')
         
-        processor = VideoProcessor()
+        processor = VideoProcessor(scene_mapper=scene_mapper)
         result = await processor.process_complete_video(
             audio_file_path=audio_path,
             video_files=video_paths,
-            script_segments=video_request.get('script_segments', []),
-            effects_config=video_request.get('effects_config', {}),
-            captions_config=video_request.get('captions_config', {}),
-            output_config=video_request.get('output_config', {})
+            script_segments=[segment.model_dump() for segment in video_request.script_segments],
+            effects_config=effects_config,
+            captions_config=video_request.captions_config,
+            output_config=video_request.output_config,
+            upload_target=(output_bucket, output_key)
         )
         
         if result['status'] != 'success':
             raise Exception(result.get('error', 'Video processing failed'))
         
-        # Upload to storage
+        # Downloaded sources are no longer needed once the export exists
+        await release_temp_files([local_path for _, local_path in downloads])
+        
+        # Upload to storage, unless it was streamed during export
         if callback_url:
-            await send_progress_update(callback_url, {
-                'job_id': job_id,
-                'stage': 'uploading',
-                'progress': 0.8
-            })
+            await send_progress_update(callback_url, stage_updates['uploading'])
         
-        output_url = await upload_to_storage(
-            result['output_path'],
-            storage_config.get('output_bucket', 'aidobe-videos'),
-            storage_config.get('output_key', f'generated/{job_id}.mp4')
-        )
+        output_url = result.get('output_url')
+        if not output_url:
+            output_url = await upload_to_storage(result['output_path'], output_bucket, output_key)
         temp_files.append(result['output_path'])
         
         # Send completion callback
@@ -403,13 +1310,16 @@ async def process_video_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
         }
         
         if callback_url:
-            await send_completion_callback(callback_url, final_result)
+            await progress_batcher.drain()
+            pending_callback = await _dispatch_completion_callback(callback_url, final_result)
         
         return final_result
         
     except Exception as e:
-        job_id = request_data.get('job_id', 'unknown')
-        callback_url = request_data.get('callback_url')
+        # The payload may not even be a mapping when validation failed
+        payload = request_data if isinstance(request_data, Mapping) else {}
+        job_id = payload.get('job_id', 'unknown')
+        callback_url = payload.get('callback_url')
         logger.error(f"Video processing failed for job {job_id}: {e}")
         
         # Send failure callback
@@ -420,23 +1330,53 @@ async def process_video_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
         }
         
         if callback_url:
-            await send_completion_callback(callback_url, failure_result)
+            if progress_batcher is not None:
+                await progress_batcher.drain()
+            pending_callback = await _dispatch_completion_callback(callback_url, failure_result)
         
         return failure_result
     
     finally:
+        if progress_batcher is not None:
+            await progress_batcher.drain()
+        if pending_callback is not None:
+            _detach(_close_when_done(pending_callback, http_client))
+        elif http_client is not None:
+            await http_client.aclose()
+        
         # Cleanup temporary files
-        cleanup_temp_files(temp_files)
+        if temp_reaper is not None:
+            await temp_reaper.drain()
+        for variable, token in reversed(context_tokens):
+            variable.reset(token)
+        await cleanup_temp_files(temp_files)
 
 
 # Modal.com integration components that would be implemented
 class KenBurnsFFmpeg:
     """Ken Burns effect implementation using FFmpeg."""
     
-    def apply_ken_burns_effect(self, video_clip: Any, config: Dict[str, Any]) -> Any:
-        """Apply Ken Burns zoom/pan effect to video clip."""
-        # Mock implementation
-        return video_clip
+    def apply_ken_burns_effect(self, video_path: str, config: Dict[str, Any]) -> str:
+        """
+        Apply Ken Burns zoom/pan effect to one scene's video file.
+        
+        Args:
+            video_path: Source video file
+            config: Zoompan settings (see ffmpeg_filters.build_ken_burns_filter)
+            
+        Returns:
+            Path to the new video file
+        """
+        # Lossless intermediate; only the final export encodes H.264
+        output_path = f"{os.path.splitext(video_path)[0]}_kb{INTERMEDIATE_CONTAINER}"
+        run_ffmpeg([
+            '-i', video_path,
+            '-vf', build_ken_burns_filter(config),
+            *INTERMEDIATE_VIDEO_ARGS,
+            '-c:a', 'copy',
+            output_path
+        ])
+        return output_path
 
 
 class BackgroundMusicMixer:
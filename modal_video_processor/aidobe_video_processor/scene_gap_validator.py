@@ -5,8 +5,196 @@ Ensures continuous video with no gaps or overlaps between scenes.
 Based on wanx patterns for seamless video assembly.
 """
 
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Union
 import copy
+import math
+import threading
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+_TIMING_FIELDS = ('start_time', 'end_time', 'duration')
+
+# Below this many scenes, array allocation costs more than the arithmetic,
+# so validation runs as a scalar sweep over plain floats
+_SMALL_SCENE_COUNT = 16
+
+# How many recent validation results each validator remembers
+_RECENT_RESULTS = 4
+
+# Gap and overlap records, in the field order of the result dicts
+_GAP_DTYPE = np.dtype([
+    ('after_scene', np.int64),
+    ('gap_start', np.float64),
+    ('gap_end', np.float64),
+    ('gap_duration', np.float64)
+])
+_OVERLAP_DTYPE = np.dtype([
+    ('scene1', np.int64),
+    ('scene2', np.int64),
+    ('overlap_start', np.float64),
+    ('overlap_end', np.float64),
+    ('overlap_duration', np.float64)
+])
+_GAP_FIELDS = _GAP_DTYPE.names
+_OVERLAP_FIELDS = _OVERLAP_DTYPE.names
+
+
+@dataclass(frozen=True, slots=True)
+class Scene:
+    """
+    Compact scene timing record, accepted anywhere a scene dict is.
+    
+    Slots make each record a fixed-size struct with offset-based attribute
+    access instead of a hashed dict.
+    """
+
+    start_time: float
+    end_time: float
+    duration: float
+
+
+SceneLike = Union[Dict[str, float], Scene]
+
+
+def _to_soa(scenes: List[SceneLike]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read scene timing once into parallel float64 arrays.
+    
+    Returns:
+        (start_times, end_times, durations), indexed like scenes
+    """
+    count = len(scenes)
+    if count and isinstance(scenes[0], Scene):
+        return tuple(
+            np.fromiter((getattr(scene, field) for scene in scenes), dtype=np.float64, count=count)
+            for field in _TIMING_FIELDS
+        )
+    return tuple(
+        np.fromiter((scene[field] for scene in scenes), dtype=np.float64, count=count)
+        for field in _TIMING_FIELDS
+    )
+
+
+def _to_rows(scenes: List[SceneLike]) -> List[Tuple[float, float, float]]:
+    """Read scene timing as (start_time, end_time, duration) tuples of floats."""
+    if scenes and isinstance(scenes[0], Scene):
+        return [
+            (float(scene.start_time), float(scene.end_time), float(scene.duration))
+            for scene in scenes
+        ]
+    return [
+        (float(scene['start_time']), float(scene['end_time']), float(scene['duration']))
+        for scene in scenes
+    ]
+
+
+def _trivial_result(durations) -> Dict[str, Any]:
+    """Continuity result for zero or one scenes."""
+    if not len(durations):
+        return {
+            'is_valid': True,
+            'gaps': [],
+            'overlaps': [],
+            'total_duration': 0.0,
+            'message': 'No scenes to validate'
+        }
+    return {
+        'is_valid': True,
+        'gaps': [],
+        'overlaps': [],
+        'total_duration': float(durations[0]),
+        'message': 'Single scene - no continuity issues possible'
+    }
+
+
+def _continuity_result(
+    gaps: List[tuple], 
+    overlaps: List[tuple], 
+    total_duration: float
+) -> Dict[str, Any]:
+    """Continuity result for two or more scenes, holding gap/overlap records."""
+    is_valid = len(gaps) == 0 and len(overlaps) == 0
+    
+    return {
+        'is_valid': is_valid,
+        'gaps': gaps,
+        'overlaps': overlaps,
+        'total_duration': total_duration,
+        'message': 'Valid continuity' if is_valid else f'{len(gaps)} gaps, {len(overlaps)} overlaps detected'
+    }
+
+
+def _result_dicts(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a result's gap/overlap records into fresh dicts at the API
+    boundary, so callers can never modify a remembered result.
+    """
+    return {
+        **result,
+        'gaps': [dict(zip(_GAP_FIELDS, gap)) for gap in result['gaps']],
+        'overlaps': [dict(zip(_OVERLAP_FIELDS, overlap)) for overlap in result['overlaps']]
+    }
+
+
+def _scene_dicts(scenes: List[SceneLike]) -> List[Dict[str, float]]:
+    """Copy scenes into fresh dicts the fix methods can modify."""
+    if isinstance(scenes[0], Scene):
+        return [
+            {'start_time': scene.start_time, 'end_time': scene.end_time, 'duration': scene.duration}
+            for scene in scenes
+        ]
+    return copy.deepcopy(scenes)
+
+
+def _write_back(
+    scenes: List[Dict[str, float]], 
+    indices: np.ndarray, 
+    columns: Dict[str, np.ndarray]
+) -> None:
+    """
+    Copy changed timing values back into the scene dicts.
+    
+    Each column is unboxed to Python floats with one .tolist() call rather
+    than one numpy scalar conversion per value.
+    """
+    rows = indices.tolist()
+    for field, values in columns.items():
+        for i, value in zip(rows, values[indices].tolist()):
+            scenes[i][field] = value
+
+
+@njit('boolean[:](float64[:], float64[:], float64)', cache=True)
+def _shift_onto_previous(starts, ends, tolerance):
+    """
+    Shift each scene that starts after the previous (already shifted)
+    scene's end back onto that end, in place. Each shift depends on the one
+    before, so this is a typed sequential loop rather than an array op.
+    
+    Returns:
+        Mask of the scenes that were shifted
+    """
+    shifted = np.zeros(starts.shape[0], dtype=np.bool_)
+    
+    for i in range(1, starts.shape[0]):
+        gap_duration = starts[i] - ends[i - 1]
+        if gap_duration > tolerance:
+            starts[i] -= gap_duration
+            ends[i] -= gap_duration
+            shifted[i] = True
+    
+    return shifted
+
+
+# Kernels compiled eagerly (explicit signatures) into the on-disk cache
+_KERNELS = (_shift_onto_previous,)
 
 
 class SceneGapValidator:
@@ -20,17 +208,32 @@ class SceneGapValidator:
             default_tolerance: Default tolerance for gap/overlap detection (seconds)
         """
         self.default_tolerance = default_tolerance
+        # Per-thread scratch rows reused by repeated validations of long lists
+        self._scratch = threading.local()
+        self._recent_results = OrderedDict()
+        self._results_lock = threading.Lock()
+
+    def _scratch_rows(self, size: int) -> np.ndarray:
+        """
+        Two contiguous float64 rows of at least `size` values, reused across
+        calls on this thread so large validations do not hit the allocator.
+        """
+        rows = getattr(self._scratch, 'rows', None)
+        if rows is None or rows.shape[1] < size:
+            rows = np.empty((2, size), dtype=np.float64)
+            self._scratch.rows = rows
+        return rows[:, :size]
 
     def validate_scene_continuity(
         self, 
-        scenes: List[Dict[str, float]], 
+        scenes: List[SceneLike], 
         tolerance: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Validate scene continuity and detect gaps/overlaps.
         
         Args:
-            scenes: List of scene dictionaries with timing information
+            scenes: List of scene dictionaries or Scene records with timing information
             tolerance: Tolerance for gap/overlap detection (uses default if None)
             
         Returns:
@@ -42,85 +245,141 @@ class SceneGapValidator:
         if tolerance is None:
             tolerance = self.default_tolerance
         
-        # Validate scene data
-        self._validate_scene_data(scenes)
+        # Read the timing values once
+        small = len(scenes) <= _SMALL_SCENE_COUNT
+        if small:
+            rows = self._read_scene_rows(scenes)
+            content = tuple(rows)
+        else:
+            columns = self._read_scene_data(scenes)
+            content = b''.join(column.tobytes() for column in columns)
+        
+        # Identical timing checked with the same tolerances always gives the
+        # same result, so repeated validations (e.g. fix, then re-validate)
+        # are served from the recent results
+        key = (content, float(tolerance), self.default_tolerance)
+        with self._results_lock:
+            result = self._recent_results.get(key)
+            if result is not None:
+                self._recent_results.move_to_end(key)
+                return _result_dicts(result)
+        
+        if small:
+            result = self._check_continuity_small(rows, float(tolerance))
+        else:
+            result = self._check_continuity(*columns, np.float64(tolerance))
         
-        if not scenes:
-            return {
-                'is_valid': True,
-                'gaps': [],
-                'overlaps': [],
-                'total_duration': 0.0,
-                'message': 'No scenes to validate'
-            }
-        
-        if len(scenes) == 1:
-            return {
-                'is_valid': True,
-                'gaps': [],
-                'overlaps': [],
-                'total_duration': scenes[0]['duration'],
-                'message': 'Single scene - no continuity issues possible'
-            }
+        with self._results_lock:
+            self._recent_results[key] = result
+            if len(self._recent_results) > _RECENT_RESULTS:
+                self._recent_results.popitem(last=False)
+        return _result_dicts(result)
+
+    def _check_continuity(
+        self, 
+        starts: np.ndarray, 
+        ends: np.ndarray, 
+        durations: np.ndarray, 
+        tolerance: np.float64
+    ) -> Dict[str, Any]:
+        """validate_scene_continuity on SoA timing columns."""
+        self._check_scene_data(starts, ends, durations)
         
-        gaps = []
-        overlaps = []
+        if len(starts) < 2:
+            return _trivial_result(durations)
         
-        # Check continuity between adjacent scenes
-        for i in range(len(scenes) - 1):
-            current_scene = scenes[i]
-            next_scene = scenes[i + 1]
-            
-            gap_duration = next_scene['start_time'] - current_scene['end_time']
-            
-            if gap_duration > tolerance:
-                # Gap detected
-                gaps.append({
-                    'after_scene': i,
-                    'gap_start': current_scene['end_time'],
-                    'gap_end': next_scene['start_time'],
-                    'gap_duration': gap_duration
-                })
-            elif gap_duration < -tolerance:
-                # Overlap detected
-                overlap_duration = abs(gap_duration)
-                overlap_start = next_scene['start_time']
-                overlap_end = current_scene['end_time']
-                
-                overlaps.append({
-                    'scene1': i,
-                    'scene2': i + 1,
-                    'overlap_start': overlap_start,
-                    'overlap_end': overlap_end,
-                    'overlap_duration': overlap_duration
-                })
+        gaps, overlaps, total_duration = self._find_boundary_issues(starts, ends, tolerance)
+        return _continuity_result(gaps, overlaps, total_duration)
+
+    def _check_continuity_small(
+        self, 
+        rows: List[Tuple[float, float, float]], 
+        tolerance: float
+    ) -> Dict[str, Any]:
+        """validate_scene_continuity on timing rows, for short scene lists."""
+        self._check_scene_rows(rows)
+        starts, ends, durations = (list(column) for column in zip(*rows)) if rows else ([], [], [])
+        
+        if len(rows) < 2:
+            return _trivial_result(durations)
+        
+        gaps, overlaps, total_duration = self._find_boundary_issues_small(starts, ends, tolerance)
+        return _continuity_result(gaps, overlaps, total_duration)
+
+    def _find_boundary_issues(
+        self, 
+        starts: np.ndarray, 
+        ends: np.ndarray, 
+        tolerance: np.float64
+    ) -> Tuple[List[tuple], List[tuple], float]:
+        """
+        Find gaps and overlaps between consecutive scenes with array ops.
+        
+        Returns:
+            (gap records, overlap records, total duration); records are tuples
+            in _GAP_DTYPE / _OVERLAP_DTYPE field order
+        """
+        # Compare every boundary between list neighbours at once; the fixers
+        # work by list position too
+        deltas, magnitudes = self._scratch_rows(len(starts))
+        deltas = np.subtract(starts[1:], ends[:-1], out=deltas[:-1])
+        
+        # A single mask finds every boundary outside tolerance; the sign of
+        # each violator's delta then says whether it is a gap or an overlap
+        violators = np.flatnonzero(np.abs(deltas, out=magnitudes[:-1]) > tolerance)
+        violator_deltas = deltas[violators]
+        
+        # Fill fixed-size record arrays column by column; each becomes a
+        # list of tuples in one .tolist() call
+        gap_rows = violators[violator_deltas > 0]
+        gaps = np.empty(len(gap_rows), dtype=_GAP_DTYPE)
+        gaps['after_scene'] = gap_rows
+        gaps['gap_start'] = ends[gap_rows]
+        gaps['gap_end'] = starts[gap_rows + 1]
+        gaps['gap_duration'] = deltas[gap_rows]
+        
+        overlap_rows = violators[violator_deltas < 0]
+        overlaps = np.empty(len(overlap_rows), dtype=_OVERLAP_DTYPE)
+        overlaps['scene1'] = overlap_rows
+        overlaps['scene2'] = overlap_rows + 1
+        overlaps['overlap_start'] = starts[overlap_rows + 1]
+        overlaps['overlap_end'] = ends[overlap_rows]
+        overlaps['overlap_duration'] = -deltas[overlap_rows]
         
         # Calculate total duration
-        if scenes:
-            total_duration = scenes[-1]['end_time'] - scenes[0]['start_time']
-        else:
-            total_duration = 0.0
+        total_duration = float(ends[-1] - starts[0])
         
-        is_valid = len(gaps) == 0 and len(overlaps) == 0
+        return gaps.tolist(), overlaps.tolist(), total_duration
+
+    def _find_boundary_issues_small(
+        self, 
+        starts: List[float], 
+        ends: List[float], 
+        tolerance: float
+    ) -> Tuple[List[tuple], List[tuple], float]:
+        """Scalar _find_boundary_issues for short scene lists."""
+        gaps = []
+        overlaps = []
         
-        return {
-            'is_valid': is_valid,
-            'gaps': gaps,
-            'overlaps': overlaps,
-            'total_duration': total_duration,
-            'message': 'Valid continuity' if is_valid else f'{len(gaps)} gaps, {len(overlaps)} overlaps detected'
-        }
+        for previous in range(len(starts) - 1):
+            delta = starts[previous + 1] - ends[previous]
+            if delta > tolerance:
+                gaps.append((previous, ends[previous], starts[previous + 1], delta))
+            elif delta < -tolerance:
+                overlaps.append((previous, previous + 1, starts[previous + 1], ends[previous], -delta))
+        
+        return gaps, overlaps, ends[-1] - starts[0]
 
     def fix_gaps_extend_previous(
         self, 
-        scenes: List[Dict[str, float]], 
+        scenes: List[SceneLike], 
         min_scene_duration: Optional[float] = None
     ) -> List[Dict[str, float]]:
         """
         Fix gaps by extending the duration of previous scenes.
         
         Args:
-            scenes: List of scene dictionaries
+            scenes: List of scene dictionaries or Scene records
             min_scene_duration: Minimum duration constraint for scenes
             
         Returns:
@@ -129,11 +388,40 @@ class SceneGapValidator:
         if not scenes:
             return scenes
         
-        fixed_scenes = copy.deepcopy(scenes)
+        fixed_scenes = _scene_dicts(scenes)
+        
+        if not min_scene_duration:
+            return self._extend_gaps_unconstrained(fixed_scenes)
+        return self._extend_gaps_constrained(fixed_scenes, min_scene_duration)
+
+    def _extend_gaps_unconstrained(self, scenes: List[Dict[str, float]]) -> List[Dict[str, float]]:
+        """
+        Extend scenes over gaps when no minimum duration applies.
+        
+        Nothing is shifted on this path, so each scene's new end depends only
+        on the next scene's start and all gaps are closed in one array pass.
+        """
+        starts, ends, _ = _to_soa(scenes)
+        next_starts = starts[1:]
         
-        for i in range(len(fixed_scenes) - 1):
-            current_scene = fixed_scenes[i]
-            next_scene = fixed_scenes[i + 1]
+        extended = next_starts - ends[:-1] > self.default_tolerance
+        
+        _write_back(scenes, np.flatnonzero(extended), {
+            'end_time': next_starts,
+            'duration': next_starts - starts[:-1]
+        })
+        
+        return scenes
+
+    def _extend_gaps_constrained(
+        self, 
+        scenes: List[Dict[str, float]], 
+        min_scene_duration: float
+    ) -> List[Dict[str, float]]:
+        """Extend scenes over gaps, growing short scenes and shifting the rest."""
+        for i in range(len(scenes) - 1):
+            current_scene = scenes[i]
+            next_scene = scenes[i + 1]
             
             gap_duration = next_scene['start_time'] - current_scene['end_time']
             
@@ -143,26 +431,25 @@ class SceneGapValidator:
                 current_scene['duration'] = current_scene['end_time'] - current_scene['start_time']
                 
                 # Check minimum duration constraint
-                if min_scene_duration and current_scene['duration'] < min_scene_duration:
+                if current_scene['duration'] < min_scene_duration:
                     # Extend scene to meet minimum
                     extension_needed = min_scene_duration - current_scene['duration']
                     current_scene['end_time'] += extension_needed
                     current_scene['duration'] = min_scene_duration
                     
                     # Shift subsequent scenes to accommodate extension
-                    for j in range(i + 1, len(fixed_scenes)):
-                        shift_amount = extension_needed
-                        fixed_scenes[j]['start_time'] += shift_amount
-                        fixed_scenes[j]['end_time'] += shift_amount
+                    for j in range(i + 1, len(scenes)):
+                        scenes[j]['start_time'] += extension_needed
+                        scenes[j]['end_time'] += extension_needed
         
-        return fixed_scenes
+        return scenes
 
-    def fix_gaps_shift_following(self, scenes: List[Dict[str, float]]) -> List[Dict[str, float]]:
+    def fix_gaps_shift_following(self, scenes: List[SceneLike]) -> List[Dict[str, float]]:
         """
         Fix gaps by shifting subsequent scenes earlier.
         
         Args:
-            scenes: List of scene dictionaries
+            scenes: List of scene dictionaries or Scene records
             
         Returns:
             List of fixed scene dictionaries
@@ -170,29 +457,26 @@ class SceneGapValidator:
         if not scenes:
             return scenes
         
-        fixed_scenes = copy.deepcopy(scenes)
+        fixed_scenes = _scene_dicts(scenes)
         
-        # Process scenes sequentially, shifting each to eliminate gaps
-        for i in range(1, len(fixed_scenes)):
-            current_scene = fixed_scenes[i]
-            previous_scene = fixed_scenes[i - 1]
-            
-            gap_duration = current_scene['start_time'] - previous_scene['end_time']
-            
-            if gap_duration > self.default_tolerance:
-                # Shift current scene to start right after previous scene
-                shift_amount = gap_duration
-                current_scene['start_time'] -= shift_amount
-                current_scene['end_time'] -= shift_amount
+        # Shift scenes sequentially in the compiled kernel, each to start
+        # right after the previous scene
+        starts, ends, _ = _to_soa(fixed_scenes)
+        shifted = _shift_onto_previous(starts, ends, float(self.default_tolerance))
+        
+        _write_back(fixed_scenes, np.flatnonzero(shifted), {
+            'start_time': starts,
+            'end_time': ends
+        })
         
         return fixed_scenes
 
-    def fix_overlaps_trim_previous(self, scenes: List[Dict[str, float]]) -> List[Dict[str, float]]:
+    def fix_overlaps_trim_previous(self, scenes: List[SceneLike]) -> List[Dict[str, float]]:
         """
         Fix overlaps by trimming the end of previous scenes.
         
         Args:
-            scenes: List of scene dictionaries
+            scenes: List of scene dictionaries or Scene records
             
         Returns:
             List of fixed scene dictionaries
@@ -200,34 +484,37 @@ class SceneGapValidator:
         if not scenes:
             return scenes
         
-        fixed_scenes = copy.deepcopy(scenes)
+        fixed_scenes = _scene_dicts(scenes)
         
-        for i in range(len(fixed_scenes) - 1):
-            current_scene = fixed_scenes[i]
-            next_scene = fixed_scenes[i + 1]
-            
-            if current_scene['end_time'] > next_scene['start_time']:
-                # Overlap detected - trim current scene
-                current_scene['end_time'] = next_scene['start_time']
-                current_scene['duration'] = current_scene['end_time'] - current_scene['start_time']
-                
-                # Ensure duration is positive
-                if current_scene['duration'] <= 0:
-                    current_scene['duration'] = 0.1  # Minimum 100ms duration
-                    current_scene['end_time'] = current_scene['start_time'] + current_scene['duration']
+        # Only scene ends change and each is bounded by the next scene's
+        # (unchanged) start, so every overlap is classified and trimmed at once
+        starts, ends, _ = _to_soa(fixed_scenes)
+        trimmed = np.flatnonzero(ends[:-1] > starts[1:])
+        np.minimum(ends[:-1], starts[1:], out=ends[:-1])
+        
+        # Ensure duration is positive (minimum 100ms)
+        durations = ends - starts
+        collapsed = durations <= 0
+        ends[collapsed] = starts[collapsed] + 0.1
+        durations[collapsed] = 0.1
+        
+        _write_back(fixed_scenes, trimmed, {
+            'end_time': ends,
+            'duration': durations
+        })
         
         return fixed_scenes
 
     def fix_all_timing_issues(
         self, 
-        scenes: List[Dict[str, float]], 
+        scenes: List[SceneLike], 
         min_scene_duration: Optional[float] = None
     ) -> List[Dict[str, float]]:
         """
         Fix all timing issues (gaps and overlaps) in scenes.
         
         Args:
-            scenes: List of scene dictionaries
+            scenes: List of scene dictionaries or Scene records
             min_scene_duration: Minimum duration constraint for scenes
             
         Returns:
@@ -236,11 +523,16 @@ class SceneGapValidator:
         if not scenes:
             return scenes
         
-        # Step 1: Fix overlaps first by trimming
-        fixed_scenes = self.fix_overlaps_trim_previous(scenes)
-        
-        # Step 2: Fix gaps by extending previous scenes
-        fixed_scenes = self.fix_gaps_extend_previous(fixed_scenes, min_scene_duration)
+        if min_scene_duration:
+            # Step 1: Fix overlaps first by trimming
+            fixed_scenes = self.fix_overlaps_trim_previous(scenes)
+            
+            # Step 2: Fix gaps by extending previous scenes
+            fixed_scenes = self.fix_gaps_extend_previous(fixed_scenes, min_scene_duration)
+        else:
+            # Steps 1 and 2 touch each boundary independently, so trim and
+            # extend in one pass over one copy
+            fixed_scenes = self._trim_and_extend(scenes)
         
         # Step 3: Validate the result
         validation = self.validate_scene_continuity(fixed_scenes)
@@ -252,16 +544,48 @@ class SceneGapValidator:
         
         return fixed_scenes
 
+    def _trim_and_extend(self, scenes: List[SceneLike]) -> List[Dict[str, float]]:
+        """
+        Fused fix_overlaps_trim_previous + fix_gaps_extend_previous (without
+        a minimum duration): every overlapping or gapped scene ends at the
+        next scene's start, or 100ms after its own start if trimming would
+        collapse it.
+        """
+        fixed_scenes = _scene_dicts(scenes)
+        
+        starts, ends, durations = _to_soa(fixed_scenes)
+        scene_starts = starts[:-1]
+        next_starts = starts[1:]
+        
+        trimmed = ends[:-1] > next_starts
+        extended = next_starts - ends[:-1] > self.default_tolerance
+        changed = np.flatnonzero(trimmed | extended)
+        
+        ends[:-1] = next_starts
+        durations[:-1] = next_starts - scene_starts
+        
+        # Ensure duration is positive (minimum 100ms)
+        collapsed = np.flatnonzero(trimmed & (durations[:-1] <= 0))
+        ends[collapsed] = scene_starts[collapsed] + 0.1
+        durations[collapsed] = 0.1
+        
+        _write_back(fixed_scenes, changed, {
+            'end_time': ends,
+            'duration': durations
+        })
+        
+        return fixed_scenes
+
     def enforce_total_duration(
         self, 
-        scenes: List[Dict[str, float]], 
+        scenes: List[SceneLike], 
         target_duration: float
     ) -> List[Dict[str, float]]:
         """
         Adjust scenes to match target total duration (usually audio duration).
         
         Args:
-            scenes: List of scene dictionaries
+            scenes: List of scene dictionaries or Scene records
             target_duration: Target total duration in seconds
             
         Returns:
@@ -270,70 +594,127 @@ class SceneGapValidator:
         if not scenes:
             return scenes
         
-        fixed_scenes = copy.deepcopy(scenes)
-        current_total = sum(scene['duration'] for scene in fixed_scenes)
+        fixed_scenes = _scene_dicts(scenes)
+        _, _, durations = _to_soa(fixed_scenes)
+        current_total = math.fsum(durations)
         
         if abs(current_total - target_duration) < self.default_tolerance:
             return fixed_scenes  # Already matches
         
-        # Calculate adjustment factor
-        adjustment_factor = target_duration / current_total
-        
-        # Proportionally adjust each scene duration
-        cumulative_time = 0.0
-        for scene in fixed_scenes:
-            scene['start_time'] = cumulative_time
-            scene['duration'] *= adjustment_factor
-            scene['end_time'] = scene['start_time'] + scene['duration']
-            cumulative_time = scene['end_time']
+        # Proportionally adjust each scene duration and lay the scenes
+        # back to back from zero
+        durations *= target_duration / current_total
+        end_times = np.cumsum(durations)
+        start_times = np.concatenate(([0.0], end_times[:-1]))
         
         # Final adjustment to ensure exact match
-        actual_total = cumulative_time
+        actual_total = end_times[-1]
         if abs(actual_total - target_duration) > self.default_tolerance:
             # Adjust last scene to match exactly
-            last_scene = fixed_scenes[-1]
             adjustment = target_duration - actual_total
-            last_scene['duration'] += adjustment
-            last_scene['end_time'] += adjustment
+            durations[-1] += adjustment
+            end_times[-1] += adjustment
+        
+        for scene, start_time, end_time, duration in zip(
+            fixed_scenes, start_times.tolist(), end_times.tolist(), durations.tolist()
+        ):
+            scene['start_time'] = start_time
+            scene['end_time'] = end_time
+            scene['duration'] = duration
         
         return fixed_scenes
 
-    def _validate_scene_data(self, scenes: List[Dict[str, float]]) -> None:
+    def _read_scene_data(
+        self, 
+        scenes: List[SceneLike]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Validate scene data integrity.
+        Read scene timing into SoA columns.
         
         Args:
-            scenes: List of scene dictionaries to validate
+            scenes: List of scene dictionaries or Scene records to validate
+            
+        Returns:
+            The scenes' (start_times, end_times, durations) arrays
             
+        Raises:
+            ValueError: If a scene is missing a timing field
+        """
+        try:
+            return _to_soa(scenes)
+        except KeyError:
+            self._raise_missing_field(scenes)
+            raise
+
+    def _read_scene_rows(self, scenes: List[SceneLike]) -> List[Tuple[float, float, float]]:
+        """_read_scene_data for short scene lists, returning timing rows."""
+        try:
+            return _to_rows(scenes)
+        except KeyError:
+            self._raise_missing_field(scenes)
+            raise
+
+    def _check_scene_data(
+        self, 
+        starts: np.ndarray, 
+        ends: np.ndarray, 
+        durations: np.ndarray
+    ) -> None:
+        """
+        Validate scene data integrity.
+        
         Raises:
             ValueError: If scene data is invalid
         """
+        # Check logical consistency, duration consistency and negative values
+        # for all scenes at once, then report the first offending scene
+        not_ordered = ends <= starts
+        mismatched = np.abs((ends - starts) - durations) > self.default_tolerance
+        negative = (starts < 0) | (durations <= 0)
+        invalid = not_ordered | mismatched | negative
+        if not invalid.any():
+            return
+        
+        i = int(np.argmax(invalid))
+        raise ValueError(self._timing_error(i, float(starts[i]), float(ends[i]), float(durations[i])))
+
+    def _check_scene_rows(self, rows: List[Tuple[float, float, float]]) -> None:
+        """Scalar _check_scene_data for short scene lists."""
+        for i, (start_time, end_time, duration) in enumerate(rows):
+            message = self._timing_error(i, start_time, end_time, duration)
+            if message:
+                raise ValueError(message)
+
+    def _raise_missing_field(self, scenes: List[SceneLike]) -> None:
+        """Name the first missing timing field, walking the scenes in order."""
         for i, scene in enumerate(scenes):
-            # Check required fields
-            required_fields = ['start_time', 'end_time', 'duration']
-            for field in required_fields:
+            for field in _TIMING_FIELDS:
                 if field not in scene:
                     raise ValueError(f"Scene {i} missing required field: {field}")
-            
-            # Check logical consistency
-            if scene['end_time'] <= scene['start_time']:
-                raise ValueError(f"Scene {i}: end_time ({scene['end_time']}) must be greater than start_time ({scene['start_time']})")
-            
-            # Check duration consistency
-            calculated_duration = scene['end_time'] - scene['start_time']
-            if abs(calculated_duration - scene['duration']) > self.default_tolerance:
-                raise ValueError(f"Scene {i}: duration mismatch - calculated: {calculated_duration}, specified: {scene['duration']}")
-            
-            # Check for negative values
-            if scene['start_time'] < 0 or scene['duration'] <= 0:
-                raise ValueError(f"Scene {i}: negative start_time or non-positive duration")
 
-    def get_continuity_summary(self, scenes: List[Dict[str, float]]) -> Dict[str, Any]:
+    def _timing_error(
+        self, 
+        i: int, 
+        start_time: float, 
+        end_time: float, 
+        duration: float
+    ) -> Optional[str]:
+        """Describe the first timing rule scene i breaks, or None if it is consistent."""
+        if end_time <= start_time:
+            return f"Scene {i}: end_time ({end_time}) must be greater than start_time ({start_time})"
+        calculated_duration = end_time - start_time
+        if abs(calculated_duration - duration) > self.default_tolerance:
+            return f"Scene {i}: duration mismatch - calculated: {calculated_duration}, specified: {duration}"
+        if start_time < 0 or duration <= 0:
+            return f"Scene {i}: negative start_time or non-positive duration"
+        return None
+
+    def get_continuity_summary(self, scenes: List[SceneLike]) -> Dict[str, Any]:
         """
         Get comprehensive summary of scene continuity.
         
         Args:
-            scenes: List of scene dictionaries
+            scenes: List of scene dictionaries or Scene records
             
         Returns:
             Dictionary with continuity summary
@@ -8,6 +8,118 @@ Based on wanx patterns for precise video timing synchronization.
 from typing import List, Dict, Any, Optional
 import math
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit('float64[:](float64, int64)', cache=True)
+def _cumulative_scene_durations(audio_duration, scene_count):
+    """
+    Split audio_duration into scene_count durations that track the ideal
+    cumulative boundaries, so rounding error never accumulates.
+    
+    Compiled eagerly at import (explicit signature) and cached on disk, so
+    the first request does not pay JIT latency.
+    """
+    base_duration = audio_duration / scene_count
+    durations = np.empty(scene_count, dtype=np.float64)
+    running_total = 0.0
+    
+    compensation = 0.0
+    
+    for i in range(scene_count):
+        scene_duration = (i + 1) * base_duration - running_total
+        durations[i] = scene_duration
+        # Kahan-compensated running total
+        corrected = scene_duration - compensation
+        total = running_total + corrected
+        compensation = (total - running_total) - corrected
+        running_total = total
+    
+    return durations
+
+
+@njit('float64(float64[:])', cache=True)
+def _kahan_sum(values):
+    """
+    Kahan compensated sum, so the total of many long-mantissa durations
+    does not drift by an ULP per element. Compiled without fastmath, which
+    would let LLVM reassociate the compensation away.
+    """
+    total = 0.0
+    compensation = 0.0
+    for value in values:
+        corrected = value - compensation
+        running = total + corrected
+        compensation = (running - total) - corrected
+        total = running
+    return total
+
+
+@njit('float64[:](float64[:], float64, float64, float64)', cache=True, fastmath=True)
+def _rebalance(durations, min_duration, max_duration, target):
+    """
+    Clamp durations into [min_duration, max_duration], then spread the
+    remaining difference from target evenly over the scenes that still have
+    room, repeating until the total matches. Each pass pins at least one
+    scene to a bound, so at most len(durations) passes are needed.
+    """
+    scene_count = durations.shape[0]
+    rebalanced = np.minimum(np.maximum(durations, min_duration), max_duration)
+    
+    for _ in range(scene_count):
+        residual = target - _kahan_sum(rebalanced)
+        if abs(residual) <= 1e-12:
+            break
+        
+        free_count = 0
+        for i in range(scene_count):
+            if (residual > 0 and rebalanced[i] < max_duration) or (
+                residual < 0 and rebalanced[i] > min_duration
+            ):
+                free_count += 1
+        if free_count == 0:
+            break
+        
+        share = residual / free_count
+        for i in range(scene_count):
+            if (residual > 0 and rebalanced[i] < max_duration) or (
+                residual < 0 and rebalanced[i] > min_duration
+            ):
+                rebalanced[i] = min(max(rebalanced[i] + share, min_duration), max_duration)
+    
+    return rebalanced
+
+
+# Kernels compiled eagerly (explicit signatures) into the on-disk cache
+_KERNELS = (_cumulative_scene_durations, _kahan_sum, _rebalance)
+
+
+def compile_kernels() -> int:
+    """
+    Compile the Numba kernels ahead of time into their on-disk cache.
+    
+    The explicit signatures make numba compile (or load from cache) each
+    kernel when its module is imported, so running
+    `python -m aidobe_video_processor.scene_timing` as an image build step
+    ships the cache with the image and containers never JIT-compile on
+    their first request.
+    
+    Returns:
+        Number of compiled kernel signatures (0 when numba is unavailable)
+    """
+    from . import scene_gap_validator, video_assembler
+    
+    return sum(
+        len(getattr(kernel, 'signatures', ()))
+        for kernel in (*_KERNELS, *scene_gap_validator._KERNELS, *video_assembler._KERNELS)
+    )
+
 
 class SceneTimingCalculator:
     """Calculate precise scene timing distribution based on audio duration."""
@@ -78,7 +190,9 @@ class SceneTimingCalculator:
     def distribute_scene_durations_weighted(
         self, 
         audio_duration: float, 
-        scene_weights: List[float]
+        scene_weights: List[float],
+        min_scene_duration: Optional[float] = None,
+        max_scene_duration: Optional[float] = None
     ) -> List[float]:
         """
         Distribute audio duration based on scene weights/importance.
@@ -86,6 +200,8 @@ class SceneTimingCalculator:
         Args:
             audio_duration: Total audio duration in seconds
             scene_weights: List of weights for each scene
+            min_scene_duration: Minimum duration per scene
+            max_scene_duration: Maximum duration per scene
             
         Returns:
             List of scene durations in seconds
@@ -95,20 +211,73 @@ class SceneTimingCalculator:
         if not scene_weights or any(w <= 0 for w in scene_weights):
             raise ValueError("All scene weights must be positive")
         
-        total_weight = sum(scene_weights)
-        durations = []
-        
-        for weight in scene_weights:
-            duration = (weight / total_weight) * audio_duration
-            durations.append(duration)
+        weights = np.asarray(scene_weights, dtype=np.float64)
+        durations = weights / weights.sum() * audio_duration
         
         # Ensure exact total (handle floating point precision)
-        actual_total = sum(durations)
+        actual_total = math.fsum(durations)
         if abs(actual_total - audio_duration) > 0.001:
             # Adjust last scene to match exact total
             durations[-1] += (audio_duration - actual_total)
         
-        return durations
+        if min_scene_duration is not None or max_scene_duration is not None:
+            return self.rebalance_scene_durations(
+                durations.tolist(), audio_duration, min_scene_duration, max_scene_duration
+            )
+        
+        return durations.tolist()
+
+    def rebalance_scene_durations(
+        self, 
+        durations: List[float], 
+        target_duration: float,
+        min_scene_duration: Optional[float] = None,
+        max_scene_duration: Optional[float] = None
+    ) -> List[float]:
+        """
+        Move time between scenes so each stays within bounds and the total
+        matches target_duration. Adjustments are recorded in the
+        rebalancing log.
+        
+        Args:
+            durations: Current scene durations in seconds
+            target_duration: Required total duration in seconds
+            min_scene_duration: Minimum duration per scene
+            max_scene_duration: Maximum duration per scene
+            
+        Returns:
+            List of rebalanced scene durations in seconds
+            
+        Raises:
+            ValueError: If the bounds cannot be met for target_duration
+        """
+        if not durations:
+            raise ValueError("Durations cannot be empty")
+        
+        min_duration = 0.0 if min_scene_duration is None else float(min_scene_duration)
+        max_duration = math.inf if max_scene_duration is None else float(max_scene_duration)
+        scene_count = len(durations)
+        
+        if min_duration > max_duration:
+            raise ValueError("Minimum scene duration exceeds maximum")
+        if min_duration * scene_count > target_duration + 0.001 or (
+            max_duration * scene_count < target_duration - 0.001
+        ):
+            raise ValueError(
+                f"Cannot fit {scene_count} scenes within [{min_duration}, {max_duration}]s "
+                f"into {target_duration}s"
+            )
+        
+        original = np.asarray(durations, dtype=np.float64)
+        rebalanced = _rebalance(original, min_duration, max_duration, float(target_duration))
+        
+        adjustments = rebalanced - original
+        self._rebalancing_log.extend(
+            {'scene': int(i), 'adjustment': float(adjustments[i])}
+            for i in np.flatnonzero(np.abs(adjustments) > 1e-9)
+        )
+        
+        return rebalanced.tolist()
 
     def calculate_scene_timing(
         self, 
@@ -134,31 +303,22 @@ class SceneTimingCalculator:
         )
         
         # Calculate start and end times
-        start_times = []
-        end_times = []
-        current_time = 0.0
-        
-        for duration in durations:
-            start_times.append(current_time)
-            current_time += duration
-            end_times.append(current_time)
-        
-        # Check for gaps
-        gaps_detected = []
-        for i in range(len(start_times) - 1):
-            gap = start_times[i + 1] - end_times[i]
-            if abs(gap) > 0.001:  # Significant gap
-                gaps_detected.append({
-                    'after_scene': i,
-                    'gap_duration': gap
-                })
+        end_times = np.cumsum(durations)
+        start_times = np.concatenate(([0.0], end_times[:-1]))
+        
+        # Check for significant gaps
+        gaps = start_times[1:] - end_times[:-1]
+        gaps_detected = [
+            {'after_scene': int(i), 'gap_duration': float(gaps[i])}
+            for i in np.flatnonzero(np.abs(gaps) > 0.001)
+        ]
         
         result = {
             'durations': durations,
-            'start_times': start_times,
-            'end_times': end_times,
+            'start_times': start_times.tolist(),
+            'end_times': end_times.tolist(),
             'gaps_detected': gaps_detected,
-            'total_duration': sum(durations)
+            'total_duration': float(end_times[-1])
         }
         
         if enable_rebalancing:
@@ -174,33 +334,25 @@ class SceneTimingCalculator:
     ) -> List[float]:
         """Distribute duration with deficit/surplus tracking algorithm."""
         base_duration = audio_duration / scene_count
-        durations = []
-        running_total = 0.0
+        durations = _cumulative_scene_durations(float(audio_duration), scene_count)
         
-        for i in range(scene_count):
-            # Calculate ideal duration for this scene
-            ideal_total = (i + 1) * base_duration
-            scene_duration = ideal_total - running_total
-            
-            if track_deficit_surplus:
-                deficit = max(0, base_duration - scene_duration)
-                surplus = max(0, scene_duration - base_duration)
-                
-                if deficit > 0:
-                    self._deficits.append({'scene': i, 'deficit': deficit})
-                if surplus > 0:
-                    self._surpluses.append({'scene': i, 'surplus': surplus})
-            
-            durations.append(scene_duration)
-            running_total += scene_duration
+        if track_deficit_surplus:
+            deviations = durations - base_duration
+            self._deficits.extend(
+                {'scene': int(i), 'deficit': float(-deviations[i])}
+                for i in np.flatnonzero(deviations < 0)
+            )
+            self._surpluses.extend(
+                {'scene': int(i), 'surplus': float(deviations[i])}
+                for i in np.flatnonzero(deviations > 0)
+            )
         
         # Final adjustment for precision
-        actual_total = sum(durations)
+        actual_total = math.fsum(durations)
         if abs(actual_total - audio_duration) > 0.001:
-            adjustment = audio_duration - actual_total
-            durations[-1] += adjustment
+            durations[-1] += audio_duration - actual_total
         
-        return durations
+        return durations.tolist()
 
     def _distribute_with_minimum_constraint(
         self, 
@@ -210,7 +362,7 @@ class SceneTimingCalculator:
     ) -> List[float]:
         """Distribute with minimum duration constraint."""
         durations = [min_duration] * scene_count
-        total_min = sum(durations)
+        total_min = math.fsum(durations)
         
         if total_min > audio_duration:
             # Need to extend total duration to meet minimums
@@ -237,7 +389,7 @@ class SceneTimingCalculator:
         
         # Cap scenes at maximum and distribute remaining
         durations = [max_duration] * scene_count
-        total_capped = sum(durations)
+        total_capped = math.fsum(durations)
         
         if total_capped < audio_duration:
             # Add more scenes for remaining duration
@@ -268,4 +420,8 @@ class SceneTimingCalculator:
         """Clear deficit/surplus tracking data."""
         self._deficits.clear()
         self._surpluses.clear()
-        self._rebalancing_log.clear()
\ No newline at end of file
+        self._rebalancing_log.clear()
+
+
+if __name__ == '__main__':
+    print(f"Compiled {compile_kernels()} kernel signatures")
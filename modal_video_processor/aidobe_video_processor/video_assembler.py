@@ -6,38 +6,178 @@ Integrates AudioDurationExtractor, SceneTimingCalculator, SceneGapValidator, and
 Based on wanx patterns for professional video generation.
 """
 
-from typing import List, Dict, Any, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Tuple
+import logging
+import math
+import re
+import shutil
+import subprocess
 import tempfile
 import os
+import weakref
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; captions then blend with NumPy
+    njit = None
+
 from .audio_duration import AudioDurationExtractor
 from .scene_timing import SceneTimingCalculator
-from .scene_gap_validator import SceneGapValidator
+from .scene_gap_validator import Scene, SceneGapValidator
 from .audio_master_sync import AudioMasterSync
 
+logger = logging.getLogger(__name__)
+
+
+# Frame sizes for the named output resolutions
+_RESOLUTION_MAP = {
+    '1080p': (1920, 1080),
+    '720p': (1280, 720),
+    '480p': (854, 480)
+}
+
+# Stream-copied assemblies still untouched by effects, mapped to their file.
+# MoviePy transforms return new clips, so membership means the file's
+# encoded frames are exactly what export would otherwise re-encode
+_STREAM_COPIED_FILES: 'weakref.WeakKeyDictionary[Any, str]' = weakref.WeakKeyDictionary()
+
+# Temporary files by path, and the temporary file each MoviePy reader was
+# opened from. A reader keeps its file alive, so a temporary file is
+# deleted once neither the code that made it nor any clip reads from it
+_TEMPORARY_FILES: 'weakref.WeakValueDictionary[str, _TemporaryFile]' = weakref.WeakValueDictionary()
+_READER_FILES: 'weakref.WeakKeyDictionary[Any, _TemporaryFile]' = weakref.WeakKeyDictionary()
+
+# Preview trims by (source id, start, end), and the source each id names.
+# Both hold weakly, so previews share trims without pinning their sources
+_PREVIEW_SUBCLIPS: 'weakref.WeakValueDictionary[Tuple[int, float, float], Any]' = weakref.WeakValueDictionary()
+_PREVIEW_SOURCES: 'weakref.WeakValueDictionary[int, Any]' = weakref.WeakValueDictionary()
+
+# TextClip style keys the Pillow caption renderer reproduces
+_CAPTION_STYLE_KEYS = frozenset({
+    'fontsize', 'color', 'font', 'stroke_color', 'stroke_width',
+    'bg_color', 'align', 'interline', 'method', 'size'
+})
+
+# ImageMagick gravity names accepted as TextClip align values
+_CAPTION_ALIGN = {
+    'center': 'center', 'west': 'left', 'left': 'left', 'east': 'right', 'right': 'right'
+}
+
+# Style words ending ImageMagick font names such as 'Arial-Bold'
+_FONT_STYLES = frozenset({
+    'regular', 'bold', 'italic', 'oblique', 'bolditalic', 'boldoblique', 'light', 'medium'
+})
+
+# Encoded frames between export progress reports
+_PROGRESS_INTERVAL = 30
+
+
+def _alpha_blend_numpy(background: np.ndarray, foreground: np.ndarray, alpha: np.ndarray) -> None:
+    """_alpha_blend for environments without numba."""
+    mask = alpha[:, :, None]
+    background[...] = 1.0 * mask * foreground + (1.0 - mask) * background
+
+
+if njit is not None:
+    @njit('void(uint8[:, :, :], uint8[:, :, :], float64[:, :])', cache=True)
+    def _alpha_blend(background, foreground, alpha):
+        """
+        Blend foreground over an equally sized background region in place.
+        
+        Uses MoviePy's blit arithmetic (truncating back to uint8), so frames
+        match what CompositeVideoClip would produce.
+        """
+        height, width, channels = background.shape
+        for i in range(height):
+            for j in range(width):
+                a = alpha[i, j]
+                for c in range(channels):
+                    background[i, j, c] = np.uint8(
+                        1.0 * a * foreground[i, j, c] + (1.0 - a) * background[i, j, c]
+                    )
+    
+    _KERNELS = (_alpha_blend,)
+else:
+    _alpha_blend = _alpha_blend_numpy
+    _KERNELS = ()
+
+
+# Assembly helpers are shared by every VideoAssembler in the process: the
+# assembler only calls their stateless entry points, and sharing also pools
+# the duration probe cache and worker and the recent validation results
+@lru_cache(maxsize=1)
+def _get_audio_extractor() -> AudioDurationExtractor:
+    """Process-wide AudioDurationExtractor."""
+    return AudioDurationExtractor()
+
+
+@lru_cache(maxsize=1)
+def _get_scene_timing() -> SceneTimingCalculator:
+    """Process-wide SceneTimingCalculator."""
+    return SceneTimingCalculator()
+
+
+@lru_cache(maxsize=1)
+def _get_gap_validator() -> SceneGapValidator:
+    """Process-wide SceneGapValidator."""
+    return SceneGapValidator()
+
+
+@lru_cache(maxsize=1)
+def _get_audio_sync() -> AudioMasterSync:
+    """Process-wide AudioMasterSync."""
+    return AudioMasterSync()
+
 
 class VideoAssembler:
     """Complete video assembly pipeline with integrated timing and validation."""
 
-    def __init__(self):
-        """Initialize the video assembler with component dependencies."""
-        self.audio_extractor = AudioDurationExtractor()
-        self.scene_timing = SceneTimingCalculator()
-        self.gap_validator = SceneGapValidator()
-        self.audio_sync = AudioMasterSync()
+    @property
+    def audio_extractor(self) -> AudioDurationExtractor:
+        """Shared audio duration extractor."""
+        return _get_audio_extractor()
+
+    @property
+    def scene_timing(self) -> SceneTimingCalculator:
+        """Shared scene timing calculator."""
+        return _get_scene_timing()
+
+    @property
+    def gap_validator(self) -> SceneGapValidator:
+        """Shared scene gap validator."""
+        return _get_gap_validator()
+
+    @property
+    def audio_sync(self) -> AudioMasterSync:
+        """Shared audio master sync."""
+        return _get_audio_sync()
 
     def assemble_video(
         self, 
         video_clips: List[Any], 
         audio_clip: Any,
-        output_config: Optional[Dict[str, Any]] = None
+        output_config: Optional[Dict[str, Any]] = None,
+        prefer_stream_copy: bool = True
     ) -> Any:
         """
         Assemble basic video with synchronized audio.
         
+        When every clip is a ClipSource sharing one codec, pixel format, size
+        and frame rate, and the audio is a whole file, the files are joined
+        and muxed by FFmpeg stream copy without decoding a frame. Anything
+        else is concatenated with MoviePy.
+        
         Args:
-            video_clips: List of video clip objects (MoviePy VideoClips)
-            audio_clip: Audio clip object (MoviePy AudioClip)
+            video_clips: List of video clip objects (MoviePy VideoClips) or
+                ClipSource files
+            audio_clip: Audio clip object (MoviePy AudioClip) or audio file
+                path (str or os.PathLike)
             output_config: Output configuration (resolution, fps, etc.)
+            prefer_stream_copy: Use the stream copy path when inputs allow it
             
         Returns:
             Assembled composite video clip
@@ -49,6 +189,13 @@ class VideoAssembler:
         self._validate_inputs(video_clips, audio_clip)
         
         try:
+            if prefer_stream_copy and not output_config:
+                assembled = self._stream_copy_assembly(video_clips, audio_clip)
+                if assembled is not None:
+                    return assembled
+            
+            video_clips, audio_clip = self._open_file_sources(video_clips, audio_clip)
+            
             # Import MoviePy components
             try:
                 from moviepy.editor import CompositeVideoClip, concatenate_videoclips
@@ -77,6 +224,65 @@ class VideoAssembler:
         except Exception as e:
             raise Exception(f"Video assembly failed: {e}")
 
+    def _stream_copy_assembly(self, video_clips: List[Any], audio_clip: Any) -> Optional[Any]:
+        """
+        Join ClipSource files and mux the audio file with FFmpeg stream copy.
+        
+        Returns:
+            The assembled video, or None when the inputs need re-encoding
+        """
+        from .ffmpeg_filters import (
+            INTERMEDIATE_CONTAINER, ClipSource, probe_video_format, stream_copy_concat
+        )
+        
+        if not all(isinstance(clip, ClipSource) for clip in video_clips):
+            return None
+        audio_path = _whole_audio_file(audio_clip)
+        if audio_path is None:
+            return None
+        
+        # Each distinct file is probed once, and only identical formats can
+        # share one copied stream
+        formats = {probe_video_format(path) for path in {clip.path for clip in video_clips}}
+        if len(formats) != 1 or None in formats:
+            return None
+        
+        from moviepy.editor import VideoFileClip
+        
+        # Deleted on failure, or once no clip reads the joined file
+        output = _TemporaryFile(INTERMEDIATE_CONTAINER)
+        stream_copy_concat(video_clips, audio_path, output.path)
+        
+        video = VideoFileClip(output.path)
+        _keep_file_for(video.reader, output.path)
+        _STREAM_COPIED_FILES[video] = output.path
+        return video
+
+    def _open_file_sources(self, video_clips: List[Any], audio_clip: Any) -> Tuple[List[Any], Any]:
+        """Open ClipSource files and an audio path as MoviePy clips."""
+        from .ffmpeg_filters import ClipSource
+        
+        if any(isinstance(clip, ClipSource) for clip in video_clips):
+            from moviepy.editor import VideoFileClip
+            
+            def open_source(source: ClipSource) -> Any:
+                video = VideoFileClip(source.path, audio=False)
+                _keep_file_for(video.reader, source.path)
+                return video.subclip(source.inpoint, source.inpoint + source.duration)
+            
+            video_clips = [
+                open_source(clip) if isinstance(clip, ClipSource) else clip
+                for clip in video_clips
+            ]
+        
+        if isinstance(audio_clip, (str, os.PathLike)):
+            from moviepy.editor import AudioFileClip
+            audio_path = os.fspath(audio_clip)
+            audio_clip = AudioFileClip(audio_path)
+            _keep_file_for(audio_clip.reader, audio_path)
+        
+        return video_clips, audio_clip
+
     def assemble_video_with_timing(
         self, 
         video_clips: List[Any], 
@@ -131,16 +337,7 @@ class VideoAssembler:
         """
         if fix_gaps:
             # Create scene timing data for validation
-            scenes = []
-            current_time = 0.0
-            for clip in video_clips:
-                duration = clip.duration
-                scenes.append({
-                    'start_time': current_time,
-                    'end_time': current_time + duration,
-                    'duration': duration
-                })
-                current_time += duration
+            scenes = _scene_timeline(_clip_durations(video_clips))
             
             # Validate and fix timing issues
             validation = self.gap_validator.validate_scene_continuity(scenes)
@@ -241,8 +438,7 @@ class VideoAssembler:
         caption_clips = self._create_caption_clips(captions_data, caption_style)
         
         # Composite video with captions
-        from moviepy.editor import CompositeVideoClip
-        final_video = CompositeVideoClip([base_video] + caption_clips)
+        final_video = _overlay_captions(base_video, caption_clips)
         
         return final_video
 
@@ -274,25 +470,25 @@ class VideoAssembler:
             len(video_clips)
         )
         
-        # Step 2: Audio-master synchronization
-        synced_clips = self.audio_sync.sync_complete_video_to_master_audio(
-            video_clips, 
-            audio_duration,
-            scene_durations=scene_durations
-        )
+        # Steps 2 and 3 both depend only on the scene durations, so the
+        # audio-master sync runs on a worker while the gaps are validated
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # Step 2: Audio-master synchronization
+            sync_future = pool.submit(
+                self.audio_sync.sync_complete_video_to_master_audio,
+                video_clips, 
+                audio_duration,
+                scene_durations=scene_durations
+            )
+            
+            # Step 3: Gap validation
+            scenes = _scene_timeline(scene_durations[:len(video_clips)])
+            
+            validation = self.gap_validator.validate_scene_continuity(scenes)
+            synced_clips = sync_future.result()
         
-        # Step 3: Gap validation and fixing
-        scenes = []
-        current_time = 0.0
-        for clip, duration in zip(synced_clips, scene_durations):
-            scenes.append({
-                'start_time': current_time,
-                'end_time': current_time + duration,
-                'duration': duration
-            })
-            current_time += duration
-        
-        validation = self.gap_validator.validate_scene_continuity(scenes)
+        # Fix gaps on the synced clips
+        scenes = scenes[:len(synced_clips)]
         if not validation['is_valid']:
             fixed_scenes = self.gap_validator.fix_all_timing_issues(scenes)
             # Apply fixes to clips
@@ -310,8 +506,7 @@ class VideoAssembler:
         # Step 6: Caption overlay
         if captions_data:
             caption_clips = self._create_caption_clips(captions_data, effects_config.get('caption_style'))
-            from moviepy.editor import CompositeVideoClip
-            assembled_video = CompositeVideoClip([assembled_video] + caption_clips)
+            assembled_video = _overlay_captions(assembled_video, caption_clips)
         
         return assembled_video
 
@@ -326,19 +521,43 @@ class VideoAssembler:
         """
         Assemble video with background music mixing.
         
+        When both tracks are whole audio files they are mixed by FFmpeg in
+        one pass; otherwise MoviePy composites them.
+        
         Args:
             video_clips: List of video clip objects
-            main_audio: Main audio track
-            background_music: Background music track
+            main_audio: Main audio track (clip or file path)
+            background_music: Background music track (clip or file path)
             music_volume: Volume level for background music
             fade_duration: Fade in/out duration for music
             
         Returns:
             Assembled video with mixed audio
         """
+        narration_path = _whole_audio_file(main_audio)
+        music_path = _whole_audio_file(background_music)
+        if narration_path and music_path:
+            # Mix in one FFmpeg pass instead of resampling both tracks
+            # frame by frame in Python
+            from .ffmpeg_filters import mix_background_music
+            
+            if isinstance(main_audio, (str, os.PathLike)):
+                narration_duration = self.audio_extractor.extract_duration(narration_path, use_cache=True)
+            else:
+                narration_duration = main_audio.duration
+            
+            # Kept only while the assembled clip reads the mix (a
+            # stream-copied assembly has already copied it)
+            mixed = _TemporaryFile('.wav')
+            mix_background_music(
+                narration_path, music_path, mixed.path,
+                narration_duration, music_volume, fade_duration
+            )
+            return self.assemble_video(video_clips, mixed.path)
+        
         # Prepare background music
-        music_duration = main_audio.duration
-        background_music = background_music.subclip(0, music_duration)
+        narration_duration = main_audio.duration
+        background_music = background_music.subclip(0, narration_duration)
         background_music = background_music.volumex(music_volume)
         
         # Add fade in/out to background music
@@ -363,8 +582,11 @@ class VideoAssembler:
         """
         Assemble video with speed adjustment for timing.
         
+        ClipSource files are re-timed by FFmpeg's setpts filter in parallel
+        processes; other clips use MoviePy's speedx.
+        
         Args:
-            video_clips: List of video clip objects
+            video_clips: List of video clip objects or ClipSource files
             audio_clip: Audio clip object
             target_duration: Target video duration
             preserve_pitch: Whether to preserve audio pitch
@@ -373,21 +595,37 @@ class VideoAssembler:
             Assembled video with speed adjustment
         """
         # Calculate total video duration
-        total_video_duration = sum(clip.duration for clip in video_clips)
+        total_video_duration = _total_duration(video_clips)
         
         if abs(total_video_duration - target_duration) > 0.1:
             # Calculate speed factor
             speed_factor = total_video_duration / target_duration
             
+            from .ffmpeg_filters import INTERMEDIATE_CONTAINER, ClipSource, retime_clip_files
+            
             # Apply speed adjustment to video clips
             adjusted_clips = []
             for clip in video_clips:
-                if speed_factor != 1.0:
+                if speed_factor != 1.0 and not isinstance(clip, ClipSource):
                     adjusted_clip = clip.fx(lambda c: c.speedx(speed_factor))
                     adjusted_clips.append(adjusted_clip)
                 else:
                     adjusted_clips.append(clip)
             
+            file_indices = [
+                index for index, clip in enumerate(video_clips) if isinstance(clip, ClipSource)
+            ]
+            if file_indices:
+                # Kept only while the assembled clip reads them (a
+                # stream-copied assembly has already copied them)
+                outputs = [_TemporaryFile(INTERMEDIATE_CONTAINER) for _ in file_indices]
+                retimed = retime_clip_files(
+                    [video_clips[index] for index in file_indices], speed_factor,
+                    [output.path for output in outputs]
+                )
+                for index, clip in zip(file_indices, retimed):
+                    adjusted_clips[index] = clip
+            
             video_clips = adjusted_clips
         
         return self.assemble_video(video_clips, audio_clip)
@@ -397,20 +635,36 @@ class VideoAssembler:
         video_clips: List[Any], 
         audio_clip: Any,
         chunk_size: int = 5,
-        cleanup_intermediate: bool = True
+        cleanup_intermediate: bool = True,
+        output_path: Optional[str] = None
     ) -> Any:
         """
         Assemble video with memory optimization for large projects.
         
+        When every clip is a ClipSource, the files are joined by the FFmpeg
+        concat demuxer and the result is opened lazily, so no frames are held
+        in Python however many scenes the job has. Files that need
+        re-encoding are encoded chunk_size at a time in parallel FFmpeg
+        processes. Other clips fall back to chunked MoviePy concatenation.
+        
         Args:
-            video_clips: List of video clip objects
+            video_clips: List of video clip objects or ClipSource files
             audio_clip: Audio clip object
             chunk_size: Number of clips to process in each chunk
             cleanup_intermediate: Whether to cleanup intermediate files
+            output_path: Where to write the concatenated video (ClipSource
+                input only; defaults to a temporary file)
             
         Returns:
             Memory-optimized assembled video
         """
+        from .ffmpeg_filters import ClipSource
+        
+        if video_clips and all(isinstance(clip, ClipSource) for clip in video_clips):
+            return self._assemble_from_files(
+                video_clips, audio_clip, output_path, cleanup_intermediate, chunk_size
+            )
+        
         if len(video_clips) <= chunk_size:
             return self.assemble_video(video_clips, audio_clip)
         
@@ -429,6 +683,44 @@ class VideoAssembler:
         
         return final_video
 
+    def _assemble_from_files(
+        self, 
+        sources: List[Any], 
+        audio_clip: Any,
+        output_path: Optional[str],
+        cleanup_intermediate: bool,
+        chunk_size: int = 5
+    ) -> Any:
+        """Concatenate ClipSource files with FFmpeg and lay the master audio over them."""
+        from moviepy.editor import VideoFileClip
+        from .ffmpeg_filters import (
+            INTERMEDIATE_CONTAINER, concat_clip_files, concat_clip_files_parallel
+        )
+        
+        # A temporary output lives as long as the clip reading it
+        temporary = None
+        if output_path is None:
+            temporary = _TemporaryFile(INTERMEDIATE_CONTAINER)
+            output_path = temporary.path
+        manifest_path = os.path.splitext(output_path)[0] + '.ffconcat'
+        
+        # Intra-only intermediates can be cut at any frame without re-encoding
+        stream_copy = all(source.path.endswith(INTERMEDIATE_CONTAINER) for source in sources)
+        
+        try:
+            if stream_copy:
+                concat_clip_files(sources, output_path, True, manifest_path)
+            else:
+                # Re-encoding is the slow part, so spread chunks over the cores
+                concat_clip_files_parallel(sources, output_path, chunk_size, manifest_path=manifest_path)
+        finally:
+            if cleanup_intermediate and os.path.exists(manifest_path):
+                os.remove(manifest_path)
+        
+        video = VideoFileClip(output_path, audio=False)
+        _keep_file_for(video.reader, output_path)
+        return video.set_audio(audio_clip)
+
     def assemble_video_with_progress(
         self, 
         video_clips: List[Any], 
@@ -476,7 +768,11 @@ class VideoAssembler:
         self, 
         composite_video: Any, 
         output_path: str,
-        export_config: Optional[Dict[str, Any]] = None
+        export_config: Optional[Dict[str, Any]] = None,
+        streamable: bool = False,
+        filtergraph: Optional[str] = None,
+        filter_inputs: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[float], None]] = None
     ) -> str:
         """
         Export assembled video with quality settings.
@@ -484,7 +780,17 @@ class VideoAssembler:
         Args:
             composite_video: Assembled composite video
             output_path: Output file path
-            export_config: Export configuration
+            export_config: Export configuration. libx264 exports without a
+                preset use a hardware H.264 encoder when one works here
+                (disable with 'allow_hw': False), else the ultrafast preset
+            streamable: Write fragmented MP4 so the file is only ever appended
+                to and can be uploaded while it is still being written
+            filtergraph: Optional fused FFmpeg graph (see
+                ffmpeg_filters.build_fused_filtergraph) applied during export
+            filter_inputs: Extra graph inputs, e.g. background music
+            progress_callback: Called with the fraction of frames encoded
+                (0.0 to 1.0) every 30 frames; frames are then streamed
+                straight to imageio-ffmpeg instead of write_videofile
             
         Returns:
             Path to exported video file
@@ -498,10 +804,180 @@ class VideoAssembler:
         
         if export_config:
             export_kwargs.update(export_config)
+        allow_hw = export_kwargs.pop('allow_hw', True)
+        
+        if streamable:
+            export_kwargs['ffmpeg_params'] = list(export_kwargs.get('ffmpeg_params') or []) + [
+                '-movflags', 'frag_keyframe+empty_moov'
+            ]
+        
+        if filtergraph:
+            return self._export_with_filtergraph(
+                composite_video, _fast_encoder_settings(export_kwargs, allow_hw),
+                filtergraph, filter_inputs or [], progress_callback
+            )
+        
+        if self._export_with_stream_copy(composite_video, export_kwargs):
+            if progress_callback:
+                progress_callback(1.0)
+            return output_path
+        
+        export_kwargs = _fast_encoder_settings(export_kwargs, allow_hw)
+        if progress_callback:
+            return self._export_with_progress(composite_video, export_kwargs, progress_callback)
+        
+        settings = _export_settings(export_kwargs)
+        if settings is None:
+            composite_video.write_videofile(**export_kwargs)
+        else:
+            _export_writer(settings)(composite_video, output_path)
+        return output_path
+
+    def _export_with_progress(
+        self, 
+        composite_video: Any, 
+        export_kwargs: Dict[str, Any],
+        progress_callback: Callable[[float], None]
+    ) -> str:
+        """
+        Encode rendered frames with imageio-ffmpeg's frame writer.
+        
+        Frames are sent to the encoder directly, without MoviePy's per-frame
+        progress bar, and progress is reported every 30 frames.
+        """
+        from imageio_ffmpeg import write_frames
+        
+        output_path = export_kwargs['filename']
+        fps = export_kwargs['fps']
+        output_params = []
+        if export_kwargs.get('preset'):
+            output_params.extend(['-preset', export_kwargs['preset']])
+        output_params.extend(export_kwargs.get('ffmpeg_params') or [])
         
-        composite_video.write_videofile(**export_kwargs)
+        audio_path = _write_temp_audio(composite_video, output_path)
+        try:
+            # quality=None leaves the encoder's default rate control, as
+            # write_videofile does
+            writer = write_frames(
+                output_path, composite_video.size, fps=fps,
+                codec=export_kwargs['codec'], quality=None,
+                bitrate=export_kwargs.get('bitrate'), macro_block_size=1,
+                output_params=output_params, audio_path=audio_path,
+                audio_codec=export_kwargs['audio_codec'] if audio_path else None
+            )
+            writer.send(None)
+            try:
+                for frame in _contiguous_frames(
+                    _frames_with_progress(composite_video, fps, progress_callback)
+                ):
+                    writer.send(frame)
+            finally:
+                writer.close()
+        finally:
+            if audio_path and os.path.exists(audio_path):
+                os.remove(audio_path)
+        
+        progress_callback(1.0)
         return output_path
 
+    def _export_with_stream_copy(self, composite_video: Any, export_kwargs: Dict[str, Any]) -> bool:
+        """
+        Remux an untouched stream-copied assembly instead of re-encoding it.
+        
+        Only applies when the assembled file already has the requested codec
+        and frame rate and no bitrate or preset asks for a new encode.
+        
+        Returns:
+            True if the video was exported, False if it needs write_videofile
+        """
+        source_path = _STREAM_COPIED_FILES.get(composite_video)
+        if source_path is None or export_kwargs.get('bitrate') or export_kwargs.get('preset'):
+            return False
+        
+        from .ffmpeg_filters import encoder_stream_codec, probe_video_format, stream_copy_remux
+        
+        video_format = probe_video_format(source_path)
+        if video_format is None:
+            return False
+        codec, _, _, fps = video_format
+        try:
+            same_rate = abs(float(fps) - float(export_kwargs['fps'])) < 0.01
+        except ValueError:
+            same_rate = False
+        if not same_rate or codec != encoder_stream_codec(export_kwargs['codec']):
+            return False
+        
+        stream_copy_remux(
+            source_path, export_kwargs['filename'], export_kwargs['audio_codec'],
+            export_kwargs.get('ffmpeg_params') or []
+        )
+        return True
+
+    def _export_with_filtergraph(
+        self, 
+        composite_video: Any, 
+        export_kwargs: Dict[str, Any],
+        filtergraph: str,
+        filter_inputs: List[str],
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> str:
+        """
+        Pipe rendered frames through FFmpeg and apply every effect in one pass.
+        
+        Frames go raw into an FFmpeg muxer whose NUT output feeds the fused
+        graph over a pipe, so the uncompressed video never touches disk;
+        only the narration track is staged as a small WAV file.
+        """
+        from .ffmpeg_filters import _filtergraph_arguments, run_ffmpeg_pipeline
+        
+        output_path = export_kwargs['filename']
+        fps = export_kwargs['fps']
+        width, height = composite_video.size
+        
+        audio_path = _write_temp_audio(composite_video, output_path)
+        try:
+            mux_args = [
+                '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{width}x{height}",
+                '-r', str(fps), '-i', 'pipe:0'
+            ]
+            if audio_path:
+                mux_args.extend(['-i', audio_path])
+            else:
+                # The graph always reads [0:a], so give silent video a track
+                mux_args.extend(['-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=stereo', '-shortest'])
+            mux_args.extend([
+                '-map', '0:v', '-map', '1:a',
+                '-c:v', 'rawvideo', '-c:a', 'pcm_s16le', '-f', 'nut', 'pipe:1'
+            ])
+            
+            # Only this pass encodes with the configured codec
+            output_args = [
+                '-c:v', export_kwargs['codec'],
+                '-r', str(fps),
+                '-c:a', export_kwargs['audio_codec']
+            ]
+            if export_kwargs.get('bitrate'):
+                output_args.extend(['-b:v', export_kwargs['bitrate']])
+            if export_kwargs.get('preset'):
+                output_args.extend(['-preset', export_kwargs['preset']])
+            output_args.extend(export_kwargs.get('ffmpeg_params') or [])
+            
+            if progress_callback:
+                rendered = _frames_with_progress(composite_video, fps, progress_callback)
+            else:
+                rendered = composite_video.iter_frames(fps=fps, dtype='uint8')
+            frames = _contiguous_frames(rendered)
+            run_ffmpeg_pipeline([
+                mux_args,
+                _filtergraph_arguments('pipe:0', output_path, filtergraph, filter_inputs, output_args)
+            ], frames)
+            if progress_callback:
+                progress_callback(1.0)
+            return output_path
+        finally:
+            if audio_path and os.path.exists(audio_path):
+                os.remove(audio_path)
+
     def get_assembly_metadata(
         self, 
         video_clips: List[Any], 
@@ -517,7 +993,7 @@ class VideoAssembler:
         Returns:
             Dictionary with assembly metadata
         """
-        total_video_duration = sum(clip.duration for clip in video_clips)
+        total_video_duration = _total_duration(video_clips)
         
         # Get representative clip properties
         first_clip = video_clips[0] if video_clips else None
@@ -553,16 +1029,16 @@ class VideoAssembler:
             Preview video clip
         """
         # Create short preview
-        preview_audio = audio_clip.subclip(0, min(preview_duration, audio_clip.duration))
+        preview_audio = _preview_subclip(audio_clip, 0, min(preview_duration, audio_clip.duration))
         
         # Proportionally trim video clips
-        total_video_duration = sum(clip.duration for clip in video_clips)
+        total_video_duration = _total_duration(video_clips)
         scale_factor = preview_duration / total_video_duration
         
         preview_clips = []
         for clip in video_clips:
             preview_clip_duration = clip.duration * scale_factor
-            preview_clip = clip.subclip(0, min(preview_clip_duration, clip.duration))
+            preview_clip = _preview_subclip(clip, 0, min(preview_clip_duration, clip.duration))
             preview_clips.append(preview_clip)
         
         # Assemble preview
@@ -582,21 +1058,18 @@ class VideoAssembler:
         if audio_clip is None:
             raise ValueError("Audio clip is required")
         
-        # Validate clip properties
+        # Validate clip properties; one attribute lookup per clip, stopping
+        # at the first clip without a duration
         for i, clip in enumerate(video_clips):
-            if not hasattr(clip, 'duration') or clip.duration is None:
+            if getattr(clip, 'duration', None) is None:
                 raise ValueError(f"Video clip {i} missing duration property")
 
     def _apply_output_config(self, video: Any, config: Dict[str, Any]) -> Any:
         """Apply output configuration to video."""
         if 'resolution' in config:
-            resolution = config['resolution']
-            if resolution == '1080p':
-                video = video.resize((1920, 1080))
-            elif resolution == '720p':
-                video = video.resize((1280, 720))
-            elif resolution == '480p':
-                video = video.resize((854, 480))
+            size = _RESOLUTION_MAP.get(config['resolution'])
+            if size:
+                video = _resize(video, size)
         
         if 'fps' in config:
             video = video.set_fps(config['fps'])
@@ -629,8 +1102,18 @@ class VideoAssembler:
         captions_data: List[Dict[str, Any]], 
         style: Optional[Dict[str, Any]]
     ) -> List[Any]:
-        """Create caption clips for overlay."""
-        from moviepy.editor import TextClip
+        """
+        Create caption clips for overlay.
+        
+        Each distinct (text, style) is rasterised once with Pillow and shared
+        as a static ImageClip, so repeated captions cost no extra rendering.
+        Styles take TextClip's keys: fontsize, color, font, stroke_color,
+        stroke_width, bg_color, align, interline, method and size.
+        
+        Raises:
+            ValueError: If the style has keys the renderer cannot honour
+        """
+        from moviepy.editor import ImageClip
         
         caption_clips = []
         default_style = {
@@ -642,14 +1125,448 @@ class VideoAssembler:
         if style:
             default_style.update(style)
         
+        unsupported = default_style.keys() - _CAPTION_STYLE_KEYS
+        if unsupported:
+            raise ValueError(f"Unsupported caption style keys: {', '.join(sorted(unsupported))}")
+        if default_style.get('size') is not None:
+            default_style['size'] = tuple(default_style['size'])
+        render_style = tuple(sorted(default_style.items()))
+        
         for caption in captions_data:
-            text_clip = TextClip(
-                caption['text'],
-                **default_style
-            ).set_start(caption['start_time']).set_end(caption['end_time'])
+            image = _render_caption(caption['text'], render_style)
+            text_clip = ImageClip(image).set_start(caption['start_time']).set_end(caption['end_time'])
             
             # Position caption at bottom center
             text_clip = text_clip.set_position(('center', 'bottom'))
             caption_clips.append(text_clip)
         
-        return caption_clips
\ No newline at end of file
+        return caption_clips
+
+
+def _font_search_dirs() -> List[str]:
+    """Directories fonts are installed in, as searched by Pillow and fontconfig."""
+    data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+    font_dirs = [os.path.join(data_dir, 'fonts') for data_dir in data_dirs.split(os.pathsep)]
+    font_dirs.extend(os.path.expanduser(path) for path in ('~/.fonts', '~/.local/share/fonts'))
+    return [font_dir for font_dir in font_dirs if os.path.isdir(font_dir)]
+
+
+def _find_font_file(name: str) -> Optional[str]:
+    """Installed font file whose name matches name, ignoring case and separators."""
+    wanted = re.sub(r'[^a-z0-9]', '', name.lower())
+    for font_dir in _font_search_dirs():
+        for directory, _, files in os.walk(font_dir):
+            for file_name in sorted(files):
+                stem, extension = os.path.splitext(file_name)
+                if (extension.lower() in ('.ttf', '.otf', '.ttc')
+                        and re.sub(r'[^a-z0-9]', '', stem.lower()) == wanted):
+                    return os.path.join(directory, file_name)
+    return None
+
+
+@lru_cache(maxsize=32)
+def _resolve_font(font: str) -> Optional[str]:
+    """
+    Font file for a caption font, or None when nothing suitable is installed.
+    
+    Accepts what TextClip (i.e. ImageMagick) accepted: a font file, a file
+    name Pillow finds itself, or a name such as 'Arial-Bold'. Names are
+    looked up with fontconfig's fc-match when it is installed (which, like
+    ImageMagick, substitutes the closest installed font); otherwise they
+    are matched against installed file names, falling back to DejaVu Sans.
+    """
+    from PIL import ImageFont
+    
+    try:
+        ImageFont.truetype(font)
+        return font
+    except OSError:
+        pass
+    
+    parts = font.split('-')
+    styles = []
+    while len(parts) > 1 and parts[-1].lower() in _FONT_STYLES:
+        styles.insert(0, parts.pop())
+    family = ' '.join(parts)
+    
+    fc_match = shutil.which('fc-match')
+    if fc_match:
+        pattern = f"{family}:style={' '.join(styles)}" if styles else family
+        result = subprocess.run(
+            [fc_match, '-f', '%{file}', pattern], capture_output=True, text=True
+        )
+        if result.returncode == 0 and os.path.isfile(result.stdout):
+            return result.stdout
+    
+    path = _find_font_file(font)
+    if path is None:
+        bold = any('bold' in style.lower() for style in styles)
+        path = _find_font_file('DejaVuSans-Bold' if bold else 'DejaVuSans')
+        if path is not None:
+            logger.warning(f"Caption font {font!r} is not installed; using {path}")
+    return path
+
+
+def _load_caption_font(font: str, fontsize: int) -> Any:
+    """Pillow font for a caption, warning when it falls back to Pillow's own."""
+    from PIL import ImageFont
+    
+    path = _resolve_font(font)
+    if path is not None:
+        return ImageFont.truetype(path, fontsize)
+    
+    logger.warning(f"Caption font {font!r} not found; using Pillow's default font")
+    try:
+        return ImageFont.load_default(size=fontsize)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def _wrap_caption(text: str, pil_font: Any, width: int) -> str:
+    """Break text into lines no wider than width, as TextClip's caption method does."""
+    lines = []
+    for paragraph in text.split('\n'):
+        line = ''
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if line and pil_font.getlength(candidate) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+@lru_cache(maxsize=256)
+def _render_caption(text: str, style: Tuple[Tuple[str, Any], ...]) -> np.ndarray:
+    """
+    Rasterise caption text to a read-only RGBA array.
+    
+    style holds sorted (key, value) pairs of TextClip style keys (see
+    _create_caption_clips): stroke_color/stroke_width outline the glyphs,
+    bg_color fills the background, interline sets the line spacing and
+    method 'caption' wraps the text to size's width. A size pads the
+    image to that size, centring the text.
+    """
+    from PIL import Image, ImageDraw
+    
+    options = dict(style)
+    pil_font = _load_caption_font(options['font'], options['fontsize'])
+    size = options.get('size')
+    if options.get('method') == 'caption' and size and size[0]:
+        text = _wrap_caption(text, pil_font, size[0])
+    
+    stroke_color = options.get('stroke_color')
+    text_options = {
+        'font': pil_font,
+        'align': _CAPTION_ALIGN.get(str(options.get('align', 'center')).lower(), 'center'),
+        'spacing': options['interline'] if options.get('interline') is not None else 4,
+        'stroke_width': options.get('stroke_width', 1) if stroke_color else 0
+    }
+    
+    bbox = ImageDraw.Draw(Image.new('RGBA', (1, 1))).multiline_textbbox((0, 0), text, **text_options)
+    left, top = math.floor(bbox[0]), math.floor(bbox[1])
+    right, bottom = math.ceil(bbox[2]), math.ceil(bbox[3])
+    width, height = max(right - left, 1), max(bottom - top, 1)
+    offset_x, offset_y = -left, -top
+    if size:
+        # Like TextClip, a fixed size centres the text in that canvas
+        canvas_width, canvas_height = size[0] or width, size[1] or height
+        offset_x += (canvas_width - width) // 2
+        offset_y += (canvas_height - height) // 2
+        width, height = canvas_width, canvas_height
+    
+    bg_color = options.get('bg_color')
+    background = (0, 0, 0, 0) if bg_color in (None, 'transparent') else bg_color
+    image = Image.new('RGBA', (width, height), background)
+    ImageDraw.Draw(image).multiline_text(
+        (offset_x, offset_y), text, fill=options['color'],
+        stroke_fill=stroke_color, **text_options
+    )
+    
+    pixels = np.asarray(image)
+    pixels.setflags(write=False)
+    return pixels
+
+
+def _clip_durations(clips: List[Any]) -> np.ndarray:
+    """Clip durations as a float64 array."""
+    return np.fromiter((clip.duration for clip in clips), dtype=np.float64, count=len(clips))
+
+
+def _total_duration(clips: List[Any]) -> float:
+    """Sum clip durations in one NumPy reduction over a float64 buffer."""
+    return float(_clip_durations(clips).sum())
+
+
+def _scene_timeline(durations: Any) -> List[Scene]:
+    """
+    Back-to-back Scene records for consecutive durations.
+    
+    Boundaries come from one cumulative sum, and each scene starts exactly
+    where the previous one ends.
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    ends = np.cumsum(durations)
+    starts = np.concatenate(([0.0], ends[:-1]))
+    return [
+        Scene(start, end, duration)
+        for start, end, duration in zip(starts.tolist(), ends.tolist(), durations.tolist())
+    ]
+
+
+def _preview_subclip(clip: Any, start: float, end: float) -> Any:
+    """
+    clip.subclip(start, end), shared by repeated previews of the same range.
+    
+    Trims are held weakly, keyed by the source's id and range, so a trim is
+    shared only while something else still uses it and the registry never
+    keeps a source clip alive. _PREVIEW_SOURCES confirms the id still names
+    the same clip before a trim is reused.
+    """
+    if _PREVIEW_SOURCES.get(id(clip)) is not clip:
+        # The id belonged to a collected clip; its trims must not be reused
+        for key in [key for key in list(_PREVIEW_SUBCLIPS.keys()) if key[0] == id(clip)]:
+            _PREVIEW_SUBCLIPS.pop(key, None)
+        _PREVIEW_SOURCES[id(clip)] = clip
+    key = (id(clip), start, end)
+    subclip = _PREVIEW_SUBCLIPS.get(key)
+    if subclip is None:
+        subclip = clip.subclip(start, end)
+        _PREVIEW_SUBCLIPS[key] = subclip
+    return subclip
+
+
+def _caption_position(
+    pos: Any, frame_size: Tuple[int, int], caption_size: Tuple[int, int]
+) -> Tuple[int, int]:
+    """Top-left corner of a caption, resolving positions as MoviePy's blit_on does."""
+    frame_width, frame_height = frame_size
+    width, height = caption_size
+    if isinstance(pos, str):
+        pos = {
+            'center': ('center', 'center'), 'left': ('left', 'center'),
+            'right': ('right', 'center'), 'top': ('center', 'top'),
+            'bottom': ('center', 'bottom')
+        }[pos]
+    x, y = pos
+    if isinstance(x, str):
+        x = {'left': 0, 'center': (frame_width - width) / 2, 'right': frame_width - width}[x]
+    if isinstance(y, str):
+        y = {'top': 0, 'center': (frame_height - height) / 2, 'bottom': frame_height - height}[y]
+    return int(x), int(y)
+
+
+def _overlay_captions(base_video: Any, caption_clips: List[Any]) -> Any:
+    """
+    Blend static caption clips onto each frame of base_video.
+    
+    Replaces a CompositeVideoClip over the captions: each frame is copied
+    once and only the active captions' regions are blended, in the
+    compiled _alpha_blend kernel.
+    """
+    overlays = [
+        (
+            clip.start, clip.end, clip.pos(clip.start),
+            # Writable contiguous copies, made once per caption
+            np.array(clip.img, dtype=np.uint8), np.array(clip.mask.img, dtype=np.float64)
+        )
+        for clip in caption_clips
+    ]
+    
+    def composite(get_frame: Callable[[float], np.ndarray], t: float) -> np.ndarray:
+        active = [
+            overlay for overlay in overlays
+            if overlay[0] <= t and (overlay[1] is None or t < overlay[1])
+        ]
+        frame = get_frame(t)
+        if not active:
+            return frame
+        
+        frame = np.array(frame, dtype=np.uint8)
+        frame_height, frame_width = frame.shape[:2]
+        for _, _, pos, image, alpha in active:
+            height, width = alpha.shape
+            x, y = _caption_position(pos, (frame_width, frame_height), (width, height))
+            # Crop captions that extend past the frame edges
+            x1, y1 = max(x, 0), max(y, 0)
+            x2, y2 = min(x + width, frame_width), min(y + height, frame_height)
+            if x1 < x2 and y1 < y2:
+                _alpha_blend(
+                    frame[y1:y2, x1:x2],
+                    image[y1 - y:y2 - y, x1 - x:x2 - x],
+                    alpha[y1 - y:y2 - y, x1 - x:x2 - x]
+                )
+        return frame
+    
+    return base_video.fl(composite)
+
+
+def _resize(video: Any, size: Tuple[int, int]) -> Any:
+    """
+    Resize a clip to size, using OpenCV for real MoviePy clips.
+
+    MoviePy's own resize goes through Pillow per frame; cv2.resize with
+    INTER_AREA is several times faster for the usual downscale. Anything
+    that is not a MoviePy clip, or a missing OpenCV, keeps clip.resize.
+    """
+    try:
+        import cv2
+        from moviepy.video.VideoClip import VideoClip
+    except ImportError:
+        return video.resize(size)
+
+    if not isinstance(video, VideoClip):
+        return video.resize(size)
+
+    def resize_frame(frame: np.ndarray) -> np.ndarray:
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    return video.fl_image(resize_frame, apply_to=['mask'])
+
+
+class _TemporaryFile:
+    """
+    A temporary file that is deleted when this object is garbage-collected.
+    
+    Clips opened from it hold it through their reader (see _keep_file_for),
+    so the file stays on disk exactly as long as something may read it.
+    """
+    
+    def __init__(self, suffix: str):
+        fd, self.path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        _TEMPORARY_FILES[self.path] = self
+        weakref.finalize(self, _remove_file, self.path)
+
+
+def _remove_file(path: str) -> None:
+    """Delete a file unless it is already gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _keep_file_for(reader: Any, path: str) -> None:
+    """Keep the temporary file at path (if it is one) until reader is collected."""
+    temporary = _TEMPORARY_FILES.get(path)
+    if temporary is not None:
+        _READER_FILES[reader] = temporary
+
+
+def _write_temp_audio(composite_video: Any, output_path: str) -> Optional[str]:
+    """Stage a clip's audio as a WAV next to output_path (None if silent)."""
+    if composite_video.audio is None:
+        return None
+    
+    fd, audio_path = tempfile.mkstemp(suffix='.wav', dir=os.path.dirname(output_path) or None)
+    os.close(fd)
+    try:
+        composite_video.audio.write_audiofile(
+            audio_path, fps=44100, nbytes=2, codec='pcm_s16le', logger=None
+        )
+    except Exception:
+        os.remove(audio_path)
+        raise
+    return audio_path
+
+
+def _fast_encoder_settings(export_kwargs: Dict[str, Any], allow_hw: bool) -> Dict[str, Any]:
+    """
+    Export arguments with the fastest encoder for libx264 exports.
+    
+    Only applies when no preset was configured: a hardware H.264 encoder
+    (with its fastest preset) is substituted when allowed and available,
+    otherwise libx264 runs with the ultrafast preset.
+    """
+    if export_kwargs['codec'] != 'libx264' or export_kwargs.get('preset'):
+        return export_kwargs
+    
+    from .ffmpeg_filters import hardware_h264_encoder
+    
+    fast_kwargs = dict(export_kwargs)
+    hardware = hardware_h264_encoder() if allow_hw else None
+    if hardware is None:
+        fast_kwargs['preset'] = 'ultrafast'
+    else:
+        fast_kwargs['codec'], preset = hardware
+        if preset:
+            fast_kwargs['preset'] = preset
+    return fast_kwargs
+
+
+def _export_settings(export_kwargs: Dict[str, Any]) -> Optional[Tuple[Tuple[str, Any], ...]]:
+    """
+    Hashable form of write_videofile's keyword arguments, minus the filename.
+    
+    Lists (e.g. ffmpeg_params) become tuples; None is returned when some
+    other value cannot be hashed, and the export is then not specialized.
+    """
+    settings = tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in export_kwargs.items() if name != 'filename'
+    ))
+    try:
+        hash(settings)
+    except TypeError:
+        return None
+    return settings
+
+
+@lru_cache(maxsize=32)
+def _export_writer(settings: Tuple[Tuple[str, Any], ...]) -> Callable[[Any, str], None]:
+    """
+    write_videofile specialized to one export configuration.
+    
+    The keyword arguments are rebuilt once per configuration, so batch
+    exports with the same settings only pass the clip and output path.
+    """
+    kwargs = {name: list(value) if isinstance(value, tuple) else value for name, value in settings}
+    
+    def write(clip: Any, output_path: str) -> None:
+        clip.write_videofile(filename=output_path, **kwargs)
+    
+    return write
+
+
+def _frames_with_progress(
+    clip: Any, fps: float, progress_callback: Callable[[float], None]
+) -> Iterator[np.ndarray]:
+    """Iterate a clip's frames, reporting progress every _PROGRESS_INTERVAL frames."""
+    total_frames = max(int(clip.duration * fps), 1)
+    for index, frame in enumerate(clip.iter_frames(fps=fps, dtype='uint8')):
+        if index % _PROGRESS_INTERVAL == 0:
+            progress_callback(index / total_frames)
+        yield frame
+
+
+def _contiguous_frames(frames: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Frames ready to hand to an FFmpeg pipe as buffers.
+    
+    Contiguous frames pass through as-is and are written straight from
+    their memory, with no tobytes() copy; only strided views (e.g. from a
+    crop) are copied, since a pipe write needs one contiguous buffer.
+    """
+    for frame in frames:
+        yield np.ascontiguousarray(frame)
+
+
+def _whole_audio_file(audio_clip: Any) -> Optional[str]:
+    """
+    Path of the file an audio input plays from start to end, or None when
+    it is not file-backed or has been trimmed or offset.
+    """
+    if isinstance(audio_clip, (str, os.PathLike)):
+        return os.fspath(audio_clip)
+    
+    filename = getattr(audio_clip, 'filename', None)
+    reader_duration = getattr(getattr(audio_clip, 'reader', None), 'duration', None)
+    if not isinstance(filename, str) or not isinstance(reader_duration, (int, float)):
+        return None
+    if getattr(audio_clip, 'start', 0) != 0 or abs(audio_clip.duration - reader_duration) > 1e-3:
+        return None
+    return filename
@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures for the video processor test suite.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+
+# Attributes the processing components touch on a MoviePy clip. spec_set keeps
+# Mock from growing a child for every other attribute that gets probed.
+CLIP_ATTRIBUTES = [
+    'duration', 'fps', 'size', 'filename',
+    'set_duration', 'loop', 'subclip', 'fx', 'to_ImageClip'
+]
+
+
+def _make_clip(duration: float = 30.0) -> Mock:
+    """Create a spec'd mock video clip with the given duration."""
+    clip = Mock(spec_set=CLIP_ATTRIBUTES)
+    clip.duration = duration
+    return clip
+
+
+@pytest.fixture
+def mock_video_clip():
+    """Single spec'd mock video clip (30s by default)."""
+    return _make_clip()
+
+
+@pytest.fixture
+def make_clip():
+    """Factory for spec'd mock video clips: make_clip(duration=30.0)."""
+    return _make_clip
+
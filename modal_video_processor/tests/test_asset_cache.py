@@ -0,0 +1,82 @@
+"""
+Test cases for AssetCache
+
+Covers URL+ETag keyed reuse of downloaded assets across jobs.
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+from aidobe_video_processor.asset_cache import AssetCache
+
+
+class TestAssetCache:
+    """Test the cross-job asset cache."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.url = 'https://storage.example.com/music/background.mp3'
+
+    def test_miss_then_hit_after_store(self, tmp_path):
+        """Test a stored asset is handed to later jobs."""
+        cache = AssetCache(str(tmp_path / 'cache'))
+        first = tmp_path / 'job1.mp3'
+        first.write_bytes(b'music')
+
+        assert cache.fetch(self.url, '"v1"', str(tmp_path / 'job0.mp3')) is False
+
+        cache.store(self.url, '"v1"', str(first))
+        second = tmp_path / 'job2.mp3'
+
+        assert cache.fetch(self.url, '"v1"', str(second)) is True
+        assert second.read_bytes() == b'music'
+        assert cache.entry_path(self.url, '"v1"').endswith('.mp3')
+
+    def test_changed_etag_is_a_different_entry(self, tmp_path):
+        """Test a new version of the asset is never served from the old entry."""
+        cache = AssetCache(str(tmp_path / 'cache'))
+        local = tmp_path / 'job1.mp3'
+        local.write_bytes(b'old')
+        cache.store(self.url, '"v1"', str(local))
+
+        assert cache.fetch(self.url, '"v2"', str(tmp_path / 'job2.mp3')) is False
+
+    def test_job_cleanup_does_not_evict_entry(self, tmp_path):
+        """Test deleting a job's temp file leaves the hardlinked entry intact."""
+        cache = AssetCache(str(tmp_path / 'cache'))
+        local = tmp_path / 'job1.mp3'
+        local.write_bytes(b'music')
+        cache.store(self.url, '"v1"', str(local))
+
+        os.remove(local)
+
+        assert open(cache.entry_path(self.url, '"v1"'), 'rb').read() == b'music'
+
+    def test_store_copies_across_filesystems(self, tmp_path):
+        """Test entries are copied when a hardlink is not possible."""
+        cache = AssetCache(str(tmp_path / 'cache'))
+        local = tmp_path / 'job1.mp3'
+        local.write_bytes(b'music')
+
+        with patch('aidobe_video_processor.asset_cache.os.link', side_effect=OSError('EXDEV')):
+            cache.store(self.url, '"v1"', str(local))
+
+        assert open(cache.entry_path(self.url, '"v1"'), 'rb').read() == b'music'
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test the cache stays within max_bytes, dropping the stalest entries."""
+        cache = AssetCache(str(tmp_path / 'cache'), max_bytes=10)
+        urls = [f"https://storage.example.com/video/clip_{i}.mp4" for i in range(3)]
+
+        for i, url in enumerate(urls):
+            local = tmp_path / f"clip_{i}.mp4"
+            local.write_bytes(b'12345')
+            cache.store(url, '"v1"', str(local))
+            os.utime(cache.entry_path(url, '"v1"'), (i, i))
+            if i == 1:
+                # Touch the first clip so the second becomes least recently used
+                cache.fetch(urls[0], '"v1"', str(tmp_path / 'reuse.mp4'))
+
+        assert os.path.exists(cache.entry_path(urls[0], '"v1"'))
+        assert not os.path.exists(cache.entry_path(urls[1], '"v1"'))
+        assert os.path.exists(cache.entry_path(urls[2], '"v1"'))
@@ -69,7 +69,9 @@ class TestAudioDurationExtractor:
             duration = self.extractor.extract_duration_from_url(audio_url)
             
             assert duration == 67.89
-            mock_get.assert_called_once_with(audio_url)
+            mock_get.assert_called_once_with(
+                audio_url, headers={'Range': 'bytes=0-131071'}
+            )
 
     def test_extract_duration_precision(self):
         """Test that duration extraction maintains high precision."""
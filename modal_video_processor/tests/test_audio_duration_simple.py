@@ -7,7 +7,7 @@ Tests the core functionality without complex mocking.
 import pytest
 import tempfile
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from aidobe_video_processor.audio_duration import AudioDurationExtractor
 
 
@@ -133,7 +133,9 @@ class TestAudioDurationExtractorSimple:
             duration = self.extractor.extract_duration_from_url(audio_url)
             
             assert duration == 67.89
-            mock_get.assert_called_once_with(audio_url)
+            mock_get.assert_called_once_with(
+                audio_url, headers={'Range': 'bytes=0-131071'}
+            )
             mock_extract_bytes.assert_called_once_with(b"mock_audio_data")
 
     def test_error_handling(self):
@@ -144,4 +146,247 @@ class TestAudioDurationExtractorSimple:
             with pytest.raises(Exception) as excinfo:
                 self.extractor.extract_duration("nonexistent.mp3")
             
-            assert "File not found" in str(excinfo.value)
\ No newline at end of file
+            assert "File not found" in str(excinfo.value)
+
+    def test_extract_durations_from_urls_workflow(self):
+        """Test batch URL extraction downloads concurrently and keeps input order."""
+        audio_urls = [
+            "https://example.com/a.mp3",
+            "https://example.com/b.mp3",
+            "https://example.com/c.mp3"
+        ]
+        
+        def make_response(url):
+            response = Mock()
+            response.content = url.encode()
+            response.raise_for_status = Mock()
+            return response
+        
+        with patch.object(self.extractor, 'extract_duration_from_bytes') as mock_extract_bytes, \
+             patch('httpx.AsyncClient') as mock_client_cls:
+            
+            mock_client = mock_client_cls.return_value.__aenter__.return_value
+            mock_client.get = AsyncMock(side_effect=make_response)
+            mock_extract_bytes.side_effect = [10.0, 20.0, 30.0]
+            
+            durations = self.extractor.extract_durations_from_urls(audio_urls, max_concurrency=2)
+            
+            assert durations == [10.0, 20.0, 30.0]
+            mock_client_cls.assert_called_once()
+            assert mock_client.get.call_count == 3
+            assert [c.args[0] for c in mock_extract_bytes.call_args_list] == [
+                url.encode() for url in audio_urls
+            ]
+
+    def test_non_audio_extension_skips_librosa(self):
+        """Test that containers librosa can't read go straight to MoviePy."""
+        with patch.object(self.extractor, '_extract_with_librosa') as mock_librosa, \
+             patch.object(self.extractor, '_extract_with_moviepy') as mock_moviepy:
+            mock_moviepy.return_value = 12.5
+            
+            duration = self.extractor.extract_duration("scene.MP4")
+            
+            assert duration == 12.5
+            mock_librosa.assert_not_called()
+            mock_moviepy.assert_called_once_with("scene.MP4")
+
+    def test_librosa_failure_falls_back_to_moviepy(self):
+        """Test MoviePy fallback for audio formats when librosa fails."""
+        with patch.object(self.extractor, '_extract_with_librosa') as mock_librosa, \
+             patch.object(self.extractor, '_extract_with_moviepy') as mock_moviepy:
+            mock_librosa.side_effect = Exception("Corrupted header")
+            mock_moviepy.return_value = 98.765
+            
+            duration = self.extractor.extract_duration("narration.mp3")
+            
+            assert duration == 98.765
+            mock_librosa.assert_called_once_with("narration.mp3")
+
+    @pytest.mark.skipif(
+        not hasattr(os, 'memfd_create'), reason="memfd_create is Linux-only"
+    )
+    def test_large_bytes_decoded_from_memfd(self):
+        """Test large payloads are read from an in-memory file, not a temp file."""
+        audio_bytes = os.urandom(2 * 1024 * 1024)
+        seen = {}
+        
+        def read_back(path):
+            seen['path'] = path
+            with open(path, 'rb') as f:
+                seen['content'] = f.read()
+            return 42.0
+        
+        with patch.object(self.extractor, '_extract_with_librosa', side_effect=read_back), \
+             patch('tempfile.NamedTemporaryFile') as mock_temp:
+            
+            duration = self.extractor.extract_duration_from_bytes(audio_bytes)
+            
+            assert duration == 42.0
+            mock_temp.assert_not_called()
+            assert seen['path'].startswith(f"/proc/{os.getpid()}/fd/")
+            assert seen['content'] == audio_bytes
+
+    def test_persistent_cache_shared_across_extractors(self, tmp_path):
+        """Test durations persist by file content across extractor instances."""
+        cache_dir = str(tmp_path / "duration_cache")
+        audio_path = tmp_path / "narration.mp3"
+        audio_path.write_bytes(os.urandom(200 * 1024))
+        
+        first = AudioDurationExtractor(persistent_cache_dir=cache_dir)
+        with patch.object(first, '_extract_by_extension', return_value=33.25) as mock_extract:
+            assert first.extract_duration(str(audio_path), use_cache=True) == 33.25
+            mock_extract.assert_called_once()
+        
+        # A fresh extractor (e.g. another worker) hits the persistent cache
+        second = AudioDurationExtractor(persistent_cache_dir=cache_dir)
+        with patch.object(second, '_extract_by_extension') as mock_extract:
+            assert second.extract_duration(str(audio_path), use_cache=True) == 33.25
+            mock_extract.assert_not_called()
+        
+        # Changed content misses the cache
+        audio_path.write_bytes(os.urandom(200 * 1024))
+        third = AudioDurationExtractor(persistent_cache_dir=cache_dir)
+        with patch.object(third, '_extract_by_extension', return_value=40.0) as mock_extract:
+            assert third.extract_duration(str(audio_path), use_cache=True) == 40.0
+            mock_extract.assert_called_once()
+
+    def test_extract_duration_from_url_uses_metadata_header(self):
+        """Test a duration published in storage metadata skips decoding."""
+        with patch.object(self.extractor, 'extract_duration_from_bytes') as mock_extract_bytes, \
+             patch('requests.get') as mock_get:
+            
+            mock_response = Mock()
+            mock_response.status_code = 206
+            mock_response.headers = {'X-Amz-Meta-Duration': '12.5'}
+            mock_get.return_value = mock_response
+            
+            duration = self.extractor.extract_duration_from_url("https://example.com/tts.mp3")
+            
+            assert duration == 12.5
+            mock_get.assert_called_once()
+            mock_extract_bytes.assert_not_called()
+
+    def test_extract_duration_from_url_falls_back_to_the_remaining_bytes(self):
+        """Test an inconclusive partial probe fetches only the rest of the file."""
+        audio_url = "https://example.com/tts.mp3"
+        
+        with patch.object(self.extractor, 'extract_duration_from_bytes') as mock_extract_bytes, \
+             patch('requests.get') as mock_get:
+            
+            probe_response = Mock()
+            probe_response.status_code = 206
+            probe_response.headers = {'Content-Range': 'bytes 0-16/40'}
+            probe_response.content = b"not an mp3 header"
+            rest_response = Mock()
+            rest_response.status_code = 206
+            rest_response.content = b" and the rest of the audio"
+            mock_get.side_effect = [probe_response, rest_response]
+            mock_extract_bytes.return_value = 61.0
+            
+            duration = self.extractor.extract_duration_from_url(audio_url)
+            
+            assert duration == 61.0
+            assert mock_get.call_count == 2
+            assert mock_get.call_args_list[1] == ((audio_url,), {'headers': {'Range': 'bytes=17-'}})
+            mock_extract_bytes.assert_called_once_with(b"not an mp3 header and the rest of the audio")
+
+    def test_extract_duration_from_url_skips_mp3_parsing_for_other_formats(self):
+        """Test WAV probes skip the MP3 parser, and small files are decoded from the probe."""
+        with patch.object(self.extractor, 'extract_duration_from_bytes') as mock_extract_bytes, \
+             patch('aidobe_video_processor.audio_duration._duration_from_mp3_head') as mock_mp3, \
+             patch('requests.get') as mock_get:
+            
+            probe_response = Mock()
+            probe_response.status_code = 206
+            probe_response.headers = {'Content-Type': 'audio/wav', 'Content-Range': 'bytes 0-3/4'}
+            probe_response.content = b"RIFF"
+            mock_get.return_value = probe_response
+            mock_extract_bytes.return_value = 2.0
+            
+            assert self.extractor.extract_duration_from_url("https://example.com/voice.mp3?v=1") == 2.0
+            
+            mock_mp3.assert_not_called()
+            mock_get.assert_called_once()
+            mock_extract_bytes.assert_called_once_with(b"RIFF")
+
+    def test_multiple_durations_through_worker(self, tmp_path):
+        """Test batch extraction through the persistent worker process."""
+        import wave
+        
+        expected = [1.0, 0.5, 0.25]
+        paths = []
+        for i, seconds in enumerate(expected):
+            path = tmp_path / f"tone_{i}.wav"
+            with wave.open(str(path), 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(8000)
+                wav.writeframes(b"\x00\x00" * int(8000 * seconds))
+            paths.append(str(path))
+        
+        try:
+            durations = self.extractor.extract_multiple_durations(paths, use_worker=True)
+            worker_pid = self.extractor._worker.pid
+            
+            # The same warm worker serves later batches
+            again = self.extractor.extract_multiple_durations(paths[:1], use_worker=True)
+            
+            assert durations == pytest.approx(expected)
+            assert again == pytest.approx(expected[:1])
+            assert self.extractor._worker.pid == worker_pid
+            
+            with pytest.raises(Exception) as excinfo:
+                self.extractor.extract_multiple_durations(
+                    [str(tmp_path / "missing.wav")], use_worker=True
+                )
+            assert "missing.wav" in str(excinfo.value)
+            
+            # skip_errors keeps the batch going and marks unreadable files
+            mixed = self.extractor.extract_multiple_durations(
+                [paths[0], str(tmp_path / "missing.wav")], use_worker=True, skip_errors=True
+            )
+            assert mixed[0] == pytest.approx(expected[0])
+            assert mixed[1] is None
+        finally:
+            self.extractor.close_worker()
+        
+        assert self.extractor._worker is None
+
+    def test_dead_worker_is_reaped_before_it_is_dropped(self):
+        """Test a worker that exits mid-batch is waited for and its pipes closed."""
+        import subprocess
+        import sys
+        
+        # Reads the request, then exits without replying
+        worker = subprocess.Popen(
+            [sys.executable, '-c', 'import sys; sys.stdin.readline()'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        self.extractor._worker = worker
+        
+        with patch.object(self.extractor, '_get_worker', return_value=worker):
+            with pytest.raises(Exception, match="exited unexpectedly"):
+                self.extractor.extract_multiple_durations(["/tmp/a.wav"], use_worker=True)
+        
+        assert self.extractor._worker is None
+        assert worker.returncode == 0
+        assert worker.stdin.closed and worker.stdout.closed
+
+    def test_moviepy_probe_reused_only_with_use_cache(self, tmp_path):
+        """Test repeat MoviePy probes are skipped only when caching is asked for."""
+        video_path = tmp_path / "scene.mp4"
+        video_path.write_bytes(b"mock_video_data")
+        
+        mock_clip = Mock()
+        mock_clip.duration = 8.5
+        
+        with patch('moviepy.editor.AudioFileClip', return_value=mock_clip) as mock_audio_clip:
+            assert self.extractor.extract_duration(str(video_path), use_cache=True) == 8.5
+            assert self.extractor.extract_duration(str(video_path), use_cache=True) == 8.5
+            mock_audio_clip.assert_called_once_with(str(video_path))
+            
+            # Without use_cache every call probes the file afresh
+            self.extractor.extract_duration(str(video_path))
+            self.extractor.extract_duration(str(video_path))
+            assert mock_audio_clip.call_count == 3
+            assert mock_clip.close.call_count == 3
@@ -17,12 +17,11 @@ class TestAudioMasterSync:
         """Setup test fixtures."""
         self.sync = AudioMasterSync()
 
-    def test_force_video_duration_to_match_audio(self):
+    def test_force_video_duration_to_match_audio(self, mock_video_clip):
         """Test forcing video duration to exactly match audio duration."""
         audio_duration = 45.678
         
         # Mock video clip
-        mock_video_clip = Mock()
         mock_video_clip.duration = 50.0  # Longer than audio
         
         synced_clip = self.sync.sync_video_to_audio_duration(mock_video_clip, audio_duration)
@@ -31,12 +30,11 @@ class TestAudioMasterSync:
         mock_video_clip.set_duration.assert_called_once_with(audio_duration)
         assert synced_clip == mock_video_clip.set_duration.return_value
 
-    def test_extend_short_video_to_match_audio(self):
+    def test_extend_short_video_to_match_audio(self, mock_video_clip):
         """Test extending short video to match longer audio duration."""
         audio_duration = 60.0
         
         # Mock short video clip
-        mock_video_clip = Mock()
         mock_video_clip.duration = 30.0  # Shorter than audio
         
         synced_clip = self.sync.sync_video_to_audio_duration(
@@ -49,12 +47,11 @@ class TestAudioMasterSync:
         mock_video_clip.loop.assert_called_once_with(duration=audio_duration)
         assert synced_clip == mock_video_clip.loop.return_value
 
-    def test_trim_long_video_to_match_audio(self):
+    def test_trim_long_video_to_match_audio(self, mock_video_clip):
         """Test trimming long video to match shorter audio duration."""
         audio_duration = 30.0
         
         # Mock long video clip
-        mock_video_clip = Mock()
         mock_video_clip.duration = 60.0  # Longer than audio
         
         synced_clip = self.sync.sync_video_to_audio_duration(
@@ -67,7 +64,7 @@ class TestAudioMasterSync:
         mock_video_clip.subclip.assert_called_once_with(0, audio_duration)
         assert synced_clip == mock_video_clip.subclip.return_value
 
-    def test_sync_multiple_video_scenes_to_audio_segments(self):
+    def test_sync_multiple_video_scenes_to_audio_segments(self, make_clip):
         """Test syncing multiple video scenes to audio segment durations."""
         audio_segments = [
             {'start_time': 0.0, 'end_time': 15.5, 'duration': 15.5},
@@ -76,7 +73,7 @@ class TestAudioMasterSync:
         ]
         
         # Mock video clips
-        mock_clips = [Mock(), Mock(), Mock()]
+        mock_clips = [make_clip() for _ in range(3)]
         for i, clip in enumerate(mock_clips):
             clip.duration = 20.0  # All clips longer than needed
         
@@ -88,12 +85,11 @@ class TestAudioMasterSync:
         mock_clips[1].set_duration.assert_called_once_with(16.75)
         mock_clips[2].set_duration.assert_called_once_with(12.75)
 
-    def test_audio_priority_over_visual_preferences(self):
+    def test_audio_priority_over_visual_preferences(self, mock_video_clip):
         """Test that audio timing always takes priority over visual preferences."""
         audio_duration = 42.123
         preferred_video_duration = 60.0  # User preference
         
-        mock_video_clip = Mock()
         mock_video_clip.duration = preferred_video_duration
         
         # Audio should override visual preference
@@ -107,11 +103,10 @@ class TestAudioMasterSync:
         mock_video_clip.set_duration.assert_called_once_with(audio_duration)
         assert synced_clip == mock_video_clip.set_duration.return_value
 
-    def test_precise_millisecond_audio_sync(self):
+    def test_precise_millisecond_audio_sync(self, mock_video_clip):
         """Test precise audio synchronization to millisecond accuracy."""
         audio_duration = 123.456789  # Very precise audio duration
         
-        mock_video_clip = Mock()
         mock_video_clip.duration = 120.0
         
         synced_clip = self.sync.sync_video_to_audio_duration(
@@ -124,11 +119,10 @@ class TestAudioMasterSync:
         mock_video_clip.set_duration.assert_called_once_with(audio_duration)
         assert synced_clip == mock_video_clip.set_duration.return_value
 
-    def test_handle_zero_duration_audio(self):
+    def test_handle_zero_duration_audio(self, mock_video_clip):
         """Test handling of zero or very short audio duration."""
         audio_duration = 0.0
         
-        mock_video_clip = Mock()
         mock_video_clip.duration = 10.0
         
         with pytest.raises(ValueError) as excinfo:
@@ -136,11 +130,10 @@ class TestAudioMasterSync:
         
         assert "Audio duration must be positive" in str(excinfo.value)
 
-    def test_handle_negative_audio_duration(self):
+    def test_handle_negative_audio_duration(self, mock_video_clip):
         """Test handling of negative audio duration."""
         audio_duration = -5.0
         
-        mock_video_clip = Mock()
         mock_video_clip.duration = 10.0
         
         with pytest.raises(ValueError) as excinfo:
@@ -148,13 +141,12 @@ class TestAudioMasterSync:
         
         assert "Audio duration must be positive" in str(excinfo.value)
 
-    def test_sync_with_audio_fade_margins(self):
+    def test_sync_with_audio_fade_margins(self, mock_video_clip):
         """Test syncing with audio fade in/out margins."""
         audio_duration = 30.0
         fade_in_duration = 1.0
         fade_out_duration = 2.0
         
-        mock_video_clip = Mock()
         mock_video_clip.duration = 25.0
         
         synced_clip = self.sync.sync_video_to_audio_duration(
@@ -168,7 +160,7 @@ class TestAudioMasterSync:
         expected_duration = audio_duration + fade_in_duration + fade_out_duration
         mock_video_clip.set_duration.assert_called_once_with(expected_duration)
 
-    def test_batch_sync_video_clips_to_audio_timeline(self):
+    def test_batch_sync_video_clips_to_audio_timeline(self, make_clip):
         """Test batch synchronization of video clips to audio timeline."""
         audio_timeline = [
             {'clip_id': 'scene1', 'start_time': 0.0, 'duration': 10.5},
@@ -177,9 +169,9 @@ class TestAudioMasterSync:
         ]
         
         mock_clips = {
-            'scene1': Mock(),
-            'scene2': Mock(),
-            'scene3': Mock()
+            'scene1': make_clip(),
+            'scene2': make_clip(),
+            'scene3': make_clip()
         }
         
         for clip in mock_clips.values():
@@ -193,11 +185,10 @@ class TestAudioMasterSync:
         mock_clips['scene2'].set_duration.assert_called_once_with(15.75)
         mock_clips['scene3'].set_duration.assert_called_once_with(8.25)
 
-    def test_sync_preserves_video_quality_settings(self):
+    def test_sync_preserves_video_quality_settings(self, mock_video_clip):
         """Test that audio sync preserves original video quality settings."""
         audio_duration = 25.0
         
-        mock_video_clip = Mock()
         mock_video_clip.duration = 30.0
         mock_video_clip.fps = 30
         mock_video_clip.size = (1920, 1080)
@@ -226,11 +217,10 @@ class TestAudioMasterSync:
         
         assert "Corrupted video" in str(excinfo.value)
 
-    def test_audio_sync_with_speed_adjustment(self):
+    def test_audio_sync_with_speed_adjustment(self, mock_video_clip):
         """Test audio sync with video speed adjustment to fit duration."""
         audio_duration = 20.0
         
-        mock_video_clip = Mock()
         mock_video_clip.duration = 40.0  # Twice as long as needed
         
         synced_clip = self.sync.sync_video_to_audio_duration(
@@ -245,12 +235,11 @@ class TestAudioMasterSync:
         # Should use speedx effect with calculated factor
         assert synced_clip == mock_video_clip.fx.return_value
 
-    def test_sync_respects_minimum_video_duration(self):
+    def test_sync_respects_minimum_video_duration(self, mock_video_clip):
         """Test that sync respects minimum video duration constraints."""
         audio_duration = 0.5  # Very short audio
         min_video_duration = 2.0
         
-        mock_video_clip = Mock()
         mock_video_clip.duration = 10.0
         
         synced_clip = self.sync.sync_video_to_audio_duration(
@@ -262,14 +251,14 @@ class TestAudioMasterSync:
         # Should use minimum duration, not audio duration
         mock_video_clip.set_duration.assert_called_once_with(min_video_duration)
 
-    def test_sync_with_audio_crossfade_regions(self):
+    def test_sync_with_audio_crossfade_regions(self, make_clip):
         """Test syncing with audio crossfade regions between clips."""
         audio_segments = [
             {'start_time': 0.0, 'end_time': 15.0, 'duration': 15.0, 'crossfade_out': 1.0},
             {'start_time': 14.0, 'end_time': 30.0, 'duration': 16.0, 'crossfade_in': 1.0}
         ]
         
-        mock_clips = [Mock(), Mock()]
+        mock_clips = [make_clip() for _ in range(2)]
         for clip in mock_clips:
             clip.duration = 20.0
         
@@ -285,10 +274,10 @@ class TestAudioMasterSync:
         mock_clips[0].set_duration.assert_called_once_with(15.0)
         mock_clips[1].set_duration.assert_called_once_with(16.0)
 
-    def test_audio_master_sync_integration(self):
+    def test_audio_master_sync_integration(self, make_clip):
         """Test complete audio-master sync workflow integration."""
         master_audio_duration = 65.432
-        video_scenes = [Mock(), Mock(), Mock()]
+        video_scenes = [make_clip() for _ in range(3)]
         
         # Mock scene durations from audio analysis
         audio_scene_durations = [20.144, 25.678, 19.610]
@@ -310,4 +299,100 @@ class TestAudioMasterSync:
         
         # Total should match master audio duration
         total_synced_duration = sum(audio_scene_durations)
-        assert abs(total_synced_duration - master_audio_duration) < 0.001
\ No newline at end of file
+        assert abs(total_synced_duration - master_audio_duration) < 0.001
+
+    def test_center_trim_reuses_specialized_strategy(self, make_clip):
+        """Test center trimming and reuse of the per-strategy sync function."""
+        from aidobe_video_processor.audio_master_sync import _get_sync_strategy
+        
+        mock_clips = [make_clip() for _ in range(2)]
+        for clip in mock_clips:
+            clip.duration = 40.0
+        
+        _get_sync_strategy.cache_clear()
+        for clip in mock_clips:
+            self.sync.sync_video_to_audio_duration(clip, 20.0, trim_strategy='center')
+        
+        # Middle 20s of a 40s clip
+        mock_clips[0].subclip.assert_called_once_with(10.0, 30.0)
+        mock_clips[1].subclip.assert_called_once_with(10.0, 30.0)
+        mock_clips[0].set_duration.assert_not_called()
+        
+        # Same options resolve to one cached strategy
+        cache_info = _get_sync_strategy.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    def test_master_audio_drift_corrects_last_scene_without_mutating_input(self, make_clip):
+        """Test drift correction lands on the last scene and leaves input intact."""
+        video_scenes = [make_clip() for _ in range(3)]
+        scene_durations = [10.0, 10.0, 10.0]
+        
+        self.sync.sync_complete_video_to_master_audio(
+            video_scenes, 
+            31.5,
+            scene_durations=scene_durations
+        )
+        
+        video_scenes[0].set_duration.assert_called_once_with(10.0)
+        video_scenes[1].set_duration.assert_called_once_with(10.0)
+        video_scenes[2].set_duration.assert_called_once_with(11.5)
+        assert scene_durations == [10.0, 10.0, 10.0]
+
+    def test_sync_accepts_audio_segment_records(self, make_clip):
+        """Test AudioSegment records and dictionaries can be mixed."""
+        from aidobe_video_processor.audio_master_sync import AudioSegment
+        
+        audio_segments = [
+            AudioSegment(start_time=0.0, end_time=15.5, duration=15.5),
+            {'start_time': 15.5, 'end_time': 32.25, 'duration': 16.75, 'label': 'ignored'}
+        ]
+        mock_clips = [make_clip(20.0), make_clip(20.0)]
+        
+        synced_clips = self.sync.sync_video_scenes_to_audio_segments(mock_clips, audio_segments)
+        
+        assert len(synced_clips) == 2
+        mock_clips[0].set_duration.assert_called_once_with(15.5)
+        mock_clips[1].set_duration.assert_called_once_with(16.75)
+        
+        timeline = [AudioSegment(clip_id='intro', duration=4.0)]
+        intro = make_clip(10.0)
+        synced = self.sync.batch_sync_to_audio_timeline({'intro': intro}, timeline)
+        
+        intro.set_duration.assert_called_once_with(4.0)
+        assert synced == {'intro': intro.set_duration.return_value}
+
+    def test_already_synced_clip_returned_unchanged(self, make_clip):
+        """Test clips already matching the audio duration skip modification."""
+        # Within millisecond tolerance
+        clip = make_clip(12.0004)
+        synced_clip = self.sync.sync_video_to_audio_duration(clip, 12.0)
+        assert synced_clip is clip
+        clip.set_duration.assert_not_called()
+        
+        # Within one frame at 25fps, with frame precision
+        clip = make_clip(12.03)
+        clip.fps = 25
+        synced_clip = self.sync.sync_video_to_audio_duration(clip, 12.0, precision='frame')
+        assert synced_clip is clip
+        clip.set_duration.assert_not_called()
+        
+        # The same gap is too large for millisecond precision
+        clip = make_clip(12.03)
+        clip.fps = 25
+        synced_clip = self.sync.sync_video_to_audio_duration(clip, 12.0)
+        clip.set_duration.assert_called_once_with(12.0)
+
+    def test_already_synced_shortcut_needs_default_options(self, make_clip):
+        """Test speed, margin and minimum-length options always run the sync strategy."""
+        clip = make_clip(12.0)
+        self.sync.sync_video_to_audio_duration(clip, 12.0, adjust_speed=True)
+        clip.set_duration.assert_called_once_with(12.0)
+        
+        clip = make_clip(12.0)
+        self.sync.sync_video_to_audio_duration(clip, 12.0, min_video_duration=5.0)
+        clip.set_duration.assert_called_once_with(12.0)
+        
+        clip = make_clip(12.0)
+        self.sync.sync_video_to_audio_duration(clip, 11.0, fade_in_margin=0.5, fade_out_margin=0.5)
+        clip.set_duration.assert_called_once_with(12.0)
@@ -0,0 +1,243 @@
+"""
+Test cases for the fused FFmpeg filtergraph builder
+"""
+
+import subprocess
+import pytest
+from unittest.mock import Mock, patch
+
+from aidobe_video_processor.ffmpeg_filters import (
+    ClipSource,
+    apply_filtergraph,
+    build_fused_filtergraph,
+    concat_clip_files,
+    concat_clip_files_parallel,
+    hardware_h264_encoder,
+    run_ffmpeg_pipeline,
+    write_concat_manifest,
+    _escape_text,
+    _ffmpeg_binary
+)
+
+
+class TestFusedFiltergraph:
+    """Test building and running the fused effects graph."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.captions_cfg = {
+            'captions': [
+                {'text': 'Welcome', 'start_time': 0.0, 'end_time': 5.5},
+                {'text': "Here's what: matters", 'start_time': 5.5, 'end_time': 12.0}
+            ],
+            'style': {'fontsize': 32, 'color': 'yellow'},
+            'position': 'bottom'
+        }
+
+    def test_all_effects_fused_into_one_graph(self):
+        """Test Ken Burns, captions and music land in a single graph."""
+        graph = build_fused_filtergraph(
+            {'resolution': '720p', 'fps': 25},
+            {'duration': 12.0, 'volume': 0.1, 'fade_duration': 1.5},
+            self.captions_cfg
+        )
+
+        video_chain, music_chain, mix_chain = graph.split(';')
+        assert video_chain.startswith('[0:v]zoompan=')
+        assert ':s=1280x720:fps=25' in video_chain
+        assert video_chain.count('drawtext=') == 2
+        assert "enable='between(t,5.5,12.0)'" in video_chain
+        assert 'fontsize=32:fontcolor=yellow' in video_chain
+        assert video_chain.endswith('[vout]')
+        assert music_chain == '[1:a]volume=0.1,afade=t=in:st=0:d=1.5,afade=t=out:st=10.5:d=1.5[bg]'
+        assert mix_chain.startswith('[0:a][bg]amix=inputs=2') and mix_chain.endswith('[aout]')
+
+    def test_graph_without_effects_passes_streams_through(self):
+        """Test an empty configuration still yields the output labels."""
+        assert build_fused_filtergraph() == '[0:v]null[vout];[0:a]anull[aout]'
+
+    def test_caption_text_is_escaped_for_both_parser_levels(self):
+        """Test quotes, colons and graph separators in captions are escaped."""
+        assert _escape_text("it's a: [b], c;") == "it\\\\\\'s a\\\\: \\[b\\]\\, c\\;"
+
+    def test_hostile_caption_style_cannot_extend_the_graph(self):
+        """Test style values from the request cannot inject options or filters."""
+        hostile = dict(self.captions_cfg, style={
+            'color': 'white:text=PWNED[x];[x]drawbox=c=red:t=fill'
+        })
+        with pytest.raises(ValueError, match='Invalid caption color'):
+            build_fused_filtergraph(captions_cfg=hostile)
+
+        hostile['style'] = {'fontsize': '32:textfile=/etc/passwd'}
+        with pytest.raises(ValueError):
+            build_fused_filtergraph(captions_cfg=hostile)
+
+        graph = build_fused_filtergraph(
+            captions_cfg=dict(self.captions_cfg, style={'fontsize': '28', 'color': '#FFCC00@0.8'})
+        )
+        assert 'fontsize=28:fontcolor=#FFCC00@0.8' in graph
+
+    def test_apply_filtergraph_runs_ffmpeg_once(self):
+        """Test the fused pass is a single FFmpeg invocation with all inputs."""
+        with patch('aidobe_video_processor.ffmpeg_filters.subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=0, stderr='')
+
+            result = apply_filtergraph(
+                '/tmp/in.mkv', '/tmp/out.mp4', '[0:v]null[vout];[0:a]anull[aout]',
+                extra_inputs=['https://example.com/music.mp3'],
+                output_args=['-c:v', 'libx264']
+            )
+
+            assert result == '/tmp/out.mp4'
+            mock_run.assert_called_once()
+            command = mock_run.call_args[0][0]
+            assert command[command.index('-i') + 1] == '/tmp/in.mkv'
+            assert command.count('-i') == 2
+            assert command[-3:] == ['-c:v', 'libx264', '/tmp/out.mp4']
+
+    def test_apply_filtergraph_reports_ffmpeg_errors(self):
+        """Test FFmpeg failures surface with stderr."""
+        with patch('aidobe_video_processor.ffmpeg_filters.subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=1, stderr='No such filter\n')
+
+            with pytest.raises(Exception) as excinfo:
+                apply_filtergraph('/tmp/in.mkv', '/tmp/out.mp4', 'bad')
+
+            assert 'FFmpeg failed: No such filter' in str(excinfo.value)
+
+    def test_hardware_encoder_must_pass_a_test_encode(self):
+        """Test listed hardware encoders are skipped unless they can encode."""
+        def fake_run(command, **kwargs):
+            if '-encoders' in command:
+                return Mock(stdout=' V....D h264_nvenc\n V....D h264_qsv\n')
+            return Mock(returncode=0 if 'h264_qsv' in command else 1)
+
+        hardware_h264_encoder.cache_clear()
+        try:
+            with patch('aidobe_video_processor.ffmpeg_filters.subprocess.run',
+                       side_effect=fake_run) as mock_run:
+                assert hardware_h264_encoder() == ('h264_qsv', 'veryfast')
+                assert hardware_h264_encoder() == ('h264_qsv', 'veryfast')
+            assert mock_run.call_count == 3
+        finally:
+            hardware_h264_encoder.cache_clear()
+
+    def test_pipeline_reports_failing_stage(self, tmp_path):
+        """Test a stage failing mid-pipeline surfaces its stderr."""
+        pytest.importorskip('imageio_ffmpeg')
+
+        with pytest.raises(Exception) as excinfo:
+            run_ffmpeg_pipeline([
+                ['-f', 'lavfi', '-i', 'color=s=64x48:d=1', '-f', 'nut', 'pipe:1'],
+                ['-i', 'pipe:0', '-vf', 'no_such_filter', str(tmp_path / 'out.mkv')]
+            ])
+
+        assert 'FFmpeg failed' in str(excinfo.value)
+        assert 'no_such_filter' in str(excinfo.value)
+
+    def test_ken_burns_and_music_graph_runs_in_ffmpeg(self, tmp_path):
+        """Test the generated graph is accepted by a real FFmpeg binary."""
+        pytest.importorskip('imageio_ffmpeg')
+        ffmpeg = _ffmpeg_binary()
+        video_path = tmp_path / 'in.mkv'
+        music_path = tmp_path / 'music.wav'
+        subprocess.run([
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=c=blue:s=64x48:d=1',
+            '-f', 'lavfi', '-i', 'sine=d=1',
+            '-shortest', str(video_path)
+        ], check=True)
+        subprocess.run([
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'sine=f=880:d=1', str(music_path)
+        ], check=True)
+
+        graph = build_fused_filtergraph({'size': '64x48', 'fps': 10}, {'duration': 1.0, 'volume': 0.08})
+        output_path = apply_filtergraph(
+            str(video_path), str(tmp_path / 'out.mp4'), graph, [str(music_path)]
+        )
+
+        assert (tmp_path / 'out.mp4').stat().st_size > 0
+        assert output_path == str(tmp_path / 'out.mp4')
+
+
+class TestConcatDemuxer:
+    """Test joining clip files with the FFmpeg concat demuxer."""
+
+    def test_manifest_lists_trim_points_and_quotes_paths(self, tmp_path):
+        """Test each clip gets its in/out points and quotes are escaped."""
+        manifest_path = write_concat_manifest([
+            ClipSource(path="/clips/it's.mkv", duration=4.0),
+            ClipSource(path='/clips/b.mkv', duration=2.0, inpoint=1.5)
+        ], str(tmp_path / 'list.ffconcat'))
+
+        assert open(manifest_path).read().splitlines() == [
+            'ffconcat version 1.0',
+            "file '/clips/it'\\''s.mkv'",
+            'outpoint 4.0',
+            'duration 4.0',
+            "file '/clips/b.mkv'",
+            'inpoint 1.5',
+            'outpoint 3.5',
+            'duration 2.0'
+        ]
+
+    def test_concat_joins_intermediates_in_ffmpeg(self, tmp_path):
+        """Test the manifest is accepted by a real FFmpeg binary."""
+        pytest.importorskip('imageio_ffmpeg')
+        ffmpeg = _ffmpeg_binary()
+        sources = []
+        for index, color in enumerate(['red', 'green']):
+            clip_path = tmp_path / f"scene_{index}.mkv"
+            subprocess.run([
+                ffmpeg, '-y', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', f"color=c={color}:s=64x48:d=2:r=10",
+                '-c:v', 'ffv1', '-g', '1', str(clip_path)
+            ], check=True)
+            sources.append(ClipSource(path=str(clip_path), duration=1.0))
+
+        output_path = concat_clip_files(sources, str(tmp_path / 'joined.mkv'))
+
+        assert (tmp_path / 'joined.mkv').stat().st_size > 0
+        assert output_path == str(tmp_path / 'joined.mkv')
+
+    def test_parallel_concat_encodes_chunks_and_removes_parts(self, tmp_path):
+        """Test chunks are encoded separately and joined into one video."""
+        pytest.importorskip('imageio_ffmpeg')
+        from moviepy.editor import VideoFileClip
+
+        ffmpeg = _ffmpeg_binary()
+        sources = []
+        for index, color in enumerate(['red', 'green', 'blue', 'white', 'black']):
+            clip_path = tmp_path / f"scene_{index}.mp4"
+            subprocess.run([
+                ffmpeg, '-y', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', f"color=c={color}:s=64x48:d=2:r=10",
+                '-c:v', 'libx264', '-pix_fmt', 'yuv420p', str(clip_path)
+            ], check=True)
+            sources.append(ClipSource(path=str(clip_path), duration=1.0, inpoint=0.5))
+
+        output_path = concat_clip_files_parallel(sources, str(tmp_path / 'joined.mkv'), chunk_size=2)
+
+        joined = VideoFileClip(output_path, audio=False)
+        assert abs(joined.duration - 5.0) < 0.2
+        joined.close()
+        assert not [path for path in tmp_path.iterdir() if '.part' in path.name]
+
+    def test_probe_reads_stream_format_once_per_file(self, tmp_path):
+        """Test the video format is parsed from FFmpeg and cached per file."""
+        pytest.importorskip('imageio_ffmpeg')
+        from aidobe_video_processor.ffmpeg_filters import probe_video_format
+        
+        clip_path = tmp_path / 'scene.mkv'
+        subprocess.run([
+            _ffmpeg_binary(), '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=s=64x48:d=1:r=10',
+            '-c:v', 'ffv1', '-pix_fmt', 'yuv420p', str(clip_path)
+        ], check=True)
+        
+        assert probe_video_format(str(clip_path)) == ('ffv1', 'yuv420p', '64x48', '10')
+        with patch('aidobe_video_processor.ffmpeg_filters.subprocess.run') as mock_run:
+            probe_video_format(str(clip_path))
+        mock_run.assert_not_called()
+        assert probe_video_format(str(tmp_path / 'missing.mkv')) is None
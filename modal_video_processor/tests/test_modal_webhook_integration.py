@@ -11,81 +11,91 @@ import json
 from typing import Dict, Any
 
 
-class TestModalWebhookIntegration:
-    """Test Modal webhook endpoint for complete video processing integration."""
-
-    def setup_method(self):
-        """Setup test fixtures."""
-        # Mock webhook request data from Cloudflare Workers
-        self.sample_webhook_request = {
-            "job_id": "test-job-12345",
-            "video_request": {
-                "script_segments": [
-                    {
-                        "text": "Welcome to our amazing product demonstration",
-                        "start_time": 0.0,
-                        "end_time": 5.5,
-                        "duration": 5.5
-                    },
-                    {
-                        "text": "Here are the key features you'll love",
-                        "start_time": 5.5,
-                        "end_time": 12.0,
-                        "duration": 6.5
-                    },
-                    {
-                        "text": "Thank you for watching our presentation",
-                        "start_time": 12.0,
-                        "end_time": 15.0,
-                        "duration": 3.0
-                    }
-                ],
-                "audio_file_url": "https://storage.example.com/audio/test-narration.mp3",
-                "video_assets": [
-                    {
-                        "asset_url": "https://storage.example.com/video/intro-scene.mp4",
-                        "start_time": 0.0,
-                        "duration": 5.5
-                    },
-                    {
-                        "asset_url": "https://storage.example.com/video/features-demo.mp4", 
-                        "start_time": 5.5,
-                        "duration": 6.5
-                    },
-                    {
-                        "asset_url": "https://storage.example.com/video/conclusion.mp4",
-                        "start_time": 12.0,
-                        "duration": 3.0
-                    }
-                ],
-                "effects_config": {
-                    "ken_burns": True,
-                    "background_music": "https://storage.example.com/music/background.mp3",
-                    "music_volume": 0.08,
-                    "fade_duration": 2.0
+def make_webhook_request() -> Dict[str, Any]:
+    """Build a fresh webhook request from Cloudflare Workers, sharing no nested state."""
+    return {
+        "job_id": "test-job-12345",
+        "video_request": {
+            "script_segments": [
+                {
+                    "text": "Welcome to our amazing product demonstration",
+                    "start_time": 0.0,
+                    "end_time": 5.5,
+                    "duration": 5.5
                 },
-                "captions_config": {
-                    "enabled": True,
-                    "style": {
-                        "fontsize": 24,
-                        "color": "white",
-                        "font": "Arial-Bold"
-                    },
-                    "position": "bottom"
+                {
+                    "text": "Here are the key features you'll love",
+                    "start_time": 5.5,
+                    "end_time": 12.0,
+                    "duration": 6.5
                 },
-                "output_config": {
-                    "resolution": "1080p",
-                    "fps": 30,
-                    "format": "mp4",
-                    "codec": "libx264"
+                {
+                    "text": "Thank you for watching our presentation",
+                    "start_time": 12.0,
+                    "end_time": 15.0,
+                    "duration": 3.0
                 }
+            ],
+            "audio_file_url": "https://storage.example.com/audio/test-narration.mp3",
+            "video_assets": [
+                {
+                    "asset_url": "https://storage.example.com/video/intro-scene.mp4",
+                    "start_time": 0.0,
+                    "duration": 5.5
+                },
+                {
+                    "asset_url": "https://storage.example.com/video/features-demo.mp4", 
+                    "start_time": 5.5,
+                    "duration": 6.5
+                },
+                {
+                    "asset_url": "https://storage.example.com/video/conclusion.mp4",
+                    "start_time": 12.0,
+                    "duration": 3.0
+                }
+            ],
+            "effects_config": {
+                "ken_burns": True,
+                "background_music": "https://storage.example.com/music/background.mp3",
+                "music_volume": 0.08,
+                "fade_duration": 2.0
+            },
+            "captions_config": {
+                "enabled": True,
+                "style": {
+                    "fontsize": 24,
+                    "color": "white",
+                    "font": "Arial-Bold"
+                },
+                "position": "bottom"
             },
-            "callback_url": "https://api.aidobe.app/webhook/video-complete",
-            "storage_config": {
-                "output_bucket": "aidobe-videos",
-                "output_key": "generated/test-job-12345.mp4"
+            "output_config": {
+                "resolution": "1080p",
+                "fps": 30,
+                "format": "mp4",
+                "codec": "libx264"
             }
+        },
+        "callback_url": "https://api.aidobe.app/webhook/video-complete",
+        "storage_config": {
+            "output_bucket": "aidobe-videos",
+            "output_key": "generated/test-job-12345.mp4"
         }
+    }
+
+
+class TestModalWebhookIntegration:
+    """Test Modal webhook endpoint for complete video processing integration."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        from aidobe_video_processor.modal_webhook import _get_audio_extractor
+        
+        # Mock webhook request data from Cloudflare Workers
+        self.sample_webhook_request = make_webhook_request()
+        
+        # Tests patch AudioDurationExtractor, so rebuild the shared one each time
+        _get_audio_extractor.cache_clear()
 
     async def test_webhook_endpoint_accepts_video_processing_request(self):
         """Test webhook endpoint accepts and validates video processing requests."""
@@ -108,7 +118,8 @@ class TestModalWebhookIntegration:
                 '/tmp/audio_test_job_12345.mp3',
                 '/tmp/video_0_test_job_12345.mp4',
                 '/tmp/video_1_test_job_12345.mp4',
-                '/tmp/video_2_test_job_12345.mp4'
+                '/tmp/video_2_test_job_12345.mp4',
+                '/tmp/music_test_job_12345.mp3'
             ]
             
             # Mock video processing with async coroutine
@@ -144,22 +155,54 @@ class TestModalWebhookIntegration:
         with patch('aidobe_video_processor.modal_webhook.send_completion_callback'):
             
             # Test missing job_id
-            invalid_request = self.sample_webhook_request.copy()
+            invalid_request = make_webhook_request()
             del invalid_request['job_id']
             
             result = await process_video_request(invalid_request)
             
             assert result['status'] == 'failed'
-            assert "job_id is required" in result['error']
+            assert "job_id" in result['error']
+            assert "Field required" in result['error']
             
             # Test missing video_request
-            invalid_request = self.sample_webhook_request.copy()
+            invalid_request = make_webhook_request()
             del invalid_request['video_request']
             
             result = await process_video_request(invalid_request)
             
             assert result['status'] == 'failed'
-            assert "video_request is required" in result['error']
+            assert "video_request" in result['error']
+            assert "Field required" in result['error']
+            
+            # Test malformed nested field
+            invalid_request = make_webhook_request()
+            invalid_request['video_request'] = {
+                **self.sample_webhook_request['video_request'],
+                'video_assets': [{'start_time': 0.0}]
+            }
+            
+            result = await process_video_request(invalid_request)
+            
+            assert result['status'] == 'failed'
+            assert "video_assets.0.asset_url" in result['error']
+
+    async def test_webhook_reports_all_missing_fields_without_mutating_payload(self):
+        """Test every missing top-level field is named and the payload is left untouched."""
+        from aidobe_video_processor.modal_webhook import process_video_request
+        
+        invalid_request = make_webhook_request()
+        del invalid_request['job_id']
+        del invalid_request['video_request']
+        snapshot = make_webhook_request()
+        del snapshot['job_id']
+        del snapshot['video_request']
+        
+        with patch('aidobe_video_processor.modal_webhook.send_completion_callback'):
+            result = await process_video_request(invalid_request)
+        
+        assert result['status'] == 'failed'
+        assert result['error'] == 'job_id, video_request: Field required'
+        assert invalid_request == snapshot
 
     async def test_webhook_downloads_and_processes_audio_file(self):
         """Test webhook downloads audio file and extracts duration."""
@@ -187,30 +230,161 @@ class TestModalWebhookIntegration:
         """Test webhook downloads all video assets for processing."""
         from aidobe_video_processor.modal_webhook import process_video_request
         
-        with patch('aidobe_video_processor.modal_webhook.download_file') as mock_download, \
+        with patch('aidobe_video_processor.modal_webhook.validate_asset_accessibility') as mock_validate, \
+             patch('aidobe_video_processor.modal_webhook.download_file') as mock_download, \
              patch('aidobe_video_processor.modal_webhook.VideoProcessor') as mock_processor:
             
-            # Mock video asset downloads
-            mock_download.side_effect = [
-                '/tmp/audio_12345.mp3',  # Audio file
-                '/tmp/video_0_12345.mp4',  # First video asset
-                '/tmp/video_1_12345.mp4',  # Second video asset
-                '/tmp/video_2_12345.mp4'   # Third video asset
-            ]
+            mock_validate.return_value = {'is_valid': True, 'missing_assets': [], 'inaccessible_assets': []}
+            mock_download.side_effect = lambda url, path: path
             
             result = await process_video_request(self.sample_webhook_request)
             
-            # Should download all video assets
-            expected_calls = [
-                ('https://storage.example.com/audio/test-narration.mp3', '/tmp/audio_12345.mp3'),
-                ('https://storage.example.com/video/intro-scene.mp4', '/tmp/video_0_12345.mp4'),
-                ('https://storage.example.com/video/features-demo.mp4', '/tmp/video_1_12345.mp4'),
-                ('https://storage.example.com/video/conclusion.mp4', '/tmp/video_2_12345.mp4')
-            ]
+            # Should download audio and all video assets; downloads run
+            # concurrently, so completion order is not guaranteed
+            expected_calls = {
+                ('https://storage.example.com/audio/test-narration.mp3', '/tmp/audio_test_job_12345.mp3'),
+                ('https://storage.example.com/video/intro-scene.mp4', '/tmp/video_0_test_job_12345.mp4'),
+                ('https://storage.example.com/video/features-demo.mp4', '/tmp/video_1_test_job_12345.mp4'),
+                ('https://storage.example.com/video/conclusion.mp4', '/tmp/video_2_test_job_12345.mp4'),
+                ('https://storage.example.com/music/background.mp3', '/tmp/music_test_job_12345.mp3')
+            }
+            
+            assert mock_download.call_count == 5
+            assert {call[0] for call in mock_download.call_args_list} == expected_calls
+            
+            # FFmpeg mixes the downloaded copy, not the remote URL
+            effects_config = mock_processor.return_value.process_complete_video.call_args[1]['effects_config']
+            assert effects_config['background_music'] == '/tmp/music_test_job_12345.mp3'
+
+    async def test_download_files_runs_concurrently_and_surfaces_failures(self):
+        """Test download_files overlaps downloads and raises the first failure."""
+        import asyncio
+        from aidobe_video_processor.modal_webhook import download_files
+        
+        in_flight = 0
+        peak_in_flight = 0
+        
+        async def fake_download(url, local_path):
+            nonlocal in_flight, peak_in_flight
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if url.endswith('broken.mp4'):
+                raise RuntimeError(f"Failed to download {url}")
+            return local_path
+        
+        downloads = [(f'https://example.com/{i}.mp4', f'/tmp/{i}.mp4') for i in range(6)]
+        
+        with patch('aidobe_video_processor.modal_webhook.download_file', side_effect=fake_download):
+            paths = await download_files(downloads, max_concurrency=3)
+            
+            assert paths == [local_path for _, local_path in downloads]
+            assert peak_in_flight == 3
+            
+            with pytest.raises(RuntimeError) as excinfo:
+                await download_files(downloads + [('https://example.com/broken.mp4', '/tmp/b.mp4')])
+            assert "broken.mp4" in str(excinfo.value)
+
+    async def test_download_file_uses_parallel_ranges(self, tmp_path):
+        """Test download_file reassembles ranged chunks and falls back to one stream."""
+        import httpx
+        from aidobe_video_processor.modal_webhook import download_file
+        
+        payload = bytes(range(256)) * 40
+        requests_seen = []
+        
+        def handler(request, honour_ranges=True):
+            requests_seen.append((request.method, request.headers.get('Range')))
+            headers = {'Accept-Ranges': 'bytes', 'Content-Length': str(len(payload))}
+            if request.method == 'HEAD':
+                return httpx.Response(200, headers=headers)
+            range_header = request.headers.get('Range')
+            if range_header and honour_ranges:
+                start, end = (int(v) for v in range_header.split('=')[1].split('-'))
+                return httpx.Response(206, content=payload[start:end + 1], headers={
+                    'Content-Range': f'bytes {start}-{end}/{len(payload)}'
+                })
+            return httpx.Response(200, content=payload)
+        
+        local_path = tmp_path / 'audio.mp3'
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await download_file('https://example.com/a.mp3', str(local_path),
+                                chunk_size=4096, parallelism=2, client=client)
+        
+        assert local_path.read_bytes() == payload
+        assert sorted(r for m, r in requests_seen if m == 'GET') == [
+            'bytes=0-4095', 'bytes=4096-8191', 'bytes=8192-10239'
+        ]
+        
+        # Servers that ignore Range get a single full-body GET instead
+        requests_seen.clear()
+        transport = httpx.MockTransport(lambda request: handler(request, honour_ranges=False))
+        async with httpx.AsyncClient(transport=transport) as client:
+            await download_file('https://example.com/a.mp3', str(local_path),
+                                chunk_size=4096, parallelism=2, client=client)
+        
+        # Only the first range is tried before falling back
+        assert local_path.read_bytes() == payload
+        assert [r for m, r in requests_seen if m == 'GET'] == ['bytes=0-4095', None]
+
+    async def test_download_file_reuses_cached_asset_across_jobs(self, tmp_path):
+        """Test a second job downloading the same asset version only sends a HEAD."""
+        import httpx
+        from aidobe_video_processor.asset_cache import AssetCache
+        from aidobe_video_processor.modal_webhook import download_file
+        
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append(request.method)
+            return httpx.Response(200, headers={'ETag': '"v1"'}, content=b'music')
+        
+        cache = AssetCache(str(tmp_path / 'cache'))
+        url = 'https://example.com/music/background.mp3'
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await download_file(url, str(tmp_path / 'job1.mp3'), client=client, cache=cache)
+            requests_seen.clear()
+            await download_file(url, str(tmp_path / 'job2.mp3'), client=client, cache=cache)
+        
+        assert requests_seen == ['HEAD']
+        assert (tmp_path / 'job2.mp3').read_bytes() == b'music'
+
+    async def test_webhook_reuses_one_http_client_per_job(self):
+        """Test every HTTP call in a job goes through a single pooled client."""
+        import httpx
+        from aidobe_video_processor import modal_webhook
+        
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append(request.method)
+            return httpx.Response(200, content=b'data')
+        
+        created_clients = []
+        
+        def create_client():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            created_clients.append(client)
+            return client
+        
+        with patch.object(modal_webhook, '_create_http_client', side_effect=create_client), \
+             patch.object(modal_webhook, 'VideoProcessor') as mock_processor:
             
-            assert mock_download.call_count == 4
-            for i, (url, path) in enumerate(expected_calls):
-                assert mock_download.call_args_list[i][0] == (url, path)
+            mock_processor.return_value.process_complete_video = AsyncMock(return_value={
+                'status': 'success',
+                'output_path': '/tmp/final_video_12345.mp4',
+                'output_url': 'https://storage.example.com/output/test-job-12345.mp4',
+                'metadata': {}
+            })
+            
+            result = await modal_webhook.process_video_request(self.sample_webhook_request)
+        
+        assert result['status'] == 'completed'
+        assert len(created_clients) == 1
+        assert created_clients[0].is_closed
+        assert requests_seen.count('HEAD') >= 4  # validation (plus range probes)
+        assert 'POST' in requests_seen  # progress and completion callbacks
 
     async def test_webhook_integrates_all_video_components(self):
         """Test webhook integrates AudioDurationExtractor, SceneTimingCalculator, etc."""
@@ -239,6 +413,44 @@ class TestModalWebhookIntegration:
             mock_sync.assert_called_once()
             mock_assembler.assert_called_once()
 
+    async def test_processor_probes_all_durations_in_one_worker_batch(self):
+        """Test audio and video durations come from a single persistent-worker batch."""
+        from aidobe_video_processor.modal_webhook import VideoProcessor
+        
+        with patch('aidobe_video_processor.modal_webhook.AudioDurationExtractor') as mock_extractor:
+            extractor = mock_extractor.return_value
+            extractor.extract_multiple_durations.return_value = [15.0, 5.5, None]
+            
+            processor = VideoProcessor()
+            durations = await processor._probe_durations(['/tmp/a.mp3', '/tmp/v0.mp4', '/tmp/v1.mp4'])
+            clips = await processor._load_video_clips(['/tmp/v0.mp4', '/tmp/v1.mp4'], durations[1:])
+            
+            extractor.extract_multiple_durations.assert_called_once_with(
+                ['/tmp/a.mp3', '/tmp/v0.mp4', '/tmp/v1.mp4'], use_worker=True, skip_errors=True
+            )
+            extractor.close_worker.assert_not_called()
+            assert [clip.duration for clip in clips] == [5.5, 10.0]
+
+    async def test_consecutive_jobs_share_one_warm_duration_worker(self):
+        """Test jobs probe through one extractor whose worker is never closed between them."""
+        from aidobe_video_processor import modal_webhook
+        
+        with patch.object(modal_webhook, 'AudioDurationExtractor') as mock_extractor, \
+             patch.object(modal_webhook, 'validate_asset_accessibility',
+                          new_callable=AsyncMock, return_value={'is_valid': True}), \
+             patch.object(modal_webhook, 'download_files', new_callable=AsyncMock), \
+             patch.object(modal_webhook, 'send_progress_update', new_callable=AsyncMock), \
+             patch.object(modal_webhook, 'send_completion_callback'):
+            extractor = mock_extractor.return_value
+            extractor.extract_multiple_durations.return_value = [None, None, None, None]
+            
+            for _ in range(2):
+                await modal_webhook.process_video_request(make_webhook_request())
+            
+            mock_extractor.assert_called_once()
+            assert extractor.extract_multiple_durations.call_count == 2
+            extractor.close_worker.assert_not_called()
+
     async def test_webhook_applies_ken_burns_effects(self):
         """Test webhook applies Ken Burns effects when configured."""
         from aidobe_video_processor.modal_webhook import process_video_request
@@ -255,6 +467,123 @@ class TestModalWebhookIntegration:
             mock_ken_burns.assert_called_once()
             assert mock_ken_burns_instance.apply_ken_burns_effect.call_count == 3  # One per video asset
 
+    async def test_ken_burns_scenes_are_encoded_in_parallel(self):
+        """Test per-scene Ken Burns passes are dispatched to a pool and overlap."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from aidobe_video_processor.modal_webhook import VideoProcessor
+        
+        lock = threading.Lock()
+        in_flight = 0
+        peak_in_flight = 0
+        submitted = []
+        
+        def fake_effect(video_path, config):
+            nonlocal in_flight, peak_in_flight
+            with lock:
+                in_flight += 1
+                peak_in_flight = max(peak_in_flight, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return video_path.replace('.mp4', '_kb.mp4')
+        
+        class RecordingPool(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(fn, *args, **kwargs)
+        
+        with patch('aidobe_video_processor.modal_webhook.KenBurnsFFmpeg') as mock_ken_burns, \
+             patch('aidobe_video_processor.modal_webhook.ThreadPoolExecutor', RecordingPool), \
+             patch('aidobe_video_processor.modal_webhook.os.cpu_count', return_value=4):
+            
+            mock_ken_burns.return_value.apply_ken_burns_effect.side_effect = fake_effect
+            paths = [f'/tmp/video_{i}.mp4' for i in range(3)]
+            
+            results = await VideoProcessor()._apply_ken_burns_effects(paths, {'fps': 30})
+            
+            assert mock_ken_burns.return_value.apply_ken_burns_effect.call_count == 3
+            assert len(submitted) == 3
+            assert peak_in_flight > 1
+            assert results == [f'/tmp/video_{i}_kb.mp4' for i in range(3)]
+
+    async def test_reused_source_is_downloaded_probed_and_rendered_once(self):
+        """Test scenes sharing a source clip reuse one download, probe and render."""
+        from aidobe_video_processor import modal_webhook
+        
+        request = make_webhook_request()
+        intro = request['video_request']['video_assets'][0]
+        request['video_request']['video_assets'] = [
+            dict(intro, start_time=i * 5.0) for i in range(3)
+        ]
+        
+        with patch.object(modal_webhook, 'validate_asset_accessibility',
+                          new_callable=AsyncMock, return_value={'is_valid': True}), \
+             patch.object(modal_webhook, 'download_files', new_callable=AsyncMock) as mock_download, \
+             patch.object(modal_webhook, 'send_completion_callback'), \
+             patch.object(modal_webhook, 'VideoProcessor') as mock_processor:
+            
+            mock_processor.return_value.process_complete_video = AsyncMock(
+                return_value={'status': 'failed', 'error': 'stop'}
+            )
+            await modal_webhook.process_video_request(request)
+            
+            downloads = mock_download.call_args[0][0]
+            assert [url for url, _ in downloads].count(intro['asset_url']) == 1
+            video_files = mock_processor.return_value.process_complete_video.call_args[1]['video_files']
+            assert len(video_files) == 3 and len(set(video_files)) == 1
+        
+        with patch.object(modal_webhook, 'AudioDurationExtractor') as mock_extractor, \
+             patch.object(modal_webhook, 'KenBurnsFFmpeg') as mock_ken_burns:
+            extractor = mock_extractor.return_value
+            extractor.extract_multiple_durations.return_value = [15.0, 5.5]
+            mock_ken_burns.return_value.apply_ken_burns_effect.side_effect = (
+                lambda path, config: path.replace('.mp4', '_kb.mkv')
+            )
+            
+            processor = modal_webhook.VideoProcessor()
+            durations = await processor._probe_durations(['/tmp/a.mp3'] + ['/tmp/v0.mp4'] * 3)
+            rendered = await processor._apply_ken_burns_effects(['/tmp/v0.mp4'] * 3, {'fps': 30})
+            
+            extractor.extract_multiple_durations.assert_called_once_with(
+                ['/tmp/a.mp3', '/tmp/v0.mp4'], use_worker=True, skip_errors=True
+            )
+            assert durations == [15.0, 5.5, 5.5, 5.5]
+            mock_ken_burns.return_value.apply_ken_burns_effect.assert_called_once()
+            assert rendered == ['/tmp/v0_kb.mkv'] * 3
+
+    async def test_ken_burns_ffmpeg_renders_scene(self, tmp_path):
+        """Test KenBurnsFFmpeg writes a zoompan-processed copy of a scene."""
+        import subprocess
+        pytest.importorskip('imageio_ffmpeg')
+        from aidobe_video_processor.ffmpeg_filters import _ffmpeg_binary
+        from aidobe_video_processor.modal_webhook import KenBurnsFFmpeg
+        
+        scene_path = tmp_path / 'scene.mp4'
+        subprocess.run([
+            _ffmpeg_binary(), '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=c=red:s=64x48:d=0.5', str(scene_path)
+        ], check=True)
+        
+        output_path = KenBurnsFFmpeg().apply_ken_burns_effect(str(scene_path), {'size': '64x48', 'fps': 10})
+        
+        assert output_path == str(tmp_path / 'scene_kb.mkv')
+        assert (tmp_path / 'scene_kb.mkv').stat().st_size > 0
+    
+    def test_ken_burns_intermediate_is_not_h264(self):
+        """Test per-scene passes write lossless FFV1 rather than libx264."""
+        from aidobe_video_processor.modal_webhook import KenBurnsFFmpeg
+        
+        with patch('aidobe_video_processor.ffmpeg_filters.subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=0, stderr='')
+            KenBurnsFFmpeg().apply_ken_burns_effect('/tmp/scene.mp4', {})
+        
+        command = mock_run.call_args[0][0]
+        assert command[command.index('-c:v') + 1] == 'ffv1'
+        assert 'libx264' not in command
+        assert command[-1] == '/tmp/scene_kb.mkv'
+
     async def test_webhook_mixes_background_music(self):
         """Test webhook mixes background music when configured."""
         from aidobe_video_processor.modal_webhook import process_video_request
@@ -292,15 +621,23 @@ class TestModalWebhookIntegration:
         """Test webhook exports final video with specified quality settings."""
         from aidobe_video_processor.modal_webhook import process_video_request
         
-        with patch('aidobe_video_processor.modal_webhook.VideoAssembler') as mock_assembler, \
-             patch('aidobe_video_processor.modal_webhook.upload_to_storage') as mock_upload, \
-             patch('aidobe_video_processor.modal_webhook.VideoProcessor'):
+        with patch('aidobe_video_processor.modal_webhook.validate_asset_accessibility') as mock_validate, \
+             patch('aidobe_video_processor.modal_webhook.download_file'), \
+             patch('aidobe_video_processor.modal_webhook.AudioDurationExtractor') as mock_extractor, \
+             patch('aidobe_video_processor.modal_webhook.KenBurnsFFmpeg') as mock_ken_burns, \
+             patch('aidobe_video_processor.modal_webhook.VideoAssembler') as mock_assembler, \
+             patch('aidobe_video_processor.modal_webhook.stream_upload_to_storage') as mock_stream_upload, \
+             patch('aidobe_video_processor.modal_webhook.upload_to_storage') as mock_upload:
             
+            mock_validate.return_value = {'is_valid': True, 'missing_assets': [], 'inaccessible_assets': []}
+            mock_extractor.return_value.extract_multiple_durations.return_value = [30.0, 10.0, 10.0, 10.0]
+            mock_ken_burns.return_value.apply_ken_burns_effect.side_effect = lambda path, config: path
             mock_assembler_instance = mock_assembler.return_value
             mock_final_video = Mock()
             mock_assembler_instance.assemble_complete_video.return_value = mock_final_video
             mock_assembler_instance.export_video.return_value = '/tmp/final_video_12345.mp4'
-            mock_upload.return_value = 'https://storage.example.com/output/test-job-12345.mp4'
+            mock_assembler_instance.get_assembly_metadata.return_value = {}
+            mock_stream_upload.return_value = 'https://storage.example.com/output/test-job-12345.mp4'
             
             result = await process_video_request(self.sample_webhook_request)
             
@@ -312,6 +649,120 @@ class TestModalWebhookIntegration:
             assert export_config['format'] == 'mp4'
             assert export_config['codec'] == 'libx264'
             assert export_config['fps'] == 30
+            
+            # Should upload while encoding rather than after it
+            assert export_call[1]['streamable'] is True
+            mock_stream_upload.assert_called_once()
+            assert mock_stream_upload.call_args[0][1:3] == ('aidobe-videos', 'generated/test-job-12345.mp4')
+            mock_upload.assert_not_called()
+            assert result['output_url'] == 'https://storage.example.com/output/test-job-12345.mp4'
+
+    async def test_stream_upload_sends_parts_while_file_grows(self, tmp_path):
+        """Test stream_upload_to_storage uploads parts in order as the file is written."""
+        import asyncio
+        import time
+        from aidobe_video_processor.modal_webhook import stream_upload_to_storage
+        
+        local_path = tmp_path / 'final.mp4'
+        chunks = [bytes([i]) * 1000 for i in range(5)]
+        uploaded = {}
+        
+        def write_slowly():
+            with open(local_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    f.flush()
+                    time.sleep(0.02)
+            return str(local_path)
+        
+        async def fake_upload_part(bucket, key, part_number, data):
+            uploaded[part_number] = data
+            return f'etag-{part_number}'
+        
+        with patch('aidobe_video_processor.modal_webhook.upload_part', side_effect=fake_upload_part), \
+             patch('aidobe_video_processor.modal_webhook.complete_multipart_upload') as mock_complete:
+            
+            mock_complete.return_value = 'https://storage.example.com/bucket/key.mp4'
+            export_task = asyncio.ensure_future(asyncio.to_thread(write_slowly))
+            
+            url = await stream_upload_to_storage(
+                str(local_path), 'bucket', 'key.mp4', export_task, part_size=1500, poll_interval=0.005
+            )
+            
+            assert url == 'https://storage.example.com/bucket/key.mp4'
+            assert b''.join(uploaded[n] for n in sorted(uploaded)) == b''.join(chunks)
+            assert sorted(uploaded) == [1, 2, 3, 4]
+            mock_complete.assert_called_once_with('bucket', 'key.mp4', ['etag-1', 'etag-2', 'etag-3', 'etag-4'])
+
+    async def test_failed_part_aborts_the_multipart_upload(self, tmp_path):
+        """Test a failing part stops the upload and aborts it instead of completing."""
+        import asyncio
+        from aidobe_video_processor.modal_webhook import stream_upload_to_storage
+        
+        local_path = tmp_path / 'final.mp4'
+        local_path.write_bytes(b'x' * 4000)
+        release_export = asyncio.Event()
+        
+        async def fake_upload_part(bucket, key, part_number, data):
+            if part_number == 2:
+                raise RuntimeError('part rejected')
+            return f'etag-{part_number}'
+        
+        async def export():
+            await release_export.wait()
+            return str(local_path)
+        
+        with patch('aidobe_video_processor.modal_webhook.upload_part', side_effect=fake_upload_part), \
+             patch('aidobe_video_processor.modal_webhook.abort_multipart_upload',
+                   new_callable=AsyncMock) as mock_abort, \
+             patch('aidobe_video_processor.modal_webhook.complete_multipart_upload') as mock_complete:
+            
+            export_task = asyncio.ensure_future(export())
+            with pytest.raises(RuntimeError, match='part rejected'):
+                await stream_upload_to_storage(
+                    str(local_path), 'bucket', 'key.mp4', export_task,
+                    part_size=1000, poll_interval=0.005
+                )
+            
+            # The failure surfaced while the export was still running
+            assert not export_task.done()
+            mock_abort.assert_awaited_once_with('bucket', 'key.mp4')
+            mock_complete.assert_not_called()
+            release_export.set()
+            await export_task
+
+    async def test_failed_upload_waits_for_export_and_removes_its_output(self):
+        """Test the export output is released only after the encoder thread stops."""
+        import time
+        from aidobe_video_processor.modal_webhook import VideoProcessor
+        
+        events = []
+        
+        def export_video(**kwargs):
+            time.sleep(0.05)
+            events.append(('exported', kwargs['output_path']))
+            return kwargs['output_path']
+        
+        async def release(paths):
+            events.append(('released', list(paths)))
+        
+        with patch('aidobe_video_processor.modal_webhook.VideoAssembler') as mock_assembler, \
+             patch('aidobe_video_processor.modal_webhook.stream_upload_to_storage',
+                   new_callable=AsyncMock, side_effect=RuntimeError('part rejected')), \
+             patch('aidobe_video_processor.modal_webhook.release_temp_files', side_effect=release):
+            mock_assembler.return_value.export_video.side_effect = export_video
+            processor = VideoProcessor()
+            processor._probe_durations = AsyncMock(return_value=[10.0, 10.0])
+            
+            result = await processor.process_complete_video(
+                '/tmp/a.mp3', ['/tmp/v0.mp4'], [], {}, {'enabled': False}, {},
+                upload_target=('bucket', 'key.mp4')
+            )
+        
+        assert result == {'status': 'failed', 'error': 'part rejected'}
+        (_, output_path), (_, released) = events
+        assert output_path.startswith('/tmp/final_video_')
+        assert released == [output_path]
 
     async def test_webhook_uploads_to_storage_and_calls_callback(self):
         """Test webhook uploads final video and calls completion callback."""
@@ -338,6 +789,48 @@ class TestModalWebhookIntegration:
             assert callback_data['status'] == 'completed'
             assert 'output_url' in callback_data
 
+    async def test_completion_callback_retries_server_errors(self):
+        """Test callbacks retry 5xx responses but not 4xx responses."""
+        import httpx
+        from aidobe_video_processor.modal_webhook import _post_with_retry
+        
+        statuses = [503, 502, 200]
+        attempts = []
+        
+        def handler(request):
+            attempts.append(request.url)
+            return httpx.Response(statuses[len(attempts) - 1])
+        
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            response = await _post_with_retry(client, 'https://example.com/video-complete', {}, base=0)
+            assert response.status_code == 200
+            assert len(attempts) == 3
+            
+            statuses = [404, 200]
+            attempts.clear()
+            with pytest.raises(httpx.HTTPStatusError):
+                await _post_with_retry(client, 'https://example.com/video-complete', {}, base=0)
+            assert len(attempts) == 1
+
+    async def test_slow_completion_callback_is_detached(self):
+        """Test a slow callback receiver does not hold up the job result."""
+        import asyncio
+        from aidobe_video_processor.modal_webhook import _dispatch_completion_callback
+        
+        release = asyncio.Event()
+        
+        async def slow_callback(callback_url, callback_data):
+            await release.wait()
+        
+        with patch('aidobe_video_processor.modal_webhook.send_completion_callback', side_effect=slow_callback):
+            pending = await _dispatch_completion_callback('https://example.com/video-complete', {}, wait_seconds=0.01)
+            
+            assert pending is not None and not pending.done()
+            release.set()
+            await pending
+            
+            assert await _dispatch_completion_callback('https://example.com/video-complete', {}) is None
+
     async def test_webhook_handles_processing_errors_gracefully(self):
         """Test webhook handles processing errors and sends failure callbacks."""
         from aidobe_video_processor.modal_webhook import process_video_request
@@ -359,17 +852,80 @@ class TestModalWebhookIntegration:
             assert callback_data['status'] == 'failed'
             assert 'error' in callback_data
 
+    async def test_malformed_payload_fails_inside_the_cleanup_path(self):
+        """Test non-mapping and invalid payloads release the job's client and tasks."""
+        from aidobe_video_processor import modal_webhook
+        
+        with patch.object(modal_webhook, '_create_http_client') as mock_client, \
+             patch.object(modal_webhook, 'ProgressBatcher') as mock_batcher, \
+             patch.object(modal_webhook, 'send_completion_callback') as mock_callback:
+            mock_client.return_value.aclose = AsyncMock()
+            
+            result = await modal_webhook.process_video_request(['not', 'a', 'mapping'])
+            
+            assert result['status'] == 'failed' and result['job_id'] == 'unknown'
+            mock_client.return_value.aclose.assert_awaited_once()
+            mock_callback.assert_not_called()
+            
+            # The failure callback still goes out; progress batching never starts
+            result = await modal_webhook.process_video_request(
+                {'job_id': 'job-1', 'callback_url': 'https://api.aidobe.app/webhook/video-complete'}
+            )
+            
+            assert result['status'] == 'failed' and 'Field required' in result['error']
+            mock_batcher.assert_not_called()
+            assert mock_callback.call_args[0][1]['job_id'] == 'job-1'
+        
+        assert modal_webhook._http_client.get() is None
+        assert modal_webhook._temp_reaper.get() is None
+
     async def test_webhook_cleans_up_temporary_files(self):
         """Test webhook cleans up all temporary files after processing."""
         from aidobe_video_processor.modal_webhook import process_video_request
         
-        with patch('aidobe_video_processor.modal_webhook.cleanup_temp_files') as mock_cleanup, \
+        with patch('aidobe_video_processor.modal_webhook.cleanup_temp_files',
+                   new_callable=AsyncMock) as mock_cleanup, \
              patch('aidobe_video_processor.modal_webhook.VideoProcessor'):
             
             result = await process_video_request(self.sample_webhook_request)
             
             # Should clean up temporary files
-            mock_cleanup.assert_called_once()
+            mock_cleanup.assert_awaited_once()
+
+    async def test_cleanup_removes_files_off_the_event_loop(self, tmp_path):
+        """Test cleanup deletes every file and tolerates ones already gone."""
+        from aidobe_video_processor.modal_webhook import cleanup_temp_files
+        
+        paths = [tmp_path / f"temp_{i}.mp4" for i in range(20)]
+        for path in paths:
+            path.write_bytes(b'x')
+        
+        await cleanup_temp_files([str(path) for path in paths] + [str(tmp_path / 'missing.mp4')])
+        
+        assert not any(path.exists() for path in paths)
+
+    async def test_released_files_are_reaped_in_background(self, tmp_path):
+        """Test stages hand files to the job's reaper instead of deleting inline."""
+        from aidobe_video_processor.modal_webhook import (
+            TempFileReaper, _temp_reaper, release_temp_files
+        )
+        
+        path = tmp_path / 'scene_kb.mkv'
+        path.write_bytes(b'x')
+        
+        reaper = TempFileReaper()
+        reaper.start()
+        token = _temp_reaper.set(reaper)
+        try:
+            with patch('aidobe_video_processor.modal_webhook.cleanup_temp_files',
+                       new_callable=AsyncMock) as mock_cleanup:
+                await release_temp_files([str(path)])
+                mock_cleanup.assert_not_awaited()
+            await reaper.drain()
+        finally:
+            _temp_reaper.reset(token)
+        
+        assert not path.exists()
 
     async def test_webhook_reports_processing_progress(self):
         """Test webhook reports processing progress for long-running jobs."""
@@ -389,6 +945,72 @@ class TestModalWebhookIntegration:
             assert any(p['stage'] == 'processing' for p in progress_calls)
             assert any(p['stage'] == 'uploading' for p in progress_calls)
 
+    def test_prewarm_loads_components_before_first_request(self):
+        """Test prewarm imports MoviePy and caches the FFmpeg lookup."""
+        import sys
+        from aidobe_video_processor.ffmpeg_filters import _ffmpeg_binary
+        from aidobe_video_processor.modal_webhook import prewarm
+        
+        _ffmpeg_binary.cache_clear()
+        prewarm()
+        
+        assert 'moviepy.editor' in sys.modules
+        assert _ffmpeg_binary.cache_info().currsize == 1
+        
+        _ffmpeg_binary()
+        assert _ffmpeg_binary.cache_info().hits >= 1
+
+    async def test_progress_batch_posts_json_body(self):
+        """Test progress batches go to the batch endpoint as one JSON envelope."""
+        import httpx
+        import numpy as np
+        import orjson
+        from aidobe_video_processor.modal_webhook import send_progress_batch
+        
+        seen = []
+        
+        def handler(request):
+            seen.append((str(request.url), request.headers['content-type'], orjson.loads(request.content)))
+            return httpx.Response(200)
+        
+        batch = [{'job_id': 'job', 'stage': 'processing', 'progress': np.float64(0.5),
+                  'resolution': (1920, 1080)}]
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await send_progress_batch('https://example.com/video-complete', batch, client=client)
+        
+        assert seen == [('https://example.com/video-progress/batch', 'application/json', {
+            'job_id': 'job',
+            'updates': [{'job_id': 'job', 'stage': 'processing', 'progress': 0.5, 'resolution': [1920, 1080]}]
+        })]
+
+    def test_stage_updates_follow_pipeline_order(self):
+        """Test each job gets one payload per stage with rising progress."""
+        from aidobe_video_processor.modal_webhook import PROGRESS_STAGES, _stage_updates
+        
+        updates = _stage_updates('job-1')
+        
+        assert list(updates) == ['validating', 'downloading', 'processing', 'uploading']
+        assert updates['downloading'] == {'job_id': 'job-1', 'stage': 'downloading', 'progress': 0.2}
+        progress = [progress for _, progress in PROGRESS_STAGES]
+        assert progress == sorted(progress)
+
+    async def test_progress_batcher_coalesces_updates(self):
+        """Test N progress emits collapse into ceil(N / max_batch) POSTs."""
+        import math
+        from aidobe_video_processor.modal_webhook import ProgressBatcher
+        
+        with patch('aidobe_video_processor.modal_webhook.send_progress_batch') as mock_batch:
+            batcher = ProgressBatcher('https://example.com/video-complete', flush_ms=1000, max_batch=4)
+            batcher.start()
+            
+            for i in range(10):
+                batcher.emit({'job_id': 'job', 'stage': f'scene_{i}', 'progress': i / 10})
+            await batcher.drain()
+            
+            assert mock_batch.call_count == math.ceil(10 / 4)
+            sent = [p['stage'] for call in mock_batch.call_args_list for p in call[0][1]]
+            assert sent == [f'scene_{i}' for i in range(10)]
+
     async def test_webhook_validates_asset_availability(self):
         """Test webhook validates all assets are accessible before processing."""
         from aidobe_video_processor.modal_webhook import process_video_request
@@ -408,12 +1030,60 @@ class TestModalWebhookIntegration:
             assert "Assets not accessible" in str(excinfo.value)
             mock_validate.assert_called_once()
 
+    async def test_asset_validation_heads_in_parallel_and_feeds_downloads(self, tmp_path):
+        """Test HEADs run concurrently and their metadata spares the download a HEAD."""
+        import asyncio
+        import httpx
+        from aidobe_video_processor import modal_webhook
+        
+        payload = b'x' * 2048
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append((request.method, request.url.path, request.headers.get('If-Range')))
+            if request.url.path.endswith('missing.mp4'):
+                return httpx.Response(404)
+            headers = {'Accept-Ranges': 'bytes', 'Content-Length': str(len(payload)), 'ETag': '"v1"'}
+            if request.method == 'HEAD':
+                return httpx.Response(200, headers=headers)
+            start, end = (int(v) for v in request.headers['Range'].split('=')[1].split('-'))
+            return httpx.Response(206, content=payload[start:end + 1], headers={
+                'Content-Range': f'bytes {start}-{end}/{len(payload)}'
+            })
+        
+        video_request = dict(self.sample_webhook_request['video_request'])
+        video_request['video_assets'] = video_request['video_assets'] + [
+            {'asset_url': 'https://storage.example.com/video/missing.mp4'}
+        ]
+        
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch.object(modal_webhook.asyncio, 'gather', wraps=asyncio.gather) as gather_spy:
+                validation = await modal_webhook.validate_asset_accessibility(video_request, client=client)
+            
+            gather_spy.assert_called_once()
+            assert len(gather_spy.call_args[0]) == 5
+            assert not validation['is_valid']
+            assert validation['inaccessible_assets'] == ['https://storage.example.com/video/missing.mp4']
+            
+            audio_url = video_request['audio_file_url']
+            meta = validation['asset_meta'][audio_url]
+            assert meta['etag'] == '"v1"' and meta['content_length'] == len(payload)
+            
+            requests_seen.clear()
+            local_path = tmp_path / 'audio.mp3'
+            await modal_webhook.download_file(audio_url, str(local_path), chunk_size=1024,
+                                              client=client, known_meta=meta)
+            
+            assert local_path.read_bytes() == payload
+            assert [method for method, _, _ in requests_seen] == ['GET', 'GET']
+            assert all(if_range == '"v1"' for _, _, if_range in requests_seen)
+
     async def test_webhook_handles_different_video_formats(self):
         """Test webhook handles different input video formats (mp4, mov, avi)."""
         from aidobe_video_processor.modal_webhook import process_video_request
         
         # Modify request to use different video formats
-        mixed_format_request = self.sample_webhook_request.copy()
+        mixed_format_request = make_webhook_request()
         mixed_format_request['video_request']['video_assets'] = [
             {"asset_url": "https://storage.example.com/video/intro.mp4", "start_time": 0.0, "duration": 5.5},
             {"asset_url": "https://storage.example.com/video/demo.mov", "start_time": 5.5, "duration": 6.5},
@@ -432,25 +1102,40 @@ class TestModalWebhookIntegration:
             assert result['status'] == 'success'
 
     async def test_webhook_respects_memory_limits(self):
-        """Test webhook processes large videos within memory constraints."""
-        from aidobe_video_processor.modal_webhook import process_video_request
+        """Test webhook fans the scenes of large videos out to the scene mapper."""
+        from aidobe_video_processor.modal_webhook import SceneSpec, process_video_request
         
-        # Create request with many video assets to test memory optimization
-        large_request = self.sample_webhook_request.copy()
+        # Create request with many video assets to test scene fan-out
+        large_request = make_webhook_request()
         large_request['video_request']['video_assets'] = [
             {"asset_url": f"https://storage.example.com/video/clip_{i}.mp4", "start_time": i*2.0, "duration": 2.0}
             for i in range(20)  # 20 video clips
         ]
+        scene_mapper = Mock(side_effect=lambda specs: [spec.video_path for spec in specs])
         
-        with patch('aidobe_video_processor.modal_webhook.VideoAssembler') as mock_assembler, \
-             patch('aidobe_video_processor.modal_webhook.VideoProcessor'):
+        with patch('aidobe_video_processor.modal_webhook.validate_asset_accessibility') as mock_validate, \
+             patch('aidobe_video_processor.modal_webhook.download_files'), \
+             patch('aidobe_video_processor.modal_webhook.AudioDurationExtractor') as mock_extractor, \
+             patch('aidobe_video_processor.modal_webhook.KenBurnsFFmpeg') as mock_ken_burns, \
+             patch('aidobe_video_processor.modal_webhook.VideoAssembler') as mock_assembler, \
+             patch('aidobe_video_processor.modal_webhook.stream_upload_to_storage') as mock_stream_upload, \
+             patch('aidobe_video_processor.modal_webhook.send_completion_callback'):
             
-            mock_assembler_instance = mock_assembler.return_value
+            mock_validate.return_value = {'is_valid': True}
+            mock_extractor.return_value.extract_multiple_durations.return_value = [40.0] + [2.0] * 20
+            mock_assembler.return_value.export_video.return_value = '/tmp/final_video_12345.mp4'
+            mock_assembler.return_value.get_assembly_metadata.return_value = {}
+            mock_stream_upload.return_value = 'https://storage.example.com/output/test-job-12345.mp4'
             
-            result = await process_video_request(large_request)
+            result = await process_video_request(large_request, scene_mapper=scene_mapper)
             
-            # Should use memory-optimized assembly
-            mock_assembler_instance.assemble_video_optimized.assert_called_once()
+            # Should render scenes through the mapper rather than on this box
+            assert result['status'] == 'completed'
+            scene_mapper.assert_called_once()
+            specs = scene_mapper.call_args[0][0]
+            assert len(specs) == 20
+            assert all(isinstance(spec, SceneSpec) and spec.ken_burns for spec in specs)
+            mock_ken_burns.return_value.apply_ken_burns_effect.assert_not_called()
 
     async def test_webhook_generates_comprehensive_metadata(self):
         """Test webhook generates comprehensive metadata about the processed video."""
@@ -5,7 +5,9 @@ Following TDD approach - these tests will fail initially and drive the implement
 Based on wanx patterns for ensuring continuous video with no gaps or overlaps.
 """
 
+import numpy as np
 import pytest
+from unittest.mock import patch
 from aidobe_video_processor.scene_gap_validator import SceneGapValidator
 
 
@@ -87,6 +89,28 @@ class TestSceneGapValidator:
         assert overlap2['overlap_end'] == 25.0
         assert overlap2['overlap_duration'] == 2.0
 
+    def test_out_of_order_scenes_are_checked_by_list_position(self):
+        """Test boundaries are between list neighbours, as the fixers assume."""
+        from aidobe_video_processor.scene_gap_validator import _SMALL_SCENE_COUNT
+        
+        swapped = [
+            {'start_time': 5.0, 'end_time': 10.0, 'duration': 5.0},
+            {'start_time': 0.0, 'end_time': 5.0, 'duration': 5.0}
+        ]
+        padding = [
+            {'start_time': 5.0 + i, 'end_time': 6.0 + i, 'duration': 1.0}
+            for i in range(_SMALL_SCENE_COUNT)
+        ]
+        
+        for scenes in (swapped, swapped + padding):
+            result = self.validator.validate_scene_continuity(scenes)
+            
+            assert not result['is_valid']
+            overlap = result['overlaps'][0]
+            assert (overlap['scene1'], overlap['scene2']) == (0, 1)
+            assert overlap['overlap_duration'] == 10.0
+            assert result['total_duration'] == scenes[-1]['end_time'] - 5.0
+
     def test_fix_gaps_by_extending_scenes(self):
         """Test fixing gaps by extending previous scenes."""
         scenes = [
@@ -170,6 +194,27 @@ class TestSceneGapValidator:
         validation = self.validator.validate_scene_continuity(fixed_scenes)
         assert validation['is_valid'] == True
 
+    def test_trim_handles_alternating_gaps_and_overlaps(self):
+        """Test overlap trimming matches the scene-by-scene rule on mixed input."""
+        scenes = []
+        start = 0.0
+        for i in range(12):
+            scenes.append({'start_time': start, 'end_time': start + 4.0, 'duration': 4.0})
+            start += 4.5 if i % 2 else 3.0  # alternate 1s overlaps and 0.5s gaps
+        scenes.append({'start_time': 2.0, 'end_time': 10.0, 'duration': 8.0})  # starts before its predecessor
+        
+        fixed = self.validator.fix_overlaps_trim_previous(scenes)
+        
+        for i in range(len(scenes) - 1):
+            if scenes[i]['end_time'] > scenes[i + 1]['start_time']:
+                next_start = scenes[i + 1]['start_time']
+                expected_end = next_start if next_start > scenes[i]['start_time'] else scenes[i]['start_time'] + 0.1
+                assert fixed[i]['end_time'] == pytest.approx(expected_end)
+                assert fixed[i]['duration'] == pytest.approx(expected_end - scenes[i]['start_time'])
+            else:
+                assert fixed[i] == scenes[i]
+        assert fixed[-1] == scenes[-1]
+
     def test_minimum_scene_duration_constraint(self):
         """Test that scene fixes respect minimum duration constraints."""
         scenes = [
@@ -260,6 +305,19 @@ class TestSceneGapValidator:
         
         assert "Scene 0" in str(excinfo.value)
 
+    def test_invalid_scene_data_reports_first_offending_scene(self):
+        """Test vectorized data checks still name the first bad scene and its problem."""
+        scenes = [
+            {'start_time': 0.0, 'end_time': 10.0, 'duration': 10.0},
+            {'start_time': 10.0, 'end_time': 20.0, 'duration': 12.0},
+            {'start_time': 25.0, 'end_time': 20.0, 'duration': 5.0}
+        ]
+        
+        with pytest.raises(ValueError) as excinfo:
+            self.validator.validate_scene_continuity(scenes)
+        
+        assert "Scene 1: duration mismatch" in str(excinfo.value)
+
     def test_very_small_gaps_tolerance(self):
         """Test tolerance for very small gaps (floating point precision)."""
         scenes = [
@@ -310,4 +368,236 @@ class TestSceneGapValidator:
         
         # Should maintain continuity
         validation = self.validator.validate_scene_continuity(adjusted_scenes)
-        assert validation['is_valid'] == True
\ No newline at end of file
+        assert validation['is_valid'] == True
+
+    def test_duration_enforcement_scales_proportionally(self):
+        """Test enforcement keeps duration ratios and lays scenes back to back."""
+        scenes = [
+            {'start_time': 2.0, 'end_time': 6.0, 'duration': 4.0},
+            {'start_time': 7.0, 'end_time': 19.0, 'duration': 12.0}
+        ]
+        
+        adjusted = self.validator.enforce_total_duration(scenes, 8.0)
+        
+        assert [scene['duration'] for scene in adjusted] == pytest.approx([2.0, 6.0])
+        assert [scene['start_time'] for scene in adjusted] == pytest.approx([0.0, 2.0])
+        assert adjusted[-1]['end_time'] == pytest.approx(8.0)
+        assert all(type(scene['end_time']) is float for scene in adjusted)
+        assert scenes[0]['start_time'] == 2.0  # input left untouched
+
+    def test_unconstrained_gap_extension_leaves_overlaps_and_tiny_gaps(self):
+        """Test only real gaps are closed when no minimum duration is given."""
+        scenes = [
+            {'start_time': 0.0, 'end_time': 10.0005, 'duration': 10.0005},
+            {'start_time': 10.001, 'end_time': 21.0, 'duration': 10.999},  # within tolerance
+            {'start_time': 20.0, 'end_time': 25.0, 'duration': 5.0},  # overlap
+            {'start_time': 27.0, 'end_time': 30.0, 'duration': 3.0}
+        ]
+        
+        fixed_scenes = self.validator.fix_gaps_extend_previous(scenes)
+        
+        assert [scene['end_time'] for scene in fixed_scenes] == [10.0005, 21.0, 27.0, 30.0]
+        assert fixed_scenes[2]['duration'] == 7.0
+        assert [scene['start_time'] for scene in fixed_scenes] == [0.0, 10.001, 20.0, 27.0]
+
+    def test_boundaries_exactly_at_tolerance_are_valid(self):
+        """Test gaps and overlaps equal to the tolerance are not reported."""
+        scenes = [
+            {'start_time': 0.0, 'end_time': 10.0, 'duration': 10.0},
+            {'start_time': 10.5, 'end_time': 20.0, 'duration': 9.5},  # 0.5s gap
+            {'start_time': 19.5, 'end_time': 30.0, 'duration': 10.5}  # 0.5s overlap
+        ]
+        
+        assert self.validator.validate_scene_continuity(scenes, tolerance=0.5)['is_valid']
+        
+        result = self.validator.validate_scene_continuity(scenes, tolerance=0.25)
+        assert [gap['after_scene'] for gap in result['gaps']] == [0]
+        assert [(o['scene1'], o['scene2']) for o in result['overlaps']] == [(1, 2)]
+
+    def test_shift_kernel_matches_python_fallback(self):
+        """Test the compiled shift kernel agrees with its pure Python version."""
+        from aidobe_video_processor.scene_gap_validator import _shift_onto_previous
+        
+        rng = np.random.default_rng(3)
+        durations = rng.uniform(1.0, 10.0, size=200)
+        starts = np.cumsum(durations + rng.choice([0.0, 0.0005, 2.0], size=200)) - durations
+        ends = starts + durations
+        kernel = getattr(_shift_onto_previous, 'py_func', _shift_onto_previous)
+        
+        compiled_starts, compiled_ends = starts.copy(), ends.copy()
+        reference_starts, reference_ends = starts.copy(), ends.copy()
+        compiled = _shift_onto_previous(compiled_starts, compiled_ends, 0.001)
+        reference = kernel(reference_starts, reference_ends, 0.001)
+        
+        assert np.array_equal(compiled, reference)
+        assert np.array_equal(compiled_starts, reference_starts)
+        assert np.all(compiled_starts[1:] - compiled_ends[:-1] <= 0.001)
+
+    def test_results_hold_plain_python_numbers(self):
+        """Test reported gaps, overlaps and fixed scenes carry Python floats and ints."""
+        scenes = [
+            {'start_time': 0.0, 'end_time': 10.0, 'duration': 10.0},
+            {'start_time': 12.0, 'end_time': 20.0, 'duration': 8.0},
+            {'start_time': 19.0, 'end_time': 25.0, 'duration': 6.0}
+        ]
+        
+        result = self.validator.validate_scene_continuity(scenes)
+        fixed_scenes = self.validator.fix_gaps_shift_following(scenes)
+        
+        records = result['gaps'] + result['overlaps'] + fixed_scenes
+        assert all(type(value) in (int, float) for record in records for value in record.values())
+        assert result['gaps'][0] == {
+            'after_scene': 0, 'gap_start': 10.0, 'gap_end': 12.0, 'gap_duration': 2.0
+        }
+
+    def test_scene_records_are_accepted_like_dicts(self):
+        """Test slotted Scene records validate and fix the same as scene dicts."""
+        from aidobe_video_processor.scene_gap_validator import Scene
+        
+        scenes = [
+            {'start_time': 0.0, 'end_time': 10.0, 'duration': 10.0},
+            {'start_time': 12.0, 'end_time': 27.0, 'duration': 15.0},
+            {'start_time': 26.0, 'end_time': 40.0, 'duration': 14.0}
+        ]
+        records = [Scene(**scene) for scene in scenes]
+        
+        assert not hasattr(records[0], '__dict__')
+        assert self.validator.validate_scene_continuity(records) == \
+            self.validator.validate_scene_continuity(scenes)
+        assert self.validator.fix_all_timing_issues(records) == \
+            self.validator.fix_all_timing_issues(scenes)
+        assert self.validator.enforce_total_duration(records, 50.0) == \
+            self.validator.enforce_total_duration(scenes, 50.0)
+        
+        with pytest.raises(ValueError, match='Scene 0: end_time'):
+            self.validator.validate_scene_continuity([Scene(start_time=5.0, end_time=5.0, duration=1.0)])
+
+    def test_missing_field_reported_before_timing_errors(self):
+        """Test a missing field in a later scene wins over bad timing earlier on."""
+        scenes = [
+            {'start_time': 5.0, 'end_time': 1.0, 'duration': 4.0},
+            {'start_time': 5.0, 'end_time': 9.0}
+        ]
+        
+        with pytest.raises(ValueError, match='Scene 1 missing required field: duration'):
+            self.validator.validate_scene_continuity(scenes)
+
+    def test_fused_fix_matches_separate_trim_and_extend(self):
+        """Test the single-pass fix gives exactly the two-step trim-then-extend result."""
+        rng = np.random.default_rng(11)
+        durations = rng.uniform(1.0, 10.0, size=300)
+        offsets = rng.choice([0.0, 0.0005, 1.5, -0.5, -20.0], size=300)
+        starts = np.maximum(np.cumsum(durations + offsets) - durations, 0.0)
+        scenes = [
+            {'start_time': start, 'end_time': start + duration, 'duration': duration}
+            for start, duration in zip(starts.tolist(), durations.tolist())
+        ]
+        
+        fused = self.validator._trim_and_extend(scenes)
+        separate = self.validator.fix_gaps_extend_previous(
+            self.validator.fix_overlaps_trim_previous(scenes)
+        )
+        
+        assert fused == separate
+
+    def test_small_scene_lists_match_array_path(self):
+        """Test the scalar path for short lists reports exactly what the array path does."""
+        from aidobe_video_processor import scene_gap_validator
+        
+        rng = np.random.default_rng(5)
+        durations = rng.uniform(1.0, 10.0, size=12)
+        starts = np.maximum(
+            np.cumsum(durations + rng.choice([0.0, 1.5, -0.5], size=12)) - durations, 0.0
+        )
+        scenes = [
+            {'start_time': start, 'end_time': start + duration, 'duration': duration}
+            for start, duration in zip(starts.tolist(), durations.tolist())
+        ]
+        scenes[0] = {'start_time': 0, 'end_time': 3, 'duration': 3}  # ints are accepted
+        
+        small = self.validator.validate_scene_continuity(scenes)
+        with patch.object(scene_gap_validator, '_SMALL_SCENE_COUNT', 0):
+            large = self.validator.validate_scene_continuity(scenes)
+        
+        assert small == large
+        assert small['gaps'] and small['overlaps']
+        assert type(small['total_duration']) is float
+
+    def test_long_list_validation_reuses_scratch_buffers(self):
+        """Test repeated validations of long lists reuse one scratch allocation."""
+        scenes = [
+            {'start_time': i * 2.0, 'end_time': i * 2.0 + 2.0, 'duration': 2.0}
+            for i in range(100)
+        ]
+        scenes[50] = {'start_time': 101.0, 'end_time': 102.0, 'duration': 1.0}
+        
+        first = self.validator.validate_scene_continuity(scenes)
+        rows = self.validator._scratch.rows
+        second = self.validator.validate_scene_continuity(scenes[:80])
+        
+        assert self.validator._scratch.rows is rows
+        assert first['gaps'] == second['gaps']
+        assert [gap['after_scene'] for gap in first['gaps']] == [49]
+
+    def test_repeated_validation_is_served_from_recent_results(self):
+        """Test identical timing is only checked once and results stay independent."""
+        scenes = [
+            {'start_time': 0.0, 'end_time': 10.0, 'duration': 10.0},
+            {'start_time': 12.0, 'end_time': 20.0, 'duration': 8.0}
+        ]
+        
+        with patch.object(
+            self.validator, '_find_boundary_issues_small',
+            wraps=self.validator._find_boundary_issues_small
+        ) as sweep:
+            first = self.validator.validate_scene_continuity(scenes)
+            first['gaps'][0]['gap_duration'] = 99.0
+            second = self.validator.validate_scene_continuity([dict(scene) for scene in scenes])
+            self.validator.validate_scene_continuity(scenes, tolerance=5.0)
+        
+        assert sweep.call_count == 2  # the changed tolerance is a new entry
+        assert second['gaps'][0]['gap_duration'] == 2.0
+        
+        scenes[1]['start_time'] = 10.0
+        scenes[1]['duration'] = 10.0
+        assert self.validator.validate_scene_continuity(scenes)['is_valid']
+
+    def test_long_list_records_become_dicts_at_the_boundary(self):
+        """Test the record-array path reports plain dicts and remembers only tuples."""
+        scenes = [
+            {'start_time': i * 2.0, 'end_time': i * 2.0 + 2.0, 'duration': 2.0}
+            for i in range(40)
+        ]
+        scenes[10] = {'start_time': 19.5, 'end_time': 22.0, 'duration': 2.5}
+        
+        result = self.validator.validate_scene_continuity(scenes)
+        
+        assert result['overlaps'] == [{
+            'scene1': 9, 'scene2': 10,
+            'overlap_start': 19.5, 'overlap_end': 20.0, 'overlap_duration': 0.5
+        }]
+        assert type(result['overlaps'][0]['scene1']) is int
+        remembered, = self.validator._recent_results.values()
+        assert remembered['overlaps'] == [(9, 10, 19.5, 20.0, 0.5)]
+
+    def test_invalid_scene_data_rejected_under_python_optimize(self):
+        """Test data validation is API behaviour that survives python -O, not asserts."""
+        import os
+        import subprocess
+        import sys
+        
+        script = (
+            "from aidobe_video_processor.scene_gap_validator import SceneGapValidator\n"
+            "scenes = [{'start_time': 10.0, 'end_time': 5.0, 'duration': -5.0}]\n"
+            "try:\n"
+            "    SceneGapValidator().validate_scene_continuity(scenes)\n"
+            "except ValueError as e:\n"
+            "    print(e)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-O', '-c', script],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        
+        assert result.stdout.startswith('Scene 0: end_time')
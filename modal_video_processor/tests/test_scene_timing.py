@@ -229,4 +229,89 @@ class TestSceneTimingCalculator:
         base_duration = audio_duration / scene_count
         for duration in durations:
             assert duration > base_duration * 0.5  # Not less than half
-            assert duration < base_duration * 2.0  # Not more than double
\ No newline at end of file
+            assert duration < base_duration * 2.0  # Not more than double
+
+    def test_compiled_kernel_matches_reference_loop(self):
+        """Test the compiled distribution kernel reproduces the cumulative loop exactly."""
+        for audio_duration, scene_count in [(30.0, 3), (42.123456789, 6), (97.654321, 8), (1.0, 1000)]:
+            base_duration = audio_duration / scene_count
+            expected = []
+            running_total = 0.0
+            for i in range(scene_count):
+                scene_duration = (i + 1) * base_duration - running_total
+                expected.append(scene_duration)
+                running_total += scene_duration
+            
+            durations = self.calculator.distribute_scene_durations(audio_duration, scene_count)
+            
+            assert durations[:-1] == expected[:-1]
+            assert all(isinstance(d, float) for d in durations)
+
+    def test_vectorized_timing_returns_plain_contiguous_lists(self):
+        """Test start/end times are cumulative, contiguous and plain Python floats."""
+        result = self.calculator.calculate_scene_timing(97.654321, 8, enable_rebalancing=True)
+        
+        assert result['start_times'][0] == 0.0
+        assert result['start_times'][1:] == result['end_times'][:-1]
+        assert result['gaps_detected'] == []
+        assert abs(result['end_times'][-1] - 97.654321) < 0.001
+        assert all(type(t) is float for t in result['start_times'] + result['end_times'])
+        
+        summary = self.calculator.get_deficit_surplus_summary()
+        assert all(type(entry['scene']) is int for entry in summary['deficits'] + summary['surpluses'])
+
+    def test_weighted_distribution_rebalances_into_bounds(self):
+        """Test out-of-bounds weighted scenes are rebalanced and the moves logged."""
+        durations = self.calculator.distribute_scene_durations_weighted(
+            60.0, [1.0, 1.0, 10.0, 0.1], min_scene_duration=5.0, max_scene_duration=30.0
+        )
+        
+        assert durations == pytest.approx([10.0, 10.0, 30.0, 10.0])
+        assert abs(sum(durations) - 60.0) < 0.001
+        log = self.calculator.get_deficit_surplus_summary()['rebalancing_log']
+        assert [entry['scene'] for entry in log] == [0, 1, 2, 3]
+        assert log[2]['adjustment'] < 0
+
+    def test_rebalance_rejects_infeasible_bounds(self):
+        """Test bounds that cannot cover the target duration are rejected."""
+        with pytest.raises(ValueError) as excinfo:
+            self.calculator.rebalance_scene_durations([10.0, 10.0], 30.0, max_scene_duration=12.0)
+        
+        assert "Cannot fit 2 scenes" in str(excinfo.value)
+
+    def test_rebalance_kernel_matches_python_fallback(self):
+        """Test the compiled rebalance kernel agrees with its pure Python version."""
+        import numpy as np
+        from aidobe_video_processor.scene_timing import _rebalance
+        
+        rng = np.random.default_rng(7)
+        durations = rng.uniform(0.5, 20.0, size=500)
+        kernel = getattr(_rebalance, 'py_func', _rebalance)
+        
+        compiled = _rebalance(durations, 2.0, 15.0, 4000.0)
+        reference = kernel(durations, 2.0, 15.0, 4000.0)
+        
+        assert np.allclose(compiled, reference)
+        assert compiled.min() >= 2.0 and compiled.max() <= 15.0
+        assert abs(compiled.sum() - 4000.0) < 1e-6
+
+    def test_compensated_sum_keeps_tiny_durations(self):
+        """Test the kernel's Kahan sum matches an exact sum where naive summing drifts."""
+        import math
+        import numpy as np
+        from aidobe_video_processor.scene_timing import _kahan_sum
+        
+        durations = np.array([1.0] + [1e-16] * 10)
+        
+        assert _kahan_sum(durations) == math.fsum(durations)
+        assert _kahan_sum(durations) > sum(durations)
+
+    def test_kernels_are_compiled_at_import(self):
+        """Test every kernel has its signature compiled before first use."""
+        pytest.importorskip('numba')
+        from aidobe_video_processor import scene_gap_validator, video_assembler
+        from aidobe_video_processor.scene_timing import _KERNELS, compile_kernels
+        
+        kernels = (*_KERNELS, *scene_gap_validator._KERNELS, *video_assembler._KERNELS)
+        assert compile_kernels() == len(kernels)
+        assert all(kernel.nopython_signatures for kernel in kernels)
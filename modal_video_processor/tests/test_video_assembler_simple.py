@@ -5,6 +5,7 @@ Focuses on integration logic rather than MoviePy functionality.
 Tests the coordination between components without external dependencies.
 """
 
+import os
 import pytest
 from unittest.mock import Mock, patch
 from aidobe_video_processor.video_assembler import VideoAssembler
@@ -46,6 +47,26 @@ class TestVideoAssemblerSimple:
         
         assert "missing duration property" in str(excinfo.value)
 
+    def test_validate_inputs_stops_at_first_clip_without_duration(self):
+        """Test the first clip lacking a duration attribute is reported."""
+        later_clip = Mock()
+        later_clip.duration = None
+        clips = [Mock(duration=5.0), object(), later_clip]
+        
+        with pytest.raises(ValueError) as excinfo:
+            self.assembler._validate_inputs(clips, Mock())
+        
+        assert str(excinfo.value) == "Video clip 1 missing duration property"
+
+    def test_assemblers_share_helper_components(self):
+        """Test helpers are built once per process, not per assembler."""
+        other = VideoAssembler()
+        
+        assert other.scene_timing is self.assembler.scene_timing
+        assert other.gap_validator is self.assembler.gap_validator
+        assert other.audio_sync is self.assembler.audio_sync
+        assert other.audio_extractor is self.assembler.audio_extractor
+
     def test_get_assembly_metadata(self):
         """Test assembly metadata generation."""
         mock_video_clips = [Mock(), Mock()]
@@ -67,6 +88,17 @@ class TestVideoAssemblerSimple:
         assert metadata['resolution'] == (1920, 1080)
         assert metadata['fps'] == 30
 
+    def test_assembly_metadata_totals_many_clips(self):
+        """Test metadata totals for long clip lists are plain floats."""
+        mock_video_clips = [Mock(duration=0.1, size=(1280, 720), fps=24) for _ in range(300)]
+        mock_audio_clip = Mock(duration=30.0)
+        
+        metadata = self.assembler.get_assembly_metadata(mock_video_clips, mock_audio_clip)
+        
+        assert type(metadata['total_video_duration']) is float
+        assert metadata['total_video_duration'] == pytest.approx(30.0)
+        assert metadata['duration_match'] == True
+
     def test_scene_timing_integration(self):
         """Test SceneTimingCalculator integration."""
         mock_video_clips = [Mock(), Mock()]
@@ -138,6 +170,86 @@ class TestVideoAssemblerSimple:
             mock_validate.assert_called_once()
             mock_fix.assert_called_once()
 
+    def test_repeated_previews_reuse_subclips(self):
+        """Test previewing the same range twice trims each source once."""
+        mock_video_clips = [Mock(duration=20.0), Mock(duration=10.0)]
+        mock_audio_clip = Mock(duration=30.0)
+
+        with patch.object(self.assembler, 'assemble_video') as mock_assemble:
+            for _ in range(3):
+                self.assembler.create_preview(mock_video_clips, mock_audio_clip, 6.0, 'high')
+            self.assembler.create_preview(mock_video_clips, mock_audio_clip, 3.0, 'high')
+
+        mock_audio_clip.subclip.assert_any_call(0, 6.0)
+        assert mock_audio_clip.subclip.call_count == 2
+        assert mock_video_clips[0].subclip.call_count == 2
+        assert mock_assemble.call_args_list[0] == mock_assemble.call_args_list[2]
+
+    def test_preview_subclips_do_not_keep_sources_alive(self):
+        """Test the preview trim registry releases clips once nothing uses them."""
+        import gc
+        import weakref
+        from moviepy.editor import ColorClip
+        from aidobe_video_processor.video_assembler import _preview_subclip
+
+        clip = ColorClip((16, 16), color=(0, 0, 0), duration=4)
+        first = _preview_subclip(clip, 0, 2.0)
+        assert _preview_subclip(clip, 0, 2.0) is first
+
+        source = weakref.ref(clip)
+        del clip, first
+        gc.collect()
+
+        assert source() is None
+
+    def test_caption_overlay_matches_composite_clip(self):
+        """Test the blended captions are pixel-identical to CompositeVideoClip."""
+        import numpy as np
+        from moviepy.editor import ColorClip, CompositeVideoClip
+        from aidobe_video_processor.video_assembler import _overlay_captions
+
+        base = ColorClip((160, 120), color=(30, 60, 90), duration=4)
+        captions = self.assembler._create_caption_clips([
+            {'text': 'Hello', 'start_time': 0.0, 'end_time': 2.0},
+            {'text': 'A caption wider than the whole frame', 'start_time': 1.5, 'end_time': 3.0}
+        ], {'fontsize': 28, 'color': 'yellow'})
+
+        overlaid = _overlay_captions(base, captions)
+        composite = CompositeVideoClip([base] + captions)
+
+        for t in (0.0, 1.7, 2.5, 3.5):
+            assert np.array_equal(overlaid.get_frame(t), composite.get_frame(t))
+
+    def test_alpha_blend_kernel_matches_numpy_fallback(self):
+        """Test the compiled blend and the NumPy fallback agree exactly."""
+        import numpy as np
+        from aidobe_video_processor.video_assembler import _alpha_blend, _alpha_blend_numpy
+
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, (40, 60, 3), dtype=np.uint8)
+        caption = rng.integers(0, 256, (10, 30, 3), dtype=np.uint8)
+        alpha = rng.random((10, 30))
+        expected = frame.copy()
+
+        _alpha_blend(frame[25:35, 10:40], caption, alpha)
+        _alpha_blend_numpy(expected[25:35, 10:40], caption, alpha)
+
+        assert np.array_equal(frame, expected)
+
+    def test_validation_timeline_is_contiguous(self):
+        """Test clip timelines built for validation never show rounding gaps."""
+        from aidobe_video_processor.video_assembler import _scene_timeline
+
+        scenes = _scene_timeline([0.1] * 50 + [1 / 3] * 50)
+        mock_video_clips = [Mock(duration=scene.duration) for scene in scenes]
+
+        assert all(prev.end_time == scene.start_time for prev, scene in zip(scenes, scenes[1:]))
+        with patch.object(self.assembler, 'assemble_video') as mock_assemble:
+            self.assembler.assemble_video_with_validation(mock_video_clips, Mock())
+
+        assert mock_assemble.call_args[0][0] == mock_video_clips
+        assert not any(clip.set_duration.called for clip in mock_video_clips)
+
     def test_complete_pipeline_integration(self):
         """Test complete pipeline integration with all components."""
         mock_video_clips = [Mock(), Mock(), Mock()]
@@ -175,6 +287,33 @@ class TestVideoAssemblerSimple:
             mock_sync.assert_called_once()
             mock_validate.assert_called_once()
 
+    def test_complete_pipeline_syncs_while_validating(self):
+        """Test audio sync and gap validation overlap instead of running in turn."""
+        import threading
+
+        mock_video_clips = [Mock(duration=15.0), Mock(duration=15.0)]
+        validation_started = threading.Event()
+
+        def sync(clips, audio_duration, scene_durations):
+            # Only returns if validation starts before sync finishes
+            assert validation_started.wait(timeout=5)
+            return clips
+
+        def validate(scenes):
+            validation_started.set()
+            return {'is_valid': True}
+
+        with patch.object(self.assembler.audio_sync, 'sync_complete_video_to_master_audio',
+                          side_effect=sync), \
+             patch.object(self.assembler.gap_validator, 'validate_scene_continuity',
+                          side_effect=validate) as mock_validate, \
+             patch.object(self.assembler, 'assemble_video') as mock_assemble:
+            result = self.assembler.assemble_complete_video(mock_video_clips, Mock(duration=30.0))
+
+        assert [scene.end_time for scene in mock_validate.call_args[0][0]] == [15.0, 30.0]
+        assert mock_assemble.call_args[0][0] == mock_video_clips
+        assert result is mock_assemble.return_value
+
     def test_apply_output_config(self):
         """Test output configuration application."""
         mock_video = Mock()
@@ -189,6 +328,20 @@ class TestVideoAssemblerSimple:
         # The resize returns a new mock, so set_fps is called on that
         result.set_fps.assert_called_once_with(30)
 
+    def test_apply_output_config_resizes_real_clips_with_opencv(self):
+        """Test MoviePy clips are resized frame by frame with cv2.resize."""
+        pytest.importorskip('cv2')
+        from moviepy.editor import ColorClip
+
+        clip = ColorClip(size=(64, 48), color=(255, 0, 0), duration=1).set_fps(10)
+
+        with patch.object(ColorClip, 'resize') as mock_resize:
+            result = self.assembler._apply_output_config(clip, {'resolution': '480p'})
+
+        mock_resize.assert_not_called()
+        assert result.size == (854, 480)
+        assert result.get_frame(0).shape == (480, 854, 3)
+
     def test_caption_data_validation(self):
         """Test caption data validation logic."""
         captions_data = [
@@ -206,6 +359,73 @@ class TestVideoAssemblerSimple:
         assert style['fontsize'] == 24
         assert style['color'] == 'white'
 
+    def test_repeated_captions_are_rendered_once(self):
+        """Test each distinct caption is rasterised once and timed per use."""
+        from aidobe_video_processor.video_assembler import _render_caption
+
+        _render_caption.cache_clear()
+        captions_data = [
+            {'text': 'Subscribe!', 'start_time': 0.0, 'end_time': 2.0},
+            {'text': 'Next up', 'start_time': 2.0, 'end_time': 4.0},
+            {'text': 'Subscribe!', 'start_time': 4.0, 'end_time': 6.0}
+        ]
+
+        clips = self.assembler._create_caption_clips(captions_data, {'fontsize': 30, 'color': 'yellow'})
+
+        assert _render_caption.cache_info().misses == 2
+        assert [(clip.start, clip.end) for clip in clips] == [(0.0, 2.0), (2.0, 4.0), (4.0, 6.0)]
+        assert clips[0].size == clips[2].size
+        assert clips[0].mask is not None
+        assert tuple(clips[0].get_frame(0).max(axis=(0, 1))) == (255, 255, 0)
+
+    def test_caption_style_keys_from_text_clip_are_honoured(self):
+        """Test stroke, background and caption wrapping change the rendered caption."""
+        captions_data = [{'text': 'Stay tuned for more', 'start_time': 0.0, 'end_time': 2.0}]
+        plain, = self.assembler._create_caption_clips(captions_data, {'fontsize': 30})
+        outlined, = self.assembler._create_caption_clips(
+            captions_data, {'fontsize': 30, 'stroke_color': 'red', 'stroke_width': 3}
+        )
+        boxed, = self.assembler._create_caption_clips(
+            captions_data, {'fontsize': 30, 'bg_color': 'blue', 'method': 'caption', 'size': [120, None]}
+        )
+
+        assert outlined.size[0] > plain.size[0] and outlined.size[1] > plain.size[1]
+        assert (outlined.get_frame(0) == (255, 0, 0)).all(axis=2).any()
+        assert boxed.size[0] == 120 and boxed.size[1] > plain.size[1]
+        assert tuple(boxed.get_frame(0)[0, 0]) == (0, 0, 255)
+        assert boxed.mask.get_frame(0).min() == 1.0
+
+    def test_unsupported_caption_style_keys_are_rejected(self):
+        """Test style keys the renderer cannot reproduce raise instead of being dropped."""
+        with pytest.raises(ValueError) as excinfo:
+            self.assembler._create_caption_clips(
+                [{'text': 'Hi', 'start_time': 0.0, 'end_time': 1.0}], {'kerning': 2, 'print_cmd': True}
+            )
+
+        assert str(excinfo.value) == "Unsupported caption style keys: kerning, print_cmd"
+
+    def test_imagemagick_font_names_resolve_to_installed_files(self, tmp_path, monkeypatch):
+        """Test names like 'Arial-Bold' find a matching font file without fontconfig."""
+        from PIL import ImageFont
+        from aidobe_video_processor.video_assembler import _resolve_font
+
+        # Pillow's bundled default font, installed under an Arial file name
+        default_font = ImageFont.load_default(size=12)
+        if not isinstance(default_font, ImageFont.FreeTypeFont):
+            pytest.skip('Pillow has no bundled TrueType font')
+        font_dir = tmp_path / 'fonts' / 'truetype'
+        font_dir.mkdir(parents=True)
+        (font_dir / 'Arial_Bold.ttf').write_bytes(default_font.path.getvalue())
+        monkeypatch.setenv('XDG_DATA_DIRS', str(tmp_path))
+        monkeypatch.setattr('aidobe_video_processor.video_assembler.shutil.which', lambda name: None)
+
+        _resolve_font.cache_clear()
+        try:
+            assert _resolve_font('Arial-Bold') == str(font_dir / 'Arial_Bold.ttf')
+            assert _resolve_font('NoSuchFont-Bold') is None
+        finally:
+            _resolve_font.cache_clear()
+
     def test_export_video_configuration(self):
         """Test video export configuration."""
         mock_composite_video = Mock()
@@ -214,7 +434,8 @@ class TestVideoAssemblerSimple:
             'format': 'mp4',
             'codec': 'libx264',
             'bitrate': '2000k',
-            'fps': 30
+            'fps': 30,
+            'allow_hw': False
         }
         
         output_path = self.assembler.export_video(
@@ -231,4 +452,418 @@ class TestVideoAssemblerSimple:
         assert call_args[1]['filename'] == '/tmp/test_video.mp4'
         assert call_args[1]['codec'] == 'libx264'
         assert call_args[1]['fps'] == 30
-        assert output_path == '/tmp/test_video.mp4'
\ No newline at end of file
+        assert output_path == '/tmp/test_video.mp4'
+
+    def test_export_prefers_hardware_h264_encoder(self):
+        """Test libx264 exports use a working hardware encoder unless disallowed."""
+        videos = [Mock(), Mock(), Mock()]
+
+        with patch('aidobe_video_processor.ffmpeg_filters.hardware_h264_encoder',
+                   return_value=('h264_nvenc', 'p1')):
+            self.assembler.export_video(videos[0], '/tmp/hw.mp4', {'codec': 'libx264'})
+            self.assembler.export_video(
+                videos[1], '/tmp/sw.mp4', {'codec': 'libx264', 'allow_hw': False}
+            )
+            self.assembler.export_video(
+                videos[2], '/tmp/slow.mp4', {'codec': 'libx264', 'preset': 'slow'}
+            )
+
+        hardware, software, configured = [video.write_videofile.call_args[1] for video in videos]
+        assert (hardware['codec'], hardware['preset']) == ('h264_nvenc', 'p1')
+        assert (software['codec'], software['preset']) == ('libx264', 'ultrafast')
+        assert (configured['codec'], configured['preset']) == ('libx264', 'slow')
+        assert 'allow_hw' not in software
+
+    def test_export_reuses_writer_for_identical_config(self):
+        """Test batch exports with one config share a specialized writer."""
+        from aidobe_video_processor.video_assembler import _export_writer
+
+        _export_writer.cache_clear()
+        export_config = {'codec': 'libx264', 'preset': 'fast', 'fps': 24}
+        videos = [Mock(), Mock()]
+
+        for index, video in enumerate(videos):
+            self.assembler.export_video(
+                video, f"/tmp/batch_{index}.mp4", dict(export_config), streamable=True
+            )
+
+        assert _export_writer.cache_info().misses == 1
+        assert _export_writer.cache_info().hits == 1
+        call_kwargs = videos[1].write_videofile.call_args[1]
+        assert call_kwargs['filename'] == '/tmp/batch_1.mp4'
+        assert call_kwargs['preset'] == 'fast'
+        assert call_kwargs['ffmpeg_params'] == ['-movflags', 'frag_keyframe+empty_moov']
+
+    def test_export_with_filtergraph_pipes_frames_between_stages(self):
+        """Test frames are piped through a NUT muxer into the one encoding pass."""
+        import numpy as np
+        
+        mock_composite_video = Mock(size=(4, 2), audio=None)
+        mock_composite_video.iter_frames.return_value = [np.zeros((2, 4, 3), dtype='uint8')] * 3
+        
+        with patch('aidobe_video_processor.ffmpeg_filters.subprocess.Popen') as mock_popen:
+            mock_popen.return_value.returncode = 0
+            mock_popen.return_value.poll.return_value = 0
+            
+            output_path = self.assembler.export_video(
+                composite_video=mock_composite_video,
+                output_path='/tmp/test_video.mp4',
+                export_config={'codec': 'libx264', 'fps': 30, 'allow_hw': False},
+                filtergraph='[0:v]null[vout];[0:a]anull[aout]'
+            )
+        
+        mock_composite_video.write_videofile.assert_not_called()
+        mux_command, encode_command = [call[0][0] for call in mock_popen.call_args_list]
+        assert mux_command[mux_command.index('-s') + 1] == '4x2'
+        assert mux_command[-3:] == ['-f', 'nut', 'pipe:1']
+        assert encode_command[encode_command.index('-i') + 1] == 'pipe:0'
+        assert encode_command[encode_command.index('-c:v') + 1] == 'libx264'
+        assert encode_command[-1] == '/tmp/test_video.mp4'
+        assert mock_popen.return_value.stdin.write.call_count == 3
+        assert output_path == '/tmp/test_video.mp4'
+
+    def test_export_pipes_frames_without_copying_contiguous_buffers(self):
+        """Test contiguous frames reach the pipe as-is and strided views are compacted."""
+        import numpy as np
+
+        frame = np.zeros((2, 4, 3), dtype='uint8')
+        cropped = np.zeros((2, 8, 3), dtype='uint8')[:, ::2]
+        mock_composite_video = Mock(size=(4, 2), audio=None)
+        mock_composite_video.iter_frames.return_value = [frame, cropped]
+
+        with patch('aidobe_video_processor.ffmpeg_filters.subprocess.Popen') as mock_popen:
+            mock_popen.return_value.returncode = 0
+            mock_popen.return_value.poll.return_value = 0
+
+            self.assembler.export_video(
+                composite_video=mock_composite_video,
+                output_path='/tmp/test_video.mp4',
+                export_config={'allow_hw': False},
+                filtergraph='[0:v]null[vout];[0:a]anull[aout]'
+            )
+
+        written = [call[0][0] for call in mock_popen.return_value.stdin.write.call_args_list]
+        assert written[0] is frame
+        assert written[1].flags['C_CONTIGUOUS']
+        assert np.array_equal(written[1], cropped)
+
+    def test_export_with_filtergraph_renders_real_clip(self, tmp_path):
+        """Test the piped export produces a playable file with a real FFmpeg."""
+        pytest.importorskip('imageio_ffmpeg')
+        import numpy as np
+        from moviepy.editor import AudioClip, ColorClip
+        from aidobe_video_processor.ffmpeg_filters import build_fused_filtergraph
+        
+        tone = AudioClip(lambda t: np.sin(440 * 2 * np.pi * t), duration=1, fps=44100)
+        clip = ColorClip((64, 48), color=(255, 0, 0), duration=1).set_audio(tone)
+        
+        output_path = self.assembler.export_video(
+            composite_video=clip,
+            output_path=str(tmp_path / 'final.mp4'),
+            export_config={'fps': 10},
+            filtergraph=build_fused_filtergraph({'size': '64x48', 'fps': 10})
+        )
+        
+        assert (tmp_path / 'final.mp4').stat().st_size > 0
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['final.mp4']
+
+    def test_export_with_progress_streams_frames_to_imageio_ffmpeg(self, tmp_path):
+        """Test progress is reported every 30 frames while encoding a real clip."""
+        pytest.importorskip('imageio_ffmpeg')
+        import numpy as np
+        from moviepy.editor import AudioClip, ColorClip
+        
+        tone = AudioClip(lambda t: np.sin(440 * 2 * np.pi * t), duration=3, fps=44100)
+        clip = ColorClip((64, 48), color=(0, 0, 255), duration=3).set_audio(tone)
+        progress_callback = Mock()
+        
+        with patch.object(ColorClip, 'write_videofile') as mock_write:
+            output_path = self.assembler.export_video(
+                clip, str(tmp_path / 'final.mp4'), {'fps': 20},
+                progress_callback=progress_callback
+            )
+        
+        mock_write.assert_not_called()
+        reported = [call[0][0] for call in progress_callback.call_args_list]
+        assert reported == [0.0, 0.5, 1.0]
+        assert (tmp_path / 'final.mp4').stat().st_size > 0
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['final.mp4']
+        assert output_path == str(tmp_path / 'final.mp4')
+
+    def test_assemble_optimized_concats_clip_files_without_loading_frames(self, tmp_path):
+        """Test file-backed clips are joined by the concat demuxer with stream copy."""
+        from aidobe_video_processor.ffmpeg_filters import ClipSource
+        
+        sources = [
+            ClipSource(path=str(tmp_path / f"scene_{i}_kb.mkv"), duration=2.5)
+            for i in range(12)
+        ]
+        manifests = []
+        
+        def capture_manifest(command, **kwargs):
+            manifests.append(open(command[command.index('-i') + 1]).read())
+            return Mock(returncode=0, stderr='')
+        
+        with patch('aidobe_video_processor.ffmpeg_filters.subprocess.run',
+                   side_effect=capture_manifest) as mock_run, \
+             patch('moviepy.editor.VideoFileClip') as mock_file_clip:
+            result = self.assembler.assemble_video_optimized(
+                sources, Mock(duration=30.0), output_path=str(tmp_path / 'joined.mkv')
+            )
+        
+        command = mock_run.call_args[0][0]
+        assert command[command.index('-c:v') + 1] == 'copy'
+        assert command[-1] == str(tmp_path / 'joined.mkv')
+        assert manifests[0].count('file ') == 12
+        assert 'duration 2.5' in manifests[0]
+        assert not (tmp_path / 'joined.ffconcat').exists()
+        mock_file_clip.assert_called_once_with(str(tmp_path / 'joined.mkv'), audio=False)
+        assert result == mock_file_clip.return_value.set_audio.return_value
+
+    def test_temporary_concat_output_is_deleted_with_its_clip(self, tmp_path):
+        """Test the lossless intermediate lives exactly as long as the clip reading it."""
+        pytest.importorskip('imageio_ffmpeg')
+        import gc
+        from aidobe_video_processor.ffmpeg_filters import ClipSource
+
+        sources = [
+            ClipSource(path=self._write_clip(tmp_path / f"scene_{i}.mp4", color), duration=1.0)
+            for i, color in enumerate(['red', 'green'])
+        ]
+
+        result = self.assembler.assemble_video_optimized(sources, Mock(duration=2.0))
+        output_path = result.filename
+        assert os.path.exists(output_path)
+
+        result.close()
+        del result
+        gc.collect()
+        assert not os.path.exists(output_path)
+
+    def _write_clip(self, path, color, size='64x48'):
+        """Render a one-second test clip with FFmpeg."""
+        import subprocess
+        from aidobe_video_processor.ffmpeg_filters import _ffmpeg_binary
+        
+        subprocess.run([
+            _ffmpeg_binary(), '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', f"color=c={color}:s={size}:d=1:r=10",
+            '-c:v', 'libx264', '-g', '1', '-pix_fmt', 'yuv420p', str(path)
+        ], check=True)
+        return str(path)
+
+    def test_assemble_video_stream_copies_uniform_clip_files(self, tmp_path):
+        """Test matching clip files and an audio file are muxed without re-encoding."""
+        pytest.importorskip('imageio_ffmpeg')
+        import subprocess
+        from aidobe_video_processor.ffmpeg_filters import ClipSource, _ffmpeg_binary, run_ffmpeg
+        
+        sources = [
+            ClipSource(path=self._write_clip(tmp_path / f"scene_{i}.mp4", color), duration=1.0)
+            for i, color in enumerate(['red', 'green'])
+        ]
+        audio_path = str(tmp_path / 'narration.wav')
+        subprocess.run([
+            _ffmpeg_binary(), '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'sine=d=2', audio_path
+        ], check=True)
+        
+        with patch('aidobe_video_processor.ffmpeg_filters.run_ffmpeg', wraps=run_ffmpeg) as mock_run:
+            result = self.assembler.assemble_video(sources, audio_path)
+        
+        arguments = mock_run.call_args[0][0]
+        assert arguments[arguments.index('-c') + 1] == 'copy'
+        assert abs(result.duration - 2.0) < 0.2
+        assert result.audio is not None
+        
+        # The joined file is removed once the clip reading it is gone
+        import gc
+        joined_path = result.filename
+        result.close()
+        del result
+        gc.collect()
+        assert not os.path.exists(joined_path)
+
+    def test_assemble_video_stream_copies_with_path_audio(self, tmp_path):
+        """Test a pathlib audio path takes the FFmpeg stream-copy mux."""
+        from pathlib import Path
+        from aidobe_video_processor.ffmpeg_filters import ClipSource
+
+        sources = [ClipSource(path=str(tmp_path / 'scene.mkv'), duration=2.0)]
+
+        with patch('aidobe_video_processor.ffmpeg_filters.probe_video_format',
+                   return_value=('h264', 'yuv420p', '64x48', '10')), \
+             patch('aidobe_video_processor.ffmpeg_filters.stream_copy_concat') as mock_copy, \
+             patch('moviepy.editor.VideoFileClip') as mock_file_clip:
+            result = self.assembler.assemble_video(sources, Path(tmp_path / 'narration.wav'))
+
+        assert mock_copy.call_args[0][1] == str(tmp_path / 'narration.wav')
+        assert result is mock_file_clip.return_value
+        os.remove(mock_copy.call_args[0][2])
+
+    def test_export_remuxes_untouched_stream_copied_assembly(self, tmp_path):
+        """Test exporting a stream-copied assembly copies the video stream."""
+        pytest.importorskip('imageio_ffmpeg')
+        import subprocess
+        from aidobe_video_processor.ffmpeg_filters import ClipSource, _ffmpeg_binary
+
+        sources = [
+            ClipSource(path=self._write_clip(tmp_path / f"scene_{i}.mp4", color), duration=1.0)
+            for i, color in enumerate(['red', 'green'])
+        ]
+        audio_path = str(tmp_path / 'narration.wav')
+        subprocess.run([
+            _ffmpeg_binary(), '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'sine=d=2', audio_path
+        ], check=True)
+        result = self.assembler.assemble_video(sources, audio_path)
+
+        with patch.object(type(result), 'write_videofile') as mock_write:
+            output_path = self.assembler.export_video(
+                result, str(tmp_path / 'final.mp4'), {'fps': 10}
+            )
+            mock_write.assert_not_called()
+
+            # A transformed clip no longer matches its file and is re-encoded
+            self.assembler.export_video(
+                result.set_fps(10).fx(lambda clip: clip.fl_image(lambda f: f)),
+                str(tmp_path / 'edited.mp4'), {'fps': 10}
+            )
+            mock_write.assert_called_once()
+
+        assert (tmp_path / 'final.mp4').stat().st_size > 0
+        assert output_path == str(tmp_path / 'final.mp4')
+        result.close()
+
+    def test_speed_adjustment_retimes_clip_files_with_ffmpeg(self, tmp_path):
+        """Test ClipSource files are sped up by setpts instead of MoviePy speedx."""
+        pytest.importorskip('imageio_ffmpeg')
+        from moviepy.editor import VideoFileClip
+        from aidobe_video_processor.ffmpeg_filters import ClipSource
+
+        sources = [
+            ClipSource(path=self._write_clip(tmp_path / f"scene_{i}.mp4", color), duration=1.0)
+            for i, color in enumerate(['red', 'green'])
+        ]
+
+        rendered_durations = []
+
+        def read_retimed(clips, audio_clip):
+            for clip in clips:
+                rendered = VideoFileClip(clip.path, audio=False)
+                rendered_durations.append(rendered.duration)
+                rendered.close()
+            return Mock()
+
+        with patch.object(self.assembler, 'assemble_video', side_effect=read_retimed) as mock_assemble:
+            self.assembler.assemble_video_with_speed_adjustment(sources, Mock(duration=1.0), 1.0)
+
+        retimed = mock_assemble.call_args[0][0]
+        assert [clip.duration for clip in retimed] == [0.5, 0.5]
+        assert all(abs(duration - 0.5) < 0.15 for duration in rendered_durations)
+        # The assembled (mock) clip does not read them, so they are gone
+        assert not any(os.path.exists(clip.path) for clip in retimed)
+
+    def test_retimed_files_live_as_long_as_the_assembled_clip(self, tmp_path):
+        """Test retimed intermediates stay on disk while the assembly reads them."""
+        pytest.importorskip('imageio_ffmpeg')
+        import gc
+        import tempfile
+        from aidobe_video_processor.ffmpeg_filters import ClipSource
+
+        sources = [
+            ClipSource(path=self._write_clip(tmp_path / f"scene_{i}.mp4", color), duration=1.0)
+            for i, color in enumerate(['red', 'green'])
+        ]
+        before = set(os.listdir(tempfile.gettempdir()))
+
+        result = self.assembler.assemble_video_with_speed_adjustment(sources, Mock(duration=1.0), 1.0)
+        retimed = [name for name in set(os.listdir(tempfile.gettempdir())) - before if name.endswith('.mkv')]
+        assert len(retimed) == 2
+        assert abs(result.duration - 1.0) < 0.15
+
+        del result
+        gc.collect()
+        assert not set(retimed) & set(os.listdir(tempfile.gettempdir()))
+
+    def test_assemble_video_reencodes_mismatched_clip_files(self, tmp_path):
+        """Test clip files with different frame sizes fall back to MoviePy."""
+        pytest.importorskip('imageio_ffmpeg')
+        from aidobe_video_processor.ffmpeg_filters import ClipSource
+        
+        sources = [
+            ClipSource(path=self._write_clip(tmp_path / 'small.mp4', 'red', '64x48'), duration=1.0),
+            ClipSource(path=self._write_clip(tmp_path / 'large.mp4', 'blue', '128x96'), duration=0.5)
+        ]
+        audio_clip = Mock(duration=1.5)
+        
+        with patch('aidobe_video_processor.ffmpeg_filters.stream_copy_concat') as mock_copy:
+            result = self.assembler.assemble_video(sources, audio_clip)
+        
+        mock_copy.assert_not_called()
+        assert abs(result.duration - 1.5) < 0.05
+        assert result.audio is audio_clip
+
+    def test_background_music_files_are_mixed_by_ffmpeg(self, tmp_path):
+        """Test file-backed narration and music are mixed in one FFmpeg pass."""
+        pytest.importorskip('imageio_ffmpeg')
+        import subprocess
+        from moviepy.editor import AudioFileClip
+        from aidobe_video_processor.ffmpeg_filters import _ffmpeg_binary, run_ffmpeg
+        
+        paths = {}
+        for name, duration in [('narration', 3), ('music', 6)]:
+            paths[name] = str(tmp_path / f"{name}.wav")
+            subprocess.run([
+                _ffmpeg_binary(), '-y', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', f"sine=d={duration}", paths[name]
+            ], check=True)
+        video_clips = [Mock(duration=3.0)]
+        mixed_durations = []
+        
+        def read_mix(clips, mixed_path):
+            mixed = AudioFileClip(mixed_path)
+            mixed_durations.append(mixed.duration)
+            mixed.close()
+            return Mock()
+        
+        with patch('aidobe_video_processor.ffmpeg_filters.run_ffmpeg', wraps=run_ffmpeg) as mock_run, \
+             patch.object(self.assembler, 'assemble_video', side_effect=read_mix) as mock_assemble:
+            self.assembler.assemble_video_with_background_music(
+                video_clips, paths['narration'], paths['music'], fade_duration=1.0
+            )
+        
+        graph = mock_run.call_args[0][0][mock_run.call_args[0][0].index('-filter_complex') + 1]
+        assert 'afade=t=out:st=2.0:d=1.0' in graph
+        assert 'amix=inputs=2:duration=first' in graph
+        assert mock_assemble.call_args[0][0] is video_clips
+        assert abs(mixed_durations[0] - 3.0) < 0.05
+        # Nothing reads the mix any more, so it is gone
+        assert not os.path.exists(mock_assemble.call_args[0][1])
+
+    def test_mixed_music_lives_as_long_as_the_assembled_clip(self, tmp_path):
+        """Test the temporary mix stays on disk while the assembled clip reads it."""
+        pytest.importorskip('imageio_ffmpeg')
+        import gc
+        import subprocess
+        from moviepy.editor import ColorClip
+        from aidobe_video_processor.ffmpeg_filters import _ffmpeg_binary
+        
+        paths = {}
+        for name in ['narration', 'music']:
+            paths[name] = str(tmp_path / f"{name}.wav")
+            subprocess.run([
+                _ffmpeg_binary(), '-y', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', 'sine=d=1', paths[name]
+            ], check=True)
+        
+        result = self.assembler.assemble_video_with_background_music(
+            [ColorClip((16, 16), color=(0, 0, 0), duration=1)], paths['narration'], paths['music']
+        )
+        mixed_path = result.audio.filename
+        assert os.path.exists(mixed_path)
+        
+        result.audio.close()
+        del result
+        gc.collect()
+        assert not os.path.exists(mixed_path)
@@ -17,6 +17,15 @@ const ModalProgressUpdateSchema = z.object({
   estimated_time_remaining: z.number().optional(),
 })
 
+// Several progress updates for one job, posted by Modal's progress batcher
+const ModalProgressBatchSchema = z.object({
+  job_id: z.string().uuid(),
+  updates: z.array(ModalProgressUpdateSchema).min(1),
+}).refine(
+  batch => batch.updates.every(update => update.job_id === batch.job_id),
+  { message: 'Every update must belong to the batch job', path: ['updates'] }
+)
+
 const ModalCompletionSchema = z.object({
   job_id: z.string().uuid(),
   status: z.enum(['completed', 'failed']),
@@ -175,6 +184,140 @@ videoWebhookRoutes.post('/modal/progress', async (c) => {
   }
 })
 
+/**
+ * POST /api/video/webhooks/modal/progress/batch
+ * Handle batched progress updates from Modal video processing, in order
+ */
+videoWebhookRoutes.post('/modal/progress/batch', async (c) => {
+  const requestId = crypto.randomUUID()
+  const startTime = Date.now()
+
+  try {
+    // Validate content type
+    const contentType = c.req.header('content-type')
+    if (!contentType || !contentType.includes('application/json')) {
+      return c.json({
+        success: false,
+        error: 'Content-Type must be application/json',
+        timestamp: new Date().toISOString(),
+        requestId,
+      }, 400)
+    }
+
+    // Validate webhook signature
+    const signature = c.req.header('X-Modal-Signature')
+    if (!signature) {
+      return c.json({
+        success: false,
+        error: 'Missing webhook signature',
+        timestamp: new Date().toISOString(),
+        requestId,
+      }, 401)
+    }
+
+    // Parse and validate request body
+    let body: any
+    try {
+      body = await c.req.json()
+    } catch (error) {
+      return c.json({
+        success: false,
+        error: 'Invalid JSON in request body',
+        timestamp: new Date().toISOString(),
+        requestId,
+      }, 400)
+    }
+
+    const validation = ModalProgressBatchSchema.safeParse(body)
+    if (!validation.success) {
+      return c.json({
+        success: false,
+        error: 'Invalid request format',
+        details: validation.error.issues.map(issue => ({
+          field: issue.path.join('.'),
+          message: issue.message,
+        })),
+        timestamp: new Date().toISOString(),
+        requestId,
+      }, 400)
+    }
+
+    const batch = validation.data
+
+    console.log(`[${requestId}] Received ${batch.updates.length} progress updates for job ${batch.job_id}`)
+
+    // Initialize services
+    let modalIntegration: ModalIntegrationService
+    let videoQueue: VideoQueueService
+
+    try {
+      const db = new DatabaseService(c.env.DB)
+      const storage = new StorageService(c.env.R2_OUTPUTS, c.env.R2_PROMPTS)
+      modalIntegration = new ModalIntegrationService(c.env, storage, db)
+      videoQueue = new VideoQueueService(c.env, storage, db, modalIntegration)
+    } catch (error) {
+      console.error(`[${requestId}] Service initialization failed:`, error)
+      return c.json({
+        success: false,
+        error: 'Service initialization failed',
+        timestamp: new Date().toISOString(),
+        requestId,
+      }, 500)
+    }
+
+    // Validate webhook signature
+    const isValidSignature = await modalIntegration.validateWebhookSignature(body, signature)
+    if (!isValidSignature) {
+      console.warn(`[${requestId}] Invalid webhook signature for job ${batch.job_id}`)
+      return c.json({
+        success: false,
+        error: 'Invalid webhook signature',
+        timestamp: new Date().toISOString(),
+        requestId,
+      }, 401)
+    }
+
+    // Apply the updates in the order they were emitted
+    let result: Awaited<ReturnType<VideoQueueService['handleProgressUpdate']>> | undefined
+    for (const update of batch.updates) {
+      result = await videoQueue.handleProgressUpdate(update)
+
+      if (!result.success) {
+        console.error(`[${requestId}] Failed to process progress update:`, result.error)
+        return c.json({
+          success: false,
+          error: result.error,
+          timestamp: new Date().toISOString(),
+          requestId,
+        }, 500)
+      }
+    }
+
+    const response = {
+      success: true,
+      data: result?.data,
+      metadata: {
+        requestId,
+        processedUpdates: batch.updates.length,
+        processingTime: Date.now() - startTime,
+      },
+      timestamp: new Date().toISOString(),
+    }
+
+    console.log(`[${requestId}] ${batch.updates.length} progress updates processed for job ${batch.job_id} in ${Date.now() - startTime}ms`)
+    return c.json(response, 200)
+
+  } catch (error) {
+    console.error(`[${requestId}] Progress batch webhook failed:`, error)
+    return c.json({
+      success: false,
+      error: error instanceof Error ? error.message : 'Unknown error occurred',
+      timestamp: new Date().toISOString(),
+      requestId,
+    }, 500)
+  }
+})
+
 /**
  * POST /api/video/webhooks/modal/complete
  * Handle completion notifications from Modal video processing
@@ -322,6 +465,7 @@ videoWebhookRoutes.get('/modal/health', async (c) => {
         status: 'healthy',
         webhooks: {
           progress: 'active',
+          progressBatch: 'active',
           completion: 'active',
           test: 'active',
         },
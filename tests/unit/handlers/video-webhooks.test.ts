@@ -173,6 +173,68 @@ describe('Video Webhook Handlers', () => {
     })
   })
 
+  describe('POST /api/video/webhooks/modal/progress/batch', () => {
+    const jobId = 'f47ac10b-58cc-4372-a567-0e02b2c3d479'
+
+    it('should apply batched progress updates in order', async () => {
+      const updates = [
+        { job_id: jobId, stage: 'validating', progress: 0.1 },
+        { job_id: jobId, stage: 'downloading', progress: 0.2 },
+      ]
+
+      const response = await app.request('/api/video/webhooks/modal/progress/batch', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'X-Modal-Signature': 'valid-signature',
+        },
+        body: JSON.stringify({ job_id: jobId, updates }),
+      }, mockEnv)
+
+      expect(response.status).toBe(200)
+
+      const body = await response.json()
+      expect(body.success).toBe(true)
+      expect(body.metadata.processedUpdates).toBe(2)
+      expect(mockVideoQueue.handleProgressUpdate).toHaveBeenNthCalledWith(1, updates[0])
+      expect(mockVideoQueue.handleProgressUpdate).toHaveBeenNthCalledWith(2, updates[1])
+    })
+
+    it('should reject a bare array of updates', async () => {
+      const response = await app.request('/api/video/webhooks/modal/progress/batch', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'X-Modal-Signature': 'valid-signature',
+        },
+        body: JSON.stringify([{ job_id: jobId, stage: 'validating', progress: 0.1 }]),
+      }, mockEnv)
+
+      expect(response.status).toBe(400)
+      expect(mockVideoQueue.handleProgressUpdate).not.toHaveBeenCalled()
+    })
+
+    it('should reject updates for another job', async () => {
+      const response = await app.request('/api/video/webhooks/modal/progress/batch', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'X-Modal-Signature': 'valid-signature',
+        },
+        body: JSON.stringify({
+          job_id: jobId,
+          updates: [{ job_id: '9b2d4c1e-7f3a-4b8e-a1c2-5d6e7f8a9b0c', stage: 'validating', progress: 0.1 }],
+        }),
+      }, mockEnv)
+
+      expect(response.status).toBe(400)
+
+      const body = await response.json()
+      expect(body.error).toContain('Invalid request format')
+      expect(mockVideoQueue.handleProgressUpdate).not.toHaveBeenCalled()
+    })
+  })
+
   describe('POST /api/video/webhooks/modal/complete', () => {
     it('should handle successful completion', async () => {
       const completionData = {